@@ -3,13 +3,25 @@ Main entry point for the Minesweeper game application.
 
 This file initializes the App class and starts the game loop.
 Separating the entry point helps maintain modularity and clarity.
+Also reachable as `python -m minesweeper play`.
 """
 
+import argparse
+
 from app import App
 
-if __name__ == "__main__":
+
+def main(argv=None):
+    # The game takes no options yet; parsing still gives --help and
+    # rejects stray arguments instead of ignoring them
+    argparse.ArgumentParser(description="Start the Minesweeper game.").parse_args(argv)
+
     # Create the main application instance
     app = App()
-    
+
     # Start the game loop
     app.run()
+
+
+if __name__ == "__main__":
+    main()
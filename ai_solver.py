@@ -1,4 +1,9 @@
 import random
+import time
+from collections import deque
+
+from probability import mine_probabilities
+from sampling import sample_probabilities
 
 # ------------------------------------------------------------
 # GREEDY AI SOLVER FOR MINESWEEPER
@@ -11,14 +16,44 @@ import random
 # Algorithmic Concepts Used:
 # - Greedy Strategy
 # - Constraint Satisfaction
+# - Constraint propagation over a work queue (subset/pairwise rules)
+# - Exact probabilities via component-wise enumeration (for guesses)
+# - Monte Carlo estimates when the frontier is too large to enumerate
 # - Graph-based neighbor analysis (via board methods)
 # ------------------------------------------------------------
 
 class AI_Solver:
-    def __init__(self):
+    def __init__(self, sample_time=0.25):
         # Stores recent AI decisions for display and debugging
         self.logs = ["Game Started. AI Ready."]
 
+        # Seconds a guess may spend sampling probabilities when exact
+        # enumeration is too expensive
+        self.sample_time = sample_time
+
+        # Deductions carried between calls. Cells are (row, column)
+        # tuples mapped to the rule that proved them.
+        self.known_safe = {}
+        self.known_mines = {}
+
+        # Work queue of constraint cells (revealed numbers) to recheck
+        self._queue = deque()
+        self._queued = set()
+
+        # Board being tracked and how far into its change log we have read
+        self._board = None
+        self._cursor = 0
+
+        # Last complete analysis and the board version it belongs to
+        self._result = None
+        self._result_version = None
+
+        # Log message of the last move get_move chose (None for hints);
+        # unlike logs[-1], other messages logged since do not replace it
+        self.reason = None
+        # Whether the last get_move or get_moves call returned a guess
+        self.guessed = False
+
     def log(self, message):
         """
         Adds a message to the AI log.
@@ -28,34 +63,116 @@ class AI_Solver:
         if len(self.logs) > 8:
             self.logs.pop(0)
 
-    def get_move(self, board, is_hint=False):
-        """
-        Determines the next move for the AI.
+    def _log_move(self, message):
+        self.reason = message
+        self.log(message)
 
-        Parameters:
-        - board: Current game board state
-        - is_hint: If True, AI suggests a move without logging or executing it
+    # ------------------------------------------------
+    # KNOWLEDGE TRACKING
+    # ------------------------------------------------
+    def _reset(self, board):
+        """Forgets all deductions and queues every frontier constraint."""
+        self._board = board
+        self._cursor = len(board.change_log)
+        self.known_safe.clear()
+        self.known_mines.clear()
+        self._queue.clear()
+        self._queued.clear()
+        for key in board.frontier:
+            self._enqueue(key)
 
-        Returns:
-        - (row, column, action) tuple where action is 'reveal' or 'flag'
+    def _enqueue(self, key):
+        if key not in self._queued:
+            self._queued.add(key)
+            self._queue.append(key)
+
+    def _enqueue_around(self, board, r, c):
+        # A cell's state feeds the constraints of its numbered neighbours
+        self._enqueue((r, c))
+        for key in board.neighbor_coords(r, c):
+            self._enqueue(key)
+
+    def _sync(self, board):
+        """
+        Catches up with the cells changed since the last call. Only the
+        constraints around those cells are queued for rechecking. If a
+        change contradicts what we know (undo, a removed or misplaced
+        flag), the deductions are rebuilt from the frontier instead.
         """
+        if board is not self._board or self._cursor > len(board.change_log):
+            self._reset(board)
+            return
 
-        # Frontier consists of revealed numbered cells
-        # These cells provide constraints for decision making
-        frontier = board.get_revealed_numbered_nodes()
+        changed = board.change_log[self._cursor:]
+        self._cursor = len(board.change_log)
+        for r, c in changed:
+            cell = board.grid[r][c]
+            key = (r, c)
+            reversed_change = not cell.is_revealed and not cell.is_flagged
+            contradicts = ((cell.is_flagged and key in self.known_safe) or
+                           (cell.is_revealed and not cell.is_mine and key in self.known_mines))
+            if reversed_change or contradicts:
+                self._reset(board)
+                return
+            self.known_safe.pop(key, None)
+            self.known_mines.pop(key, None)
+            self._enqueue_around(board, r, c)
 
-        # Separate move lists for greedy prioritization
-        moves_reveal = []   # Guaranteed safe cells
-        moves_flag = []     # Guaranteed mine cells
+    def _constraint(self, board, key):
+        """
+        Returns (unknown cells, mines left among them) for a frontier cell,
+        taking flags and earlier deductions into account, or None if the
+        cell no longer constrains anything.
+        """
+        if key not in board.frontier:
+            return None
+        cell = board.grid[key[0]][key[1]]
+        unknown = set()
+        remaining = cell.number - len(board.get_flagged_neighbors(cell))
+        for n in board.get_hidden_neighbors(cell):
+            nkey = (n.r, n.c)
+            if nkey in self.known_mines:
+                remaining -= 1
+            elif nkey not in self.known_safe:
+                unknown.add(nkey)
+        # Wrong flags can make a constraint unsatisfiable; skip it
+        if not unknown or remaining < 0 or remaining > len(unknown):
+            return None
+        return unknown, remaining
+
+    def _mark(self, board, cells, is_mine, rule):
+        target = self.known_mines if is_mine else self.known_safe
+        for key in cells:
+            if key in self.known_mines or key in self.known_safe:
+                continue
+            target[key] = rule
+            self._enqueue_around(board, *key)
 
-        # Analyze each constraint-providing cell
-        for cell in frontier:
-            hidden = board.get_hidden_neighbors(cell)
-            flagged = board.get_flagged_neighbors(cell)
+    # ------------------------------------------------
+    # CONSTRAINT PROPAGATION
+    # ------------------------------------------------
+    def _propagate(self, board, deadline=None):
+        """
+        Drains the work queue. Each constraint is checked on its own
+        (satisfaction and deduction rules) and then against every
+        overlapping constraint (subset/pairwise rules such as 1-1 and 1-2).
+        Newly proven cells queue their neighbouring constraints, so work
+        stays proportional to what the last move touched.
 
-            # Skip cells with no unresolved neighbors
-            if not hidden:
+        Stops early once `deadline` (a time.monotonic() value) has passed;
+        whatever is still queued is picked up by the next call.
+        """
+        steps = 0
+        while self._queue:
+            steps += 1
+            if deadline is not None and steps % 64 == 0 and time.monotonic() > deadline:
+                return
+            key = self._queue.popleft()
+            self._queued.discard(key)
+            con = self._constraint(board, key)
+            if con is None:
                 continue
+            unknown, remaining = con
 
             # ------------------------------------------------
             # RULE 1: SATISFACTION RULE (Clear Around)
@@ -63,10 +180,9 @@ class AI_Solver:
             # number on the cell, all remaining hidden
             # neighbors are safe.
             # ------------------------------------------------
-            if len(flagged) == cell.number:
-                for h in hidden:
-                    if h not in moves_reveal:
-                        moves_reveal.append(h)
+            if remaining == 0:
+                self._mark(board, unknown, False, "single")
+                continue
 
             # ------------------------------------------------
             # RULE 2: DEDUCTION RULE (Mine Finding)
@@ -74,10 +190,115 @@ class AI_Solver:
             # flags equals the cell number, all hidden
             # neighbors must be mines.
             # ------------------------------------------------
-            elif (cell.number - len(flagged)) == len(hidden):
-                for h in hidden:
-                    if h not in moves_flag:
-                        moves_flag.append(h)
+            if remaining == len(unknown):
+                self._mark(board, unknown, True, "single")
+                continue
+
+            # ------------------------------------------------
+            # RULE 3: PAIRWISE RULE (Overlapping Constraints)
+            # For two constraints A and B sharing cells, the
+            # mines in the overlap are bounded by both. When
+            # the bounds pin down one side completely, the
+            # cells only A (or only B) touches are all safe
+            # or all mines.
+            # ------------------------------------------------
+            others = set()
+            for r, c in unknown:
+                others.update(board.neighbor_coords(r, c))
+            others.discard(key)
+
+            for other in others:
+                other_con = self._constraint(board, other)
+                if other_con is None:
+                    continue
+                if self._compare(board, unknown, remaining, *other_con):
+                    break
+
+    def _compare(self, board, a_cells, a_rem, b_cells, b_rem):
+        overlap = a_cells & b_cells
+        if not overlap:
+            return False
+        only_a = a_cells - overlap
+        only_b = b_cells - overlap
+
+        # Feasible range of mines inside the overlap
+        lo = max(0, a_rem - len(only_a), b_rem - len(only_b))
+        hi = min(len(overlap), a_rem, b_rem)
+
+        found = False
+        for only, rem in ((only_a, a_rem), (only_b, b_rem)):
+            if not only:
+                continue
+            if rem - lo == 0:
+                self._mark(board, only, False, "pair")
+                found = True
+            elif rem - hi == len(only):
+                self._mark(board, only, True, "pair")
+                found = True
+        return found
+
+    def analyze(self, board, deadline=None):
+        """
+        Brings the deductions up to date with the board.
+
+        The result is cached against the board's version, so asking again
+        before the board changes (repeated hints, or a hint followed by
+        the AI's own turn) costs nothing. Analyses cut short by the
+        deadline are not cached.
+
+        Returns:
+        - dict with 'safe' and 'mines' ({(r, c): rule} for every proven
+          cell), 'probabilities' (Probabilities or None; only computed
+          when nothing is proven) and 'hidden' (flat indices of the
+          unknown cells scanned for probabilities)
+        """
+        if (self._result is not None and board is self._board
+                and board.version == self._result_version):
+            return self._result
+
+        # Catch up with the cells that changed since the last call, then
+        # propagate from the touched constraints.
+        self._sync(board)
+        self._propagate(board, deadline)
+
+        # When the local rules are stuck, the global picture (exact
+        # probabilities with the total mine count) can still prove cells,
+        # and otherwise tells us which guess is least risky.
+        probs = None
+        hidden = []
+        if not self.known_safe and not self.known_mines:
+            probs, hidden = self._probabilities(board, deadline)
+            if probs is not None:
+                self._mark(board, probs.safe, False, "count")
+                self._mark(board, probs.mines, True, "count")
+
+        result = {"safe": self.known_safe, "mines": self.known_mines,
+                  "probabilities": probs, "hidden": hidden}
+        complete = not self._queue and (deadline is None or time.monotonic() <= deadline)
+        self._result = result if complete else None
+        self._result_version = board.version
+        return result
+
+    def get_move(self, board, is_hint=False, deadline=None):
+        """
+        Determines the next move for the AI.
+
+        Parameters:
+        - board: Current game board state
+        - is_hint: If True, AI suggests a move without logging or executing it
+        - deadline: Optional time.monotonic() value. Past it the AI stops
+          deducing and returns the best move found so far (a proven move
+          if it has one, otherwise a guess)
+
+        Returns:
+        - (row, column, action) tuple where action is 'reveal' or 'flag'
+        """
+
+        self.reason = None
+        self.guessed = False
+        result = self.analyze(board, deadline)
+        probs = result["probabilities"]
+        hidden = result["hidden"]
 
         # ------------------------------------------------
         # GREEDY EXECUTION ORDER
@@ -88,36 +309,124 @@ class AI_Solver:
         # ------------------------------------------------
 
         # Priority 1: Safe reveal
-        if moves_reveal:
-            target = moves_reveal[0]  # Greedy choice: first safe move
+        if self.known_safe:
+            r, c = min(self.known_safe)  # Greedy choice: first safe move
             if not is_hint:
-                self.log(f"AI: Safe clear at ({target.r},{target.c})")
-            return (target.r, target.c, 'reveal')
+                rule = self.known_safe[(r, c)]
+                if rule == "pair":
+                    self._log_move(f"AI: Pattern safe at ({r},{c})")
+                elif rule == "count":
+                    self._log_move(f"AI: Safe by count at ({r},{c})")
+                else:
+                    self._log_move(f"AI: Safe clear at ({r},{c})")
+            return (r, c, 'reveal')
 
         # Priority 2: Flag mine
-        if moves_flag:
-            target = moves_flag[0]  # Greedy choice: first deduced mine
+        if self.known_mines:
+            r, c = min(self.known_mines)  # Greedy choice: first deduced mine
             if not is_hint:
-                self.log(f"AI: Flagging mine at ({target.r},{target.c})")
-            return (target.r, target.c, 'flag')
+                rule = self.known_mines[(r, c)]
+                if rule == "pair":
+                    self._log_move(f"AI: Pattern mine at ({r},{c})")
+                elif rule == "count":
+                    self._log_move(f"AI: Mine by count at ({r},{c})")
+                else:
+                    self._log_move(f"AI: Flagging mine at ({r},{c})")
+            return (r, c, 'flag')
 
         # Priority 3: Guess (only when logically stuck)
-        if not is_hint:
-            valid_moves = []
-
-            # Collect all unrevealed and unflagged cells
-            for r in range(board.rows):
-                for c in range(board.cols):
-                    cell = board.grid[r][c]
-                    if not cell.is_revealed and not cell.is_flagged:
-                        valid_moves.append((r, c))
-
-            # Random selection represents unavoidable uncertainty
-            if valid_moves:
-                move = random.choice(valid_moves)
-                self.log(f"AI: Guessing at ({move[0]},{move[1]})")
-                return (move[0], move[1], 'reveal')
+        if not is_hint and hidden:
+            self.guessed = True
+            if probs is None:
+                # Probabilities unavailable (too complex or inconsistent
+                # flags): random selection represents the uncertainty
+                move = divmod(random.choice(hidden), board.cols)
+                self._log_move(f"AI: Guessing at ({move[0]},{move[1]})")
+            else:
+                move, risk = self._least_risky(probs, hidden, board.cols)
+                approx = "~" if probs.samples else ""  # sampled, not exact
+                self._log_move(f"AI: Guessing at ({move[0]},{move[1]}) ({approx}{risk:.0%} risk)")
+            return (move[0], move[1], 'reveal')
 
         # No valid move available
         return None
 
+    def get_moves(self, board, deadline=None):
+        """
+        Returns every move the AI can make this turn, for Board.apply_moves.
+
+        All proven cells are independent of each other, so they are
+        returned together: safe reveals first, then mine flags, each in
+        row-major order. When nothing is proven the batch is the single
+        guess get_move would make.
+
+        Returns:
+        - list of (row, column, action) tuples; empty if there is no move
+        """
+        self.guessed = False
+        result = self.analyze(board, deadline)
+        moves = [(r, c, 'reveal') for r, c in sorted(result["safe"])]
+        moves += [(r, c, 'flag') for r, c in sorted(result["mines"])]
+        if not moves:
+            move = self.get_move(board, deadline=deadline)
+            return [move] if move else []
+        if len(moves) == 1:
+            # Logged exactly as get_move would
+            self.get_move(board, deadline=deadline)
+        else:
+            self.log(f"AI: {len(result['safe'])} safe, {len(result['mines'])} mines in one turn")
+        return moves
+
+    # ------------------------------------------------
+    # PROBABILISTIC GUESSING
+    # ------------------------------------------------
+    def _probabilities(self, board, deadline=None):
+        """
+        Collects the unknown cells and frontier constraints and computes
+        exact mine probabilities, falling back to a time-boxed Monte Carlo
+        estimate when the frontier is too large to enumerate (skipped once
+        the deadline has passed).
+
+        Returns:
+        - (Probabilities or None, flat indices of the hidden unflagged cells)
+        """
+        # The backends collect these from their own arrays or bitmasks;
+        # a guess needs them even once the deadline has passed
+        hidden = board.hidden_indices()
+        if not hidden or (deadline is not None and time.monotonic() > deadline):
+            return None, hidden
+
+        constraints = []
+        for key in board.frontier:
+            con = self._constraint(board, key)
+            if con is not None:
+                constraints.append(con)
+        if deadline is not None and time.monotonic() > deadline:
+            return None, hidden
+        mines_left = board.total_mines - board.flagged_count()
+        probs = mine_probabilities(constraints, len(hidden), mines_left, deadline=deadline)
+        if probs is None and constraints and self.sample_time > 0:
+            budget = self.sample_time
+            if deadline is not None:
+                budget = min(budget, deadline - time.monotonic())
+            if budget > 0:
+                probs = sample_probabilities(constraints, len(hidden), mines_left, budget)
+        return probs, hidden
+
+    def _least_risky(self, probs, hidden, cols):
+        """Picks a random cell among those with the lowest mine probability."""
+        best = min(probs.cells.values(), default=1.0)
+        if probs.background is not None:
+            best = min(best, probs.background)
+        candidates = sorted(cell for cell, p in probs.cells.items() if p - best < 1e-9)
+        if probs.background is None or probs.background - best >= 1e-9:
+            return random.choice(candidates), best
+        # Every unconstrained cell is a candidate too. They are drawn from
+        # `hidden` directly, so huge backgrounds are never listed as cells.
+        background = len(hidden) - len(probs.cells)
+        if random.randrange(len(candidates) + background) < len(candidates):
+            return random.choice(candidates), best
+        while True:
+            cell = divmod(random.choice(hidden), cols)
+            if cell not in probs.cells:
+                return cell, best
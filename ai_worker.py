@@ -0,0 +1,171 @@
+import queue
+import threading
+import time
+import traceback
+from itertools import compress
+
+from cell import CellView, GridView
+
+# Maps the 0/1 'revealed or flagged' bytes to 1 for unknown cells
+_UNKNOWN = bytes.maketrans(b"\x00\x01", b"\x01\x00")
+
+# --- BACKGROUND AI WORKER ---
+# Runs AI_Solver.get_move on a worker thread so the game loop keeps
+# handling input and drawing while the AI thinks. The solver never sees
+# the live board: it works on a BoardSnapshot, a read-only copy of what
+# a player can see, which the game loop brings up to date (from the
+# board's change log) only while the worker is idle.
+
+
+class BoardSnapshot:
+    """
+    Read-only view of a board's visible state with the query methods the
+    solver uses. Hidden cells expose no mine or number information.
+    """
+
+    def __init__(self, board):
+        self.source = board
+        self.rows = board.rows
+        self.cols = board.cols
+        self.total_mines = board.total_mines
+        self.topology = board.topology
+        self.grid = GridView(self)
+        size = self.rows * self.cols
+        self.revealed = bytearray(size)
+        self.flagged = bytearray(size)
+        self.mines = bytearray(size)  # revealed mines only
+        self.number = [0] * size
+        self.frontier = frozenset()
+        self.game_over = False
+        self.change_log = []
+        self.version = 0
+        self.refresh(board)
+
+    def refresh(self, board):
+        """Applies the board's changes since the last refresh."""
+        changed = board.change_log[len(self.change_log):]
+        for r, c in changed:
+            cell = board.grid[r][c]
+            i = r * self.cols + c
+            revealed = cell.is_revealed
+            self.revealed[i] = revealed
+            self.flagged[i] = cell.is_flagged
+            self.mines[i] = revealed and cell.is_mine
+            self.number[i] = cell.number if revealed else 0
+        self.change_log.extend(changed)
+        self.frontier = frozenset(board.frontier)
+        self.game_over = board.game_over
+        self.version = board.version
+
+    # --- CELL VIEW ACCESS ---
+    def get_cell_attr(self, r, c, name):
+        i = r * self.cols + c
+        if name == "number":
+            return self.number[i]
+        field = {"is_mine": self.mines, "is_revealed": self.revealed, "is_flagged": self.flagged}[name]
+        return bool(field[i])
+
+    def set_cell_attr(self, r, c, name, value):
+        raise TypeError("board snapshots are read-only")
+
+    def neighbors_of(self, r, c):
+        return [CellView(self, nr, nc) for nr, nc in self.neighbor_coords(r, c)]
+
+    # --- QUERIES ---
+    def neighbor_coords(self, r, c):
+        # Adjacency never changes during a game; the topology is shared
+        return self.topology.neighbor_coords(r, c)
+
+    def get_hidden_neighbors(self, cell):
+        return [CellView(self, r, c) for r, c in self.neighbor_coords(cell.r, cell.c)
+                if not self.revealed[r * self.cols + c] and not self.flagged[r * self.cols + c]]
+
+    def get_flagged_neighbors(self, cell):
+        return [CellView(self, r, c) for r, c in self.neighbor_coords(cell.r, cell.c)
+                if self.flagged[r * self.cols + c]]
+
+    def get_frontier_nodes(self):
+        return [CellView(self, r, c) for r, c in sorted(self.frontier)]
+
+    def flagged_count(self):
+        return self.flagged.count(1)
+
+    def hidden_indices(self):
+        # OR the two byte masks as integers rather than cell by cell, so
+        # this stays cheap on very large boards
+        size = self.rows * self.cols
+        known = int.from_bytes(self.revealed, "little") | int.from_bytes(self.flagged, "little")
+        return list(compress(range(size), known.to_bytes(size, "little").translate(_UNKNOWN)))
+
+
+class AIWorker:
+    def __init__(self, solver, on_done=None):
+        self.solver = solver
+        # Called on the worker thread after each result is ready
+        self.on_done = on_done
+        self._snapshot = None
+        self._busy = False
+        self._jobs = queue.Queue()
+        self._results = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="ai-worker", daemon=True)
+        self._thread.start()
+
+    # --- PUBLIC API (called from the game loop; never blocks) ---
+    @property
+    def busy(self):
+        return self._busy
+
+    def submit(self, board, is_hint=False, time_limit=None):
+        """
+        Starts computing a move for `board`, answering within `time_limit`
+        seconds when given. Returns False if a move is already being
+        computed.
+        """
+        if self._busy:
+            return False
+        if self._snapshot is None or self._snapshot.source is not board:
+            self._snapshot = BoardSnapshot(board)
+        else:
+            self._snapshot.refresh(board)
+        deadline = time.monotonic() + time_limit if time_limit else None
+        self._busy = True
+        self._jobs.put((board, self._snapshot, is_hint, deadline))
+        return True
+
+    def poll(self):
+        """
+        Returns (board, is_hint, move, reason, error) for a finished
+        request, or None. The board tells callers whether the answer is for
+        the current game; reason is the solver's log message for the move
+        (None for hints). If the solver raised, move and reason are None and
+        error is the formatted traceback, for the game loop to show and log.
+        """
+        try:
+            result = self._results.get_nowait()
+        except queue.Empty:
+            return None
+        self._busy = False
+        return result
+
+    def close(self):
+        if self._thread.is_alive():
+            self._jobs.put(None)
+            self._thread.join()
+
+    # --- WORKER THREAD ---
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            board, snapshot, is_hint, deadline = job
+            error = None
+            try:
+                move = self.solver.get_move(snapshot, is_hint=is_hint, deadline=deadline)
+                reason = self.solver.reason
+            except Exception:
+                error = traceback.format_exc()
+                move = reason = None
+            self._results.put((board, is_hint, move, reason, error))
+            if self.on_done:
+                self.on_done()
@@ -1,45 +1,78 @@
 import pygame
 import sys
 import datetime 
-import os 
+import base64
+import os
 from constants import *
-from board import Board
+from backends import make_board
 from ai_solver import AI_Solver
+from ai_worker import AIWorker
 from button import Button
+from assets import BackgroundLoader
+from atlas import get_atlas, get_font
+from game_log import GameLogWriter, default_log_dir
+from replay import ReplayRecorder
+from profiler import Profiler
+from scheduler import FrameScheduler
 
 # --- NEW COLORS FOR VISUALIZATION ---
 C_THINKING = (0, 255, 255)   # Cyan for considering candidates
 C_CHOOSING = (255, 255, 0)   # Yellow for the selected move
 
+# Posted by the AI worker thread when a move is ready, to wake the game loop
+AI_DONE_EVENT = pygame.event.custom_type()
+# Posted once the background image has loaded, so the menu redraws with it
+ASSETS_READY_EVENT = pygame.event.custom_type()
+
+# One window for every screen, sized once for the largest grid view plus
+# the sidebar; zooming and grid size only change what the viewport shows.
+# The menus are laid out on MENU_SIZE and drawn centred in the window.
+WINDOW_SIZE = (MARGIN * 2 + VIEWPORT_SIZE + SIDEBAR_WIDTH, MARGIN * 2 + VIEWPORT_SIZE)
+MENU_SIZE = (800, 600)
+
 # --- 5. MENU & APP MANAGEMENT ---
 class App:
     def __init__(self):
         pygame.init()
         pygame.font.init()
-        self.screen_w = 800
-        self.screen_h = 600
+        self.screen_w, self.screen_h = WINDOW_SIZE
         self.screen = pygame.display.set_mode((self.screen_w, self.screen_h))
+        # Top-left corner of the centred menu layout
+        self.menu_x = (self.screen_w - MENU_SIZE[0]) // 2
+        self.menu_y = (self.screen_h - MENU_SIZE[1]) // 2
         pygame.display.set_caption("Minesweeper Graph AI")
         self.clock = pygame.time.Clock()
+        # Loops sleep until input, a due timer or the AI wakes them
+        self.scheduler = FrameScheduler(self.clock, 60)
         
-        self.font = pygame.font.SysFont("Segoe UI", 20, bold=True)
-        self.font_lg = pygame.font.SysFont("Segoe UI", 40, bold=True)
-        self.font_xl = pygame.font.SysFont("Segoe UI", 80, bold=True) 
+        self.font = get_font("Segoe UI", 20, True)
+        self.font_lg = get_font("Segoe UI", 40, True)
+        self.font_xl = get_font("Segoe UI", 80, True)
 
         self.grid_size = 8
         self.difficulty = "Easy" 
         self.mode = "Menu" 
         self.vs_cpu = False
         self.cell_size = CELL_SIZE 
+        self.log_writer = GameLogWriter()
+        # Per-phase frame timings (F3 shows them, F4 exports them)
+        self.profiler = Profiler()
+        self.profiler.instrument(self.log_writer, "_append", "log_write")
+        self.profiler.instrument(self.log_writer, "_store", "db_write")
+        # No-guess mode: boards come pre-generated from a background pool
+        self.no_guess = False
+        self.board_pool = None
         
-        self.bg_image = None
-        bg_path = r"Images\Startup-Page-BG-Image.jpg"
-        try:
-            loaded_img = pygame.image.load(bg_path).convert()
-            self.bg_image = pygame.transform.smoothscale(loaded_img, (self.screen_w, self.screen_h))
-        except Exception as e:
-            print(f"Could not load background: {e}")
-            self.bg_image = None
+        # Loaded on a worker thread; screens use C_BG until it is ready
+        self.background = BackgroundLoader(
+            (self.screen_w, self.screen_h),
+            on_done=lambda: pygame.event.post(pygame.event.Event(ASSETS_READY_EVENT)))
+
+    def quit(self):
+        self.log_writer.close()  # flush queued game logs
+        if self.board_pool:
+            self.board_pool.close()
+        pygame.quit(); sys.exit()
 
     def run(self):
         while True:
@@ -52,20 +85,16 @@ class App:
 
     def calc_mines(self):
         total = self.grid_size * self.grid_size
-        ratio = 0.12 if self.difficulty == "Easy" else 0.17 if self.difficulty == "Medium" else 0.22
-        return int(total * ratio)
-
-    def get_blurred_background(self):
-        if not self.bg_image: return None
-        small_w = self.screen_w // 10
-        small_h = self.screen_h // 10
-        small_surf = pygame.transform.smoothscale(self.bg_image, (small_w, small_h))
-        blurred_surf = pygame.transform.smoothscale(small_surf, (self.screen_w, self.screen_h))
-        dark_overlay = pygame.Surface((self.screen_w, self.screen_h))
-        dark_overlay.fill((0, 0, 0))
-        dark_overlay.set_alpha(100) 
-        blurred_surf.blit(dark_overlay, (0,0))
-        return blurred_surf
+        return int(total * DIFFICULTY_RATIOS[self.difficulty])
+
+    def prefetch_boards(self):
+        # Start filling the no-guess queue for the current setting
+        if self.no_guess and self.grid_size <= NO_GUESS_MAX_SIZE:
+            if self.board_pool is None:
+                # Imported on first use: it pulls in multiprocessing
+                from no_guess import BoardPool
+                self.board_pool = BoardPool()
+            self.board_pool.prefetch(self.grid_size, self.calc_mines())
 
     def fade_transition(self):
         fade_surf = pygame.Surface((self.screen_w, self.screen_h))
@@ -74,32 +103,35 @@ class App:
             fade_surf.set_alpha(alpha)
             self.screen.blit(fade_surf, (0, 0))
             pygame.display.flip()
-            pygame.time.delay(10)
+            self.clock.tick(100)
 
     def menu_loop(self):
-        btn_single = Button(300, 400, 200, 50, "SOLO SWEEPER") 
-        btn_cpu = Button(290, 470, 220, 50, "MIND VS MACHINE")
+        ox, oy = self.menu_x, self.menu_y
+        btn_single = Button(ox + 300, oy + 400, 200, 50, "SOLO SWEEPER") 
+        btn_cpu = Button(ox + 290, oy + 470, 220, 50, "MIND VS MACHINE")
 
+        events = []
         while self.mode == "Menu":
-            if self.bg_image:
-                self.screen.blit(self.bg_image, (0, 0))
+            bg_image = self.background.get("sharp")
+            if bg_image:
+                self.screen.blit(bg_image, (0, 0))
             else:
                 self.screen.fill(C_BG)
 
             shadow = self.font_xl.render("MINESWEEPER AI", True, (0, 0, 0))
-            shadow_rect = shadow.get_rect(center=(self.screen_w // 2 + 4, 320 + 4))
+            shadow_rect = shadow.get_rect(center=(self.screen_w // 2 + 4, oy + 320 + 4))
             self.screen.blit(shadow, shadow_rect)
 
             title = self.font_xl.render("MINESWEEPER AI", True, C_ACCENT)
-            title_rect = title.get_rect(center=(self.screen_w // 2, 320))
+            title_rect = title.get_rect(center=(self.screen_w // 2, oy + 320))
             self.screen.blit(title, title_rect)
 
             btn_single.draw(self.screen, self.font)
             btn_cpu.draw(self.screen, self.font)
 
-            for event in pygame.event.get():
+            for event in events:
                 if event.type == pygame.QUIT:
-                    pygame.quit(); sys.exit()
+                    self.quit()
 
                 if btn_single.is_clicked(event):
                     self.fade_transition()
@@ -114,66 +146,81 @@ class App:
                     return
 
             pygame.display.flip()
-            self.clock.tick(60)
+            # Nothing animates here: sleep until the next input
+            events = self.scheduler.wait()
 
     def settings_loop(self):
-        bg_blur = self.get_blurred_background()
+        ox, oy = self.menu_x, self.menu_y
         btns_size = []
-        sizes = [8, 12, 16, 20]
+        sizes = GRID_SIZES
         for i, s in enumerate(sizes):
             col = C_ACCENT if self.grid_size == s else C_PANEL
-            btns_size.append(Button(200 + i*70, 200, 60, 40, str(s), color=col))
+            btns_size.append(Button(ox + 200 + i*70, oy + 200, 60, 40, str(s), color=col))
 
         btns_diff = []
         diffs = ["Easy", "Medium", "Hard"]
         for i, d in enumerate(diffs):
             col = C_ACCENT if self.difficulty == d else C_PANEL
-            btns_diff.append(Button(200 + i*120, 300, 100, 40, d, color=col))
-
-        btn_start = Button(300, 450, 200, 60, "START GAME", color=C_FLAG)
-        btn_clear_log = Button(40, 520, 140, 40, "CLEAR LOGS", color=(180, 50, 50))
+            btns_diff.append(Button(ox + 200 + i*120, oy + 300, 100, 40, d, color=col))
 
-        self.screen.fill((0,0,0))
-        pygame.display.flip()
-        pygame.time.delay(100)
+        btn_start = Button(ox + 300, oy + 450, 200, 60, "START GAME", color=C_FLAG)
+        btn_clear_log = Button(ox + 40, oy + 520, 140, 40, "CLEAR LOGS", color=(180, 50, 50))
+        btn_no_guess = Button(ox + 580, oy + 520, 180, 40, "", color=C_ACCENT if self.no_guess else C_PANEL)
 
+        # The first pass draws straight away; after that the loop sleeps in
+        # the scheduler like every other screen
+        events = []
         while self.mode == "Settings":
+            bg_blur = self.background.get("blurred")
             if bg_blur:
                 self.screen.blit(bg_blur, (0, 0))
             else:
                 self.screen.fill(C_BG)
 
             title = self.font_lg.render("GAME SETUP", True, C_ACCENT)
-            self.screen.blit(title, (280, 100))
+            self.screen.blit(title, (ox + 280, oy + 100))
 
             lbl_size = self.font.render("GRID SIZE:", True, C_TEXT_MAIN)
-            self.screen.blit(lbl_size, (80, 210))
+            self.screen.blit(lbl_size, (ox + 80, oy + 210))
             for b in btns_size: b.draw(self.screen, self.font)
 
             lbl_diff = self.font.render("DIFFICULTY:", True, C_TEXT_MAIN)
-            self.screen.blit(lbl_diff, (60, 310))
+            self.screen.blit(lbl_diff, (ox + 60, oy + 310))
             for b in btns_diff: b.draw(self.screen, self.font)
 
+            btn_no_guess.text = f"NO GUESS: {'ON' if self.no_guess else 'OFF'}"
             btn_start.draw(self.screen, self.font)
             btn_clear_log.draw(self.screen, self.font)
+            btn_no_guess.draw(self.screen, self.font)
             
             info = f"Mines: {self.calc_mines()}"
+            if self.no_guess and self.grid_size > NO_GUESS_MAX_SIZE:
+                info += f"   No guess: up to {NO_GUESS_MAX_SIZE}x{NO_GUESS_MAX_SIZE}"
+            elif self.no_guess:
+                info += f"   Ready: {self.board_pool.ready_count(self.grid_size, self.calc_mines())}"
             info_surf = self.font.render(info, True, (200, 200, 200)) 
-            self.screen.blit(info_surf, (350, 400))
+            self.screen.blit(info_surf, (ox + 350, oy + 400))
 
-            for event in pygame.event.get():
+            for event in events:
                 if event.type == pygame.QUIT:
-                    pygame.quit(); sys.exit()
+                    self.quit()
                 
                 for i, b in enumerate(btns_size):
                     if b.is_clicked(event): 
                         self.grid_size = sizes[i]
                         for k, bx in enumerate(btns_size): bx.color = C_ACCENT if k == i else C_PANEL
+                        self.prefetch_boards()
                 
                 for i, b in enumerate(btns_diff):
                     if b.is_clicked(event): 
                         self.difficulty = diffs[i]
                         for k, bx in enumerate(btns_diff): bx.color = C_ACCENT if k == i else C_PANEL
+                        self.prefetch_boards()
+
+                if btn_no_guess.is_clicked(event):
+                    self.no_guess = not self.no_guess
+                    btn_no_guess.color = C_ACCENT if self.no_guess else C_PANEL
+                    self.prefetch_boards()
                 
                 if btn_start.is_clicked(event):
                     self.fade_transition()
@@ -181,40 +228,124 @@ class App:
                     return
                 
                 if btn_clear_log.is_clicked(event):
-                    log_path = r"D:\Mines_DAA\Minesweeper_V3.0\Game_logs\all_game_logs.txt"
-                    try:
-                        with open(log_path, "w") as f:
-                            f.write(f"LOG CLEARED: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                        print("Logs cleared successfully.")
-                    except Exception as e:
-                        print(f"Error clearing logs: {e}")
+                    self.log_writer.clear()
+                    print("Logs cleared.")
 
             pygame.display.flip()
-            self.clock.tick(60)
+            if self.no_guess:
+                # Keep the "Ready" count current while boards generate
+                self.scheduler.wake_at(pygame.time.get_ticks() + 500)
+            events = self.scheduler.wait()
 
     def game_loop(self):
-        def update_window_size():
-            grid_px = self.grid_size * int(self.cell_size) 
-            req_w = MARGIN * 2 + grid_px + SIDEBAR_WIDTH
-            req_h = MARGIN * 2 + grid_px
-            if req_h < 600: req_h = 600
-            if req_w < 800: req_w = 800
-            
-            current_w, current_h = self.screen.get_size()
-            if int(req_w) != current_w or int(req_h) != current_h:
-                self.screen = pygame.display.set_mode((int(req_w), int(req_h)))
-            return int(req_w), int(req_h)
+        game_w, game_h = self.screen_w, self.screen_h
+
+        # --- VIEWPORT ---
+        # The grid is shown through a window of at most VIEWPORT_SIZE
+        # pixels; `camera` is the top-left visible cell. Drawing and hit
+        # testing only visit visible cells, so frame time does not grow
+        # with the board.
+        camera = {"row": 0, "col": 0}
+
+        def area_px():
+            # Screen space reserved for the grid
+            return min(self.grid_size * int(self.cell_size), VIEWPORT_SIZE)
+
+        def view_cells():
+            # Cells visible along each side
+            return min(self.grid_size, area_px() // int(self.cell_size))
+
+        def move_camera(row, col):
+            top = self.grid_size - view_cells()
+            camera["row"] = max(0, min(row, top))
+            camera["col"] = max(0, min(col, top))
+
+        def in_view(r, c):
+            n = view_cells()
+            return camera["row"] <= r < camera["row"] + n and camera["col"] <= c < camera["col"] + n
+
+        def show_cell(r, c):
+            # Centres the camera on a cell that is out of view
+            if not in_view(r, c):
+                n = view_cells()
+                move_camera(r - n // 2, c - n // 2)
+
+        def zoom(step, anchor):
+            # Zooms by `step` pixels per cell, keeping the cell under the
+            # `anchor` screen position in place where possible
+            target = hovered_cell(anchor)
+            self.cell_size = max(MIN_CELL_SIZE, min(MAX_CELL_SIZE, int(self.cell_size) + step))
+            if target:
+                cs = int(self.cell_size)
+                move_camera(target[0] - (anchor[1] - MARGIN) // cs, target[1] - (anchor[0] - MARGIN) // cs)
+            else:
+                move_camera(camera["row"], camera["col"])
+
+        # Sidebar buttons sit in the window's bottom-right corner
+        btn_back = Button(game_w - 120, game_h - 50, 100, 30, "MENU", color=C_PANEL)
+        btn_reset = Button(game_w - 120, game_h - 90, 100, 30, "RESET", color=C_PANEL)
+        btn_undo = Button(game_w - 230, game_h - 50, 100, 30, "UNDO", color=C_PANEL)
+        btn_hint = Button(game_w - 230, game_h - 90, 100, 30, "HINT", color=(100, 100, 120))
+        btn_save = Button(game_w - 120, game_h - 130, 100, 30, "SAVE LOG", color=(50, 100, 50))
 
-        game_w, game_h = update_window_size()
+        # Held arrow keys keep panning
+        pygame.key.set_repeat(200, 30)
 
         def init_game():
-            return Board(self.grid_size, self.grid_size, self.calc_mines())
+            """
+            New board and its replay recorder. In no-guess mode the board
+            comes from the pool with its opening already revealed; if no
+            board is ready yet, a normal random board is used instead.
+            """
+            opening = None
+            move_camera(0, 0)
+            if self.no_guess and self.grid_size > NO_GUESS_MAX_SIZE:
+                ai.log(f"No-guess boards: up to {NO_GUESS_MAX_SIZE}x{NO_GUESS_MAX_SIZE}.")
+            elif self.no_guess and self.board_pool:
+                opening = self.board_pool.take(self.grid_size, self.calc_mines())
+                if opening is None:
+                    ai.log("No-guess board not ready; random board.")
+            backend = BOARD_BACKEND if self.grid_size <= LARGE_BOARD_SIZE else LARGE_BOARD_BACKEND
+            board = make_board(backend, self.grid_size, self.grid_size, self.calc_mines(),
+                               history_depth=UNDO_HISTORY_DEPTH,
+                               seed=opening[0] if opening else None)
+            recorder = ReplayRecorder(board)
+            instrument_board(board)
+            if opening:
+                r, c = opening[1]
+                recorder.record("reveal", r, c, board.reveal(r, c))
+                show_cell(r, c)
+                # The opening is part of the board, not an undoable move
+                board.history.clear()
+                ai.log("No-guess board: solvable without guessing.")
+            return board, recorder
+
+        def instrument_board(board):
+            # Board hot paths timed by the profiler (free while it is off)
+            flood = "_open" if hasattr(board, "_open") else "_flood_fill"
+            for name, phase in ((flood, "flood_fill"), ("save_state", "save_state"),
+                                ("_update_frontier", "frontier"), ("get_frontier_cells", "frontier")):
+                self.profiler.instrument(board, name, phase)
 
-        board = init_game()
         ai = AI_Solver()
+        self.profiler.instrument(ai, "get_move", "ai_move")
+        # The AI thinks on a worker thread; the loop below only polls it
+        def wake_loop():
+            # Runs on the worker thread; posting events is thread-safe
+            try:
+                pygame.event.post(pygame.event.Event(AI_DONE_EVENT))
+            except pygame.error:
+                pass  # display already closed
+
+        ai_worker = AIWorker(ai, on_done=wake_loop)
+        board, recorder = init_game()
         turn = "Human"
         scores = {"Human": {'RS':0, 'CF':0, 'WF':0}, "AI": {'RS':0, 'CF':0, 'WF':0}}
-        ai_timer = 0
+        # AI turn state machine: phase is "wait" -> "thinking" ->
+        # "choosing", each ending at `until` (pygame ticks)
+        ai_turn = {"phase": None, "until": 0, "submitted": False, "done": False, "move": None,
+                   "reason": None, "frontier": set()}
+        flash_until = 0
         hint = None 
         last_ai_move = None 
         ai_moves = set() 
@@ -225,92 +356,68 @@ class App:
         total_moves = 0 
         
         is_resizing = False
-        font_log = pygame.font.SysFont("Consolas", 14)
+        pan_drag = None  # pixels dragged with the middle button, not yet panned
+        font_log = get_font("Consolas", 14)
 
         move_log = []
 
-        def get_frontier(board_obj):
-            frontier = set()
-            for r in range(self.grid_size):
-                for c in range(self.grid_size):
-                    if not board_obj.grid[r][c].is_revealed and not board_obj.grid[r][c].is_flagged:
-                        is_near_number = False
-                        for dr in [-1, 0, 1]:
-                            for dc in [-1, 0, 1]:
-                                if dr == 0 and dc == 0: continue
-                                nr, nc = r + dr, c + dc
-                                if 0 <= nr < self.grid_size and 0 <= nc < self.grid_size:
-                                    n_cell = board_obj.grid[nr][nc]
-                                    if n_cell.is_revealed and n_cell.number > 0:
-                                        is_near_number = True
-                                        break
-                            if is_near_number: break
-                        if is_near_number:
-                            frontier.add((r,c))
-            return frontier
+        # Perf overlay text, refreshed twice a second so it stays readable
+        perf = {"lines": (), "until": 0}
 
-        # --- DRAWING HELPER FUNCTION (UPDATED with highlights) ---
-        # highlights: list of (r,c) tuples to highlight
-        # highlight_col: color for the highlight border
-        def draw_game(curr_time_str, curr_timer_col, show_undo_btn, highlights=None, highlight_col=None):
-            self.screen.fill(C_BG)
-            mouse_pos = pygame.mouse.get_pos()
-            
-            grid_px = self.grid_size * int(self.cell_size)
-            sidebar_x = MARGIN + grid_px + 40
-            
-            # Draw Grid
+        # --- DIRTY-REGION RENDERING STATE ---
+        # What is currently on screen, so a regular frame only redraws the
+        # cells and sidebar widgets that changed since the previous one.
+        render = {"full": True, "board": None, "cursor": 0, "hover": None,
+                  "marks": set(), "sidebar": None, "view": None}
+
+        def cell_rect(r, c):
             draw_cell_size = int(self.cell_size)
-            for r in range(self.grid_size):
-                for c in range(self.grid_size):
-                    x = MARGIN + c * draw_cell_size
-                    y = MARGIN + r * draw_cell_size
-                    cell = board.grid[r][c]
-                    rect = pygame.Rect(x, y, draw_cell_size-1, draw_cell_size-1) 
-                    
-                    if cell.is_revealed:
-                        pygame.draw.rect(self.screen, C_CELL_REVEALED, rect, border_radius=4)
-                        if cell.is_mine:
-                            col_mine = C_MINE if cell.is_revealed and cell.is_mine else (50, 0, 0)
-                            pygame.draw.circle(self.screen, col_mine, rect.center, draw_cell_size//4)
-                        elif cell.number > 0:
-                            dyn_font = pygame.font.SysFont("Segoe UI", int(draw_cell_size * 0.7), bold=True)
-                            txt = dyn_font.render(str(cell.number), True, C_NUMS[cell.number])
-                            self.screen.blit(txt, txt.get_rect(center=rect.center))
-                    else:
-                        is_hover = rect.collidepoint(mouse_pos)
-                        # Don't hover color if we are highlighting visually
-                        col = C_CELL_HOVER if (is_hover and not board.game_over and highlights is None) else C_CELL_HIDDEN
-                        pygame.draw.rect(self.screen, col, rect, border_radius=4)
-                        if cell.is_flagged:
-                            off = 5 * (draw_cell_size / 35) 
-                            pts = [(rect.centerx-off, rect.centery+off), (rect.centerx-off, rect.centery-off), (rect.centerx+off, rect.centery)]
-                            pygame.draw.polygon(self.screen, C_FLAG, pts)
-
-                    # Draw Red Dot for AI Moves
-                    if (r, c) in ai_moves:
-                        dot_x = rect.right - 5
-                        dot_y = rect.bottom - 5
-                        pygame.draw.circle(self.screen, (200, 0, 0), (dot_x, dot_y), 3)
-
-                    # --- NEW: Draw Visual Highlights (Thinking/Choosing) ---
-                    if highlights and (r,c) in highlights and highlight_col:
-                         # Draw a thicker border for emphasis
-                         pygame.draw.rect(self.screen, highlight_col, rect, 4, border_radius=4)
-
-                    if hint and hint[0] == r and hint[1] == c:
-                        h_col = C_HINT_SAFE if hint[2] == 'reveal' else C_HINT_MINE
-                        pygame.draw.rect(self.screen, h_col, rect, 3, border_radius=4)
-
-                    if last_ai_move and last_ai_move == (r, c):
-                        pygame.draw.rect(self.screen, (50, 100, 255), rect, 3, border_radius=4)
+            return pygame.Rect(MARGIN + (c - camera["col"]) * draw_cell_size,
+                               MARGIN + (r - camera["row"]) * draw_cell_size,
+                               draw_cell_size - 1, draw_cell_size - 1)
+
+        def draw_cell(r, c, atlas, mouse_pos, highlights=None, highlight_col=None, clear=True):
+            rect = cell_rect(r, c)
+            cell = board.grid[r][c]
+            # Clear the full grid slot first; sprites have rounded corners
+            # (a full redraw has already cleared the screen)
+            if clear:
+                pygame.draw.rect(self.screen, C_BG, (rect.x, rect.y, rect.w + 1, rect.h + 1))
+
+            # Don't hover color if we are highlighting visually
+            is_hover = (not cell.is_revealed and rect.collidepoint(mouse_pos)
+                        and not board.game_over and highlights is None)
+            self.screen.blit(atlas.sprite(cell, is_hover), rect.topleft)
+
+            # Draw Red Dot for AI Moves
+            if (r, c) in ai_moves:
+                dot_x = rect.right - 5
+                dot_y = rect.bottom - 5
+                pygame.draw.circle(self.screen, (200, 0, 0), (dot_x, dot_y), 3)
+
+            # --- NEW: Draw Visual Highlights (Thinking/Choosing) ---
+            if highlights and (r,c) in highlights and highlight_col:
+                 # Draw a thicker border for emphasis
+                 pygame.draw.rect(self.screen, highlight_col, rect, 4, border_radius=4)
+
+            if hint and hint[0] == r and hint[1] == c:
+                h_col = C_HINT_SAFE if hint[2] == 'reveal' else C_HINT_MINE
+                pygame.draw.rect(self.screen, h_col, rect, 3, border_radius=4)
+
+            if last_ai_move and last_ai_move == (r, c):
+                pygame.draw.rect(self.screen, (50, 100, 255), rect, 3, border_radius=4)
+            return pygame.Rect(rect.x, rect.y, rect.w + 1, rect.h + 1)
+
+        def sidebar_area():
+            # Fixed to the right of the largest viewport, whatever the zoom
+            left = MARGIN + VIEWPORT_SIZE + 20
+            return pygame.Rect(left, 0, game_w - left, game_h)
+
+        def draw_sidebar(curr_time_str, curr_timer_col, show_undo_btn):
+            area = sidebar_area()
+            self.screen.fill(C_BG, area)
+            sidebar_x = area.x + 20
 
-            # Draw Sidebar Lines
-            h_x = MARGIN + grid_px
-            h_y = MARGIN + grid_px
-            pygame.draw.line(self.screen, (150, 150, 150), (h_x, h_y), (h_x + 15, h_y + 15), 3)
-            pygame.draw.line(self.screen, (150, 150, 150), (h_x + 6, h_y + 15), (h_x + 15, h_y + 6), 2)
-            
             pygame.draw.rect(self.screen, C_PANEL, (sidebar_x, MARGIN, SIDEBAR_WIDTH, game_h - MARGIN*2), border_radius=10)
             pygame.draw.rect(self.screen, C_ACCENT, (sidebar_x, MARGIN, SIDEBAR_WIDTH, game_h - MARGIN*2), 2, border_radius=10)
 
@@ -341,9 +448,15 @@ class App:
 
             log_y_start = MARGIN + 220
             pygame.draw.line(self.screen, (60,60,70), (sidebar_x+10, log_y_start), (sidebar_x+SIDEBAR_WIDTH-10, log_y_start))
-            for i, l in enumerate(reversed(ai.logs)):
-                txt = font_log.render(f"> {l}", True, (180,180,180))
-                self.screen.blit(txt, (sidebar_x + 20, log_y_start + 10 + i*20))
+            if self.profiler.enabled:
+                # Perf overlay takes the place of the AI log
+                for i, l in enumerate(perf["lines"]):
+                    txt = font_log.render(l, True, C_FLAG if i == 0 else (180,180,180))
+                    self.screen.blit(txt, (sidebar_x + 20, log_y_start + 10 + i*20))
+            else:
+                for i, l in enumerate(reversed(ai.logs)):
+                    txt = font_log.render(f"> {l}", True, (180,180,180))
+                    self.screen.blit(txt, (sidebar_x + 20, log_y_start + 10 + i*20))
 
             # Buttons
             btn_back.draw(self.screen, self.font)
@@ -352,23 +465,203 @@ class App:
                 btn_undo.draw(self.screen, self.font)
             btn_hint.draw(self.screen, self.font)
             btn_save.draw(self.screen, self.font)
+            return area
 
-        # --- FLASH EFFECT FUNCTION ---
-        def flash_board(t_str, t_col):
-            grid_px = self.grid_size * int(self.cell_size)
-            overlay = pygame.Surface((grid_px, grid_px))
-            overlay.fill((255, 0, 0)) 
-            overlay.set_alpha(150)    
+        def sidebar_signature(curr_time_str, curr_timer_col, show_undo_btn):
+            # Everything the sidebar shows; it is redrawn only when this changes
+            mouse_pos = pygame.mouse.get_pos()
+            btn_hover = tuple(b.rect.collidepoint(mouse_pos) for b in (btn_back, btn_reset, btn_undo, btn_hint, btn_save))
+            score_vals = tuple(tuple(s.values()) for s in scores.values())
+            return (curr_time_str, curr_timer_col, show_undo_btn, total_moves, turn, board.game_over,
+                    board.winner, score_vals, tuple(ai.logs), btn_hover,
+                    self.profiler.enabled, perf["lines"])
 
-            for _ in range(2):
-                draw_game(t_str, t_col, False) 
-                self.screen.blit(overlay, (MARGIN, MARGIN)) 
-                pygame.display.flip()
-                pygame.time.delay(150) 
-                
-                draw_game(t_str, t_col, False)
+        # --- DRAWING HELPER FUNCTION (UPDATED with highlights) ---
+        # Redraws the whole screen. Used for the first frame, after resizes
+        # and for the AI visualisation and flash effects.
+        # highlights: list of (r,c) tuples to highlight
+        # highlight_col: color for the highlight border
+        def draw_game(curr_time_str, curr_timer_col, show_undo_btn, highlights=None, highlight_col=None):
+            self.screen.fill(C_BG)
+            mouse_pos = pygame.mouse.get_pos()
+            
+            n = view_cells()
+            grid_px = n * int(self.cell_size)
+            
+            # Draw Grid (cell sprites come from the atlas for this size);
+            # only the cells in view
+            atlas = get_atlas(int(self.cell_size))
+            for r in range(camera["row"], camera["row"] + n):
+                for c in range(camera["col"], camera["col"] + n):
+                    draw_cell(r, c, atlas, mouse_pos, highlights, highlight_col, clear=False)
+            draw_scrollbars()
+
+            # Draw Sidebar Lines
+            h_x = MARGIN + grid_px
+            h_y = MARGIN + grid_px
+            pygame.draw.line(self.screen, (150, 150, 150), (h_x, h_y), (h_x + 15, h_y + 15), 3)
+            pygame.draw.line(self.screen, (150, 150, 150), (h_x + 6, h_y + 15), (h_x + 15, h_y + 6), 2)
+
+            draw_sidebar(curr_time_str, curr_timer_col, show_undo_btn)
+            # Whatever comes next must repaint over this frame's overlays
+            render["full"] = True
+
+        def draw_scrollbars():
+            # Shows which part of a larger board is in view
+            n = view_cells()
+            if n == self.grid_size: return
+            grid_px = n * int(self.cell_size)
+            bar = max(4, grid_px * n // self.grid_size)
+            pos_x = grid_px * camera["col"] // self.grid_size
+            pos_y = grid_px * camera["row"] // self.grid_size
+            pygame.draw.rect(self.screen, C_GRID, (MARGIN, MARGIN + grid_px + 4, grid_px, 4))
+            pygame.draw.rect(self.screen, C_ACCENT, (MARGIN + pos_x, MARGIN + grid_px + 4, bar, 4))
+            pygame.draw.rect(self.screen, C_GRID, (MARGIN + grid_px + 4, MARGIN, 4, grid_px))
+            pygame.draw.rect(self.screen, C_ACCENT, (MARGIN + grid_px + 4, MARGIN + pos_y, 4, bar))
+
+        def scroll_grid(old_row, old_col, atlas, mouse_pos, highlights, highlight_col):
+            """
+            Pans by moving the grid's pixels and drawing only the rows and
+            columns that came into view. Returns the screen area touched.
+            """
+            cs = int(self.cell_size)
+            n = view_cells()
+            dr, dc = camera["row"] - old_row, camera["col"] - old_col
+            area = pygame.Rect(MARGIN, MARGIN, n * cs, n * cs)
+            self.screen.set_clip(area)
+            self.screen.scroll(-dc * cs, -dr * cs)
+            self.screen.set_clip(None)
+
+            rows = range(camera["row"], camera["row"] + n)
+            cols = range(camera["col"], camera["col"] + n)
+            new_rows = rows[n - dr:] if dr > 0 else rows[:-dr]
+            new_cols = cols[n - dc:] if dc > 0 else cols[:-dc]
+            for r in new_rows:
+                for c in cols:
+                    draw_cell(r, c, atlas, mouse_pos, highlights, highlight_col)
+            for c in new_cols:
+                for r in rows:
+                    if r not in new_rows:
+                        draw_cell(r, c, atlas, mouse_pos, highlights, highlight_col)
+            self.profiler.count("cells_drawn", n * (abs(dr) + abs(dc)))
+            draw_scrollbars()
+            return pygame.Rect(MARGIN, MARGIN, n * cs + 8, n * cs + 8)
+
+        def hovered_cell(mouse_pos):
+            mx, my = mouse_pos
+            r = (my - MARGIN) // int(self.cell_size)
+            c = (mx - MARGIN) // int(self.cell_size)
+            n = view_cells()
+            if mx >= MARGIN and my >= MARGIN and r < n and c < n:
+                return (camera["row"] + r, camera["col"] + c)
+            return None
+
+        def overlay_marks():
+            marks = set()
+            if hint: marks.add((hint[0], hint[1]))
+            if last_ai_move: marks.add(last_ai_move)
+            return marks
+
+        def render_frame(curr_time_str, curr_timer_col, show_undo_btn, highlights=None, highlight_col=None,
+                         flash=False):
+            """
+            Draws one frame, repainting only what changed: cells from the
+            board's change log, hover and overlay changes, and the sidebar
+            when anything it shows changed. Pushes just those rectangles to
+            the display. Highlights and the red flash cover the whole grid,
+            so switching either of them repaints everything.
+            """
+            mouse_pos = pygame.mouse.get_pos()
+            hover = hovered_cell(mouse_pos)
+            marks = overlay_marks()
+            sig = sidebar_signature(curr_time_str, curr_timer_col, show_undo_btn)
+            view = (frozenset(highlights) if highlights else None, highlight_col, flash,
+                    camera["row"], camera["col"], int(self.cell_size))
+
+            # A plain pan (only the camera moved) scrolls instead of repainting
+            panned = (render["view"] is not None and view != render["view"]
+                      and view[:3] == render["view"][:3] and view[5] == render["view"][5]
+                      and abs(view[3] - render["view"][3]) < view_cells()
+                      and abs(view[4] - render["view"][4]) < view_cells())
+            if (render["full"] or render["board"] is not board or render["cursor"] > len(board.change_log)
+                    or (view != render["view"] and not panned)):
+                self.profiler.count("full_redraws")
+                self.profiler.count("cells_drawn", view_cells() ** 2)
+                draw_game(curr_time_str, curr_timer_col, show_undo_btn, view[0], highlight_col)
+                if flash:
+                    grid_px = view_cells() * int(self.cell_size)
+                    overlay = pygame.Surface((grid_px, grid_px))
+                    overlay.fill((255, 0, 0))
+                    overlay.set_alpha(150)
+                    self.screen.blit(overlay, (MARGIN, MARGIN))
                 pygame.display.flip()
-                pygame.time.delay(150) 
+                render.update(full=False, board=board, cursor=len(board.change_log),
+                              hover=hover, marks=marks, sidebar=sig, view=view)
+                return
+
+            dirty = set(board.change_log[render["cursor"]:])
+            if hover != render["hover"]:
+                dirty.update(x for x in (hover, render["hover"]) if x is not None)
+            if marks != render["marks"]:
+                dirty |= marks | render["marks"]
+            dirty = {cell for cell in dirty if in_view(*cell)}
+
+            rects = []
+            if panned:
+                rects.append(scroll_grid(render["view"][3], render["view"][4], get_atlas(int(self.cell_size)),
+                                         mouse_pos, view[0], highlight_col))
+                render["view"] = view
+            if dirty:
+                self.profiler.count("cells_drawn", len(dirty))
+                atlas = get_atlas(int(self.cell_size))
+                for r, c in dirty:
+                    rects.append(draw_cell(r, c, atlas, mouse_pos, view[0], highlight_col))
+            if sig != render["sidebar"]:
+                rects.append(draw_sidebar(curr_time_str, curr_timer_col, show_undo_btn))
+            if rects:
+                pygame.display.update(rects)
+
+            render.update(cursor=len(board.change_log), hover=hover, marks=marks, sidebar=sig)
+
+        # --- FLASH EFFECT ---
+        # Two red flashes of 150 ms, drawn by render_frame while the game
+        # loop keeps running
+        def flash_board():
+            nonlocal flash_until
+            flash_until = pygame.time.get_ticks() + 600
+
+        def flash_on():
+            left = flash_until - pygame.time.get_ticks()
+            return left > 0 and (left // 150) % 2 == 1
+
+        def update_perf(now):
+            if now < perf["until"]:
+                return
+            perf["until"] = now + 500
+            stats = self.profiler.summary()
+            if stats is None:
+                perf["lines"] = ("PERF: collecting...",)
+                return
+            lines = [f"PERF  {stats['fps']:5.1f} FPS  {stats['frame_ms']:6.2f} ms/frame"]
+            lines += [f"{name:<14}{ms:7.2f} ms" for name, ms in stats["phases"].items()]
+            lines += [f"{name:<14}{value:7.1f}" for name, value in stats["counters"].items()]
+            perf["lines"] = tuple(lines[:8])
+
+        def export_perf():
+            stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+            base = os.path.join(default_log_dir(), f"perf-{stamp}")
+            try:
+                os.makedirs(default_log_dir(), exist_ok=True)
+                self.profiler.export(base + ".csv")
+                self.profiler.export(base + ".json")
+                ai.log(f"Perf: {len(self.profiler.samples)} frames exported.")
+                print(f"Perf samples written to {base}.csv/.json")
+            except OSError as e:
+                print(f"Error exporting perf samples: {e}")
+
+        def start_ai_turn():
+            ai_turn.update(phase="wait", until=pygame.time.get_ticks() + AI_TURN_DELAY_MS,
+                           submitted=False, done=False, move=None, reason=None)
 
         def log_move(actor, action, r, c, result, reason):
             entry = {
@@ -383,45 +676,28 @@ class App:
             print(f"[LOG] {actor} {action} at ({r},{c}) -> {result} | {reason}")
 
         def save_logs_to_file():
+            # Queued to the background log writer; never blocks the UI
             if not move_log: return
-            log_dir = r"D:\Mines_DAA\Minesweeper_V3.0\Game_logs"
-            if not os.path.exists(log_dir):
-                try: os.makedirs(log_dir)
-                except OSError as e: print(f"Error creating log directory: {e}"); return
-
-            filename = "all_game_logs.txt"
-            filepath = os.path.join(log_dir, filename)
-            timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-            new_block = []
-            new_block.append(f"\n{'='*60}\n SESSION TIMESTAMP: {timestamp}\n{'='*60}\n")
-            new_block.append(f"Grid: {self.grid_size}x{self.grid_size}, Mines: {self.calc_mines()}\n")
-            new_block.append("-" * 105 + "\n")
-            new_block.append(f"{'TIME':<10} | {'ACTOR':<8} | {'ACTION':<10} | {'COORD':<8} | {'RESULT':<20} | {'REASON'}\n")
-            new_block.append("-" * 105 + "\n")
-            
-            for e in move_log:
-                new_block.append(f"{e['Time']:<10} | {e['Actor']:<8} | {e['Action']:<10} | {e['Coord']:<8} | {e['Result']:<20} | {e['Reason']}\n")
-            new_block.append("\n")
-            new_content_str = "".join(new_block)
-
-            old_content = ""
-            if os.path.exists(filepath):
-                try:
-                    with open(filepath, "r") as f: old_content = f.read()
-                except: pass
-
-            try:
-                with open(filepath, "w") as f: f.write(new_content_str + old_content)
-                ai.log("Logs Appended.")
-                move_log.clear() 
-            except Exception as e: print(f"Error saving log: {e}")
+            h_score = scores['Human']['RS'] + 2 * scores['Human']['CF'] - scores['Human']['WF']
+            a_score = scores['AI']['RS'] + 2 * scores['AI']['CF'] - scores['AI']['WF']
+            self.log_writer.write({
+                "timestamp": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "grid_size": self.grid_size,
+                "difficulty": self.difficulty,
+                "mines": self.calc_mines(),
+                "vs_cpu": self.vs_cpu,
+                "winner": board.winner,
+                "scores": {"Human": h_score, "AI": a_score},
+                "moves": list(move_log),
+                "seed": board.seed,
+                # The whole game so far in the binary replay format
+                "replay": base64.b64encode(recorder.to_bytes()).decode("ascii"),
+            })
+            ai.log("Logs Appended.")
+            move_log.clear()
         
         def reveal_all_mines():
-            for r in range(self.grid_size):
-                for c in range(self.grid_size):
-                    if board.grid[r][c].is_mine:
-                        board.grid[r][c].is_revealed = True
+            board.reveal_mines()
 
         def add_points(actor, points):
             if points > 1: return 
@@ -434,20 +710,12 @@ class App:
             total_mines = self.calc_mines()
             total_safe = total_cells - total_mines
             
-            count_revealed = 0
-            for r in range(self.grid_size):
-                for c in range(self.grid_size):
-                    if board.grid[r][c].is_revealed:
-                        count_revealed += 1
+            count_revealed = board.revealed_count()
             
             if count_revealed >= total_safe:
                 board.game_over = True
                 
-                for r in range(self.grid_size):
-                    for c in range(self.grid_size):
-                        cell = board.grid[r][c]
-                        if not cell.is_revealed and not cell.is_flagged:
-                            cell.is_flagged = True 
+                board.flag_remaining()
                 
                 h_score = scores['Human']['RS'] + 2 * scores['Human']['CF'] - scores['Human']['WF']
                 a_score = scores['AI']['RS'] + 2 * scores['AI']['CF'] - scores['AI']['WF']
@@ -459,32 +727,75 @@ class App:
                 ai.log(f"Board Cleared! Winner: {board.winner}")
                 log_move("System", "Game Over", -1, -1, "Board Cleared", f"Winner: {board.winner}")
 
+        events = []
         running = True
         while running:
-            mins = elapsed_time // 60
-            secs = elapsed_time % 60
-            time_str = f"{mins:02}:{secs:02}"
-            timer_color = C_ACCENT if game_started else (100, 100, 100)
-
-            grid_px = self.grid_size * int(self.cell_size)
-            sidebar_x = MARGIN + grid_px + 40
-            
-            btn_back = Button(game_w - 120, game_h - 50, 100, 30, "MENU", color=C_PANEL)
-            btn_reset = Button(game_w - 120, game_h - 90, 100, 30, "RESET", color=C_PANEL)
-            
-            show_undo = True
-            if board.game_over and board.winner == "AI":
-                show_undo = False
-                
-            btn_undo = Button(game_w - 230, game_h - 50, 100, 30, "UNDO", color=C_PANEL)
-            btn_hint = Button(game_w - 230, game_h - 90, 100, 30, "HINT", color=(100, 100, 120))
-            btn_save = Button(game_w - 120, game_h - 130, 100, 30, "SAVE LOG", color=(50, 100, 50))
-
-            for event in pygame.event.get():
+            grid_px = view_cells() * int(self.cell_size)
+            show_undo = not (board.game_over and board.winner == "AI")
+
+            # Collect finished AI work; answers for an earlier board are stale
+            result = ai_worker.poll()
+            if result:
+                job_board, is_hint, move, reason, error = result
+                if error:
+                    # Full traceback on stderr; its last line goes to the
+                    # sidebar and the game log
+                    print(error, file=sys.stderr, end="")
+                    message = error.strip().splitlines()[-1]
+                    ai.log(f"AI error: {message}")
+                    log_move("System", "AI Error", -1, -1, message, "Hint" if is_hint else "AI turn")
+                if job_board is board:
+                    if is_hint:
+                        # The board may have moved on since the hint was asked for
+                        if move and board.grid[move[0]][move[1]].is_revealed:
+                            move = None
+                        if move:
+                            hint = move
+                            show_cell(move[0], move[1])
+                            ai.log("Hint: Logic found.")
+                        elif not error:
+                            ai.log("Hint: No strict logic found.")
+                    elif ai_turn["phase"]:
+                        ai_turn.update(done=True, move=move, reason=reason)
+            self.profiler.lap("setup")
+
+            for event in events:
                 if event.type == pygame.QUIT:
                     save_logs_to_file() 
-                    pygame.quit(); sys.exit()
+                    self.quit()
                 
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_F3:
+                        ai.log(f"Perf overlay {'on' if self.profiler.toggle() else 'off'}.")
+                        perf["until"] = 0
+                    elif event.key == pygame.K_F4:
+                        export_perf()
+                    elif event.key in (pygame.K_UP, pygame.K_DOWN, pygame.K_LEFT, pygame.K_RIGHT):
+                        # Arrows pan by a cell, or by half a view with Shift
+                        step = max(1, view_cells() // 2) if event.mod & pygame.KMOD_SHIFT else 1
+                        dr = {pygame.K_UP: -step, pygame.K_DOWN: step}.get(event.key, 0)
+                        dc = {pygame.K_LEFT: -step, pygame.K_RIGHT: step}.get(event.key, 0)
+                        move_camera(camera["row"] + dr, camera["col"] + dc)
+
+                if event.type == pygame.MOUSEWHEEL and not is_resizing:
+                    zoom(2 * event.y, pygame.mouse.get_pos())
+                    render["full"] = True
+
+                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 2:
+                    pan_drag = [0, 0]
+                if event.type == pygame.MOUSEBUTTONUP and event.button == 2:
+                    pan_drag = None
+                if event.type == pygame.MOUSEMOTION and pan_drag is not None:
+                    # Middle-drag pans in whole cells; the remainder carries over
+                    pan_drag[0] += event.rel[0]
+                    pan_drag[1] += event.rel[1]
+                    cs = int(self.cell_size)
+                    dc, dr = int(pan_drag[0] / cs), int(pan_drag[1] / cs)
+                    if dr or dc:
+                        move_camera(camera["row"] - dr, camera["col"] - dc)
+                        pan_drag[0] -= dc * cs
+                        pan_drag[1] -= dr * cs
+
                 if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                     handle_rect = pygame.Rect(MARGIN + grid_px, MARGIN + grid_px, 25, 25)
                     if handle_rect.collidepoint(event.pos): is_resizing = True
@@ -492,29 +803,34 @@ class App:
                 if event.type == pygame.MOUSEBUTTONUP:
                     if is_resizing:
                         is_resizing = False
-                        game_w, game_h = update_window_size()
+                        render["full"] = True
 
                 if event.type == pygame.MOUSEMOTION and is_resizing:
                     dx = event.rel[0]
                     dy = event.rel[1]
                     change = (dx + dy) / 20 
                     self.cell_size += change
-                    if self.cell_size < 15: self.cell_size = 15
-                    if self.cell_size > 50: self.cell_size = 50
+                    if self.cell_size < MIN_CELL_SIZE: self.cell_size = MIN_CELL_SIZE
+                    if self.cell_size > MAX_CELL_SIZE: self.cell_size = MAX_CELL_SIZE
+                    move_camera(camera["row"], camera["col"])
+                    render["full"] = True
 
                 if btn_back.is_clicked(event):
                     save_logs_to_file()
+                    ai_worker.close()
+                    pygame.key.set_repeat()
                     self.mode = "Menu"
-                    self.screen = pygame.display.set_mode((800, 600)) 
                     return
 
                 if btn_save.is_clicked(event): save_logs_to_file()
 
                 if btn_reset.is_clicked(event):
                     save_logs_to_file()
-                    board = init_game()
+                    board, recorder = init_game()
                     scores = {"Human": {'RS':0, 'CF':0, 'WF':0}, "AI": {'RS':0, 'CF':0, 'WF':0}}
                     turn = "Human"
+                    ai_turn["phase"] = None
+                    flash_until = 0
                     hint = None
                     last_ai_move = None 
                     ai_moves.clear()
@@ -527,23 +843,20 @@ class App:
 
                 if show_undo and btn_undo.is_clicked(event):
                     if turn == "Human" and board.undo():
+                         recorder.record("undo", 0, 0, True)
                          ai.log("Undo successful.")
                          hint = None
                          last_ai_move = None 
 
                 if btn_hint.is_clicked(event):
-                      move = ai.get_move(board, is_hint=True)
-                      if move:
-                          hint = move 
-                          ai.log("Hint: Logic found.")
-                      else:
-                          ai.log("Hint: No strict logic found.")
-
-                if event.type == pygame.MOUSEBUTTONDOWN and not board.game_over and not is_resizing:
-                    mx, my = event.pos
-                    if MARGIN <= mx < MARGIN + grid_px and MARGIN <= my < MARGIN + grid_px:
-                        c = int((mx - MARGIN) // self.cell_size)
-                        r = int((my - MARGIN) // self.cell_size)
+                      if not ai_worker.submit(board, is_hint=True, time_limit=AI_MOVE_TIME_LIMIT):
+                          ai.log("Hint: AI is busy.")
+
+                if (event.type == pygame.MOUSEBUTTONDOWN and event.button in (1, 3)
+                        and not board.game_over and not is_resizing):
+                    cell_pos = hovered_cell(event.pos)
+                    if cell_pos:
+                        r, c = cell_pos
                         
                         if 0 <= r < self.grid_size and 0 <= c < self.grid_size:
                             if turn == "Human":
@@ -560,8 +873,9 @@ class App:
                                     cell = board.grid[r][c]
                                     if not cell.is_revealed:
                                         res = board.reveal(r, c)
+                                        recorder.record("reveal", r, c, res)
                                         if res == -999:
-                                            flash_board(time_str, timer_color) 
+                                            flash_board()
                                             ai.log("Human Hit Mine! Game Over.")
                                             board.winner = "AI"
                                             board.game_over = True 
@@ -576,9 +890,10 @@ class App:
 
                                     elif cell.is_revealed: # Chording
                                         res = board.chord(r, c)
+                                        recorder.record("chord", r, c, res)
                                         reason_str = "Manual Chord"
                                         if res == -999:
-                                            flash_board(time_str, timer_color) 
+                                            flash_board()
                                             ai.log("Human Chording Hit Mine!")
                                             board.winner = "AI"
                                             board.game_over = True 
@@ -596,6 +911,7 @@ class App:
                                     
                                 elif event.button == 3: # Right Click
                                     if board.toggle_flag(r, c):
+                                        recorder.record("flag", r, c, True)
                                         action_taken = True
                                         res_str = "Flag Toggled"
                                         if board.grid[r][c].is_mine: scores['Human']['CF'] += 1
@@ -609,35 +925,54 @@ class App:
                                     check_victory()
                                     if not board.game_over and self.vs_cpu:
                                         turn = "AI"
-                                        ai_timer = 45 
-
-            # --- UPDATED AI TURN LOGIC WITH VISUALIZATION ---
-            if self.vs_cpu and turn == "AI" and not board.game_over:
-                ai_timer -= 1
-                if ai_timer <= 0:
+                                        start_ai_turn()
+
+            self.profiler.lap("events")
+
+            # --- AI TURN LOGIC WITH VISUALIZATION ---
+            # Driven by timers: every phase ends at ai_turn["until"] and the
+            # loop keeps handling events and drawing in between.
+            highlights = None
+            highlight_col = None
+            now = pygame.time.get_ticks()
+            if self.vs_cpu and turn == "AI" and not board.game_over and ai_turn["phase"]:
+                if not ai_turn["submitted"]:
+                    # The board does not change during the AI turn, so the
+                    # move is computed while the phases below play out
+                    ai_turn["submitted"] = ai_worker.submit(board, time_limit=AI_MOVE_TIME_LIMIT)
+
+                if ai_turn["phase"] == "wait" and now >= ai_turn["until"]:
                     # 1. VISUALIZE CANDIDATES (Thinking Phase - Cyan)
-                    frontier = get_frontier(board)
-                    if frontier:
-                        draw_game(time_str, timer_color, show_undo, highlights=frontier, highlight_col=C_THINKING)
-                        pygame.display.flip()
-                        pygame.time.delay(300)
-
-                    # Get the actual move
-                    move = ai.get_move(board)
-                    if move:
-                        r, c, act = move
-                        
-                        # 2. VISUALIZE CHOICE (Choosing Phase - Yellow)
-                        draw_game(time_str, timer_color, show_undo, highlights=[(r,c)], highlight_col=C_CHOOSING)
-                        pygame.display.flip()
-                        pygame.time.delay(300) # Pause to show choice
+                    ai_turn["frontier"] = board.get_frontier_cells()
+                    ai_turn.update(phase="thinking",
+                                   until=now + (AI_HIGHLIGHT_MS if ai_turn["frontier"] else 0))
+
+                if ai_turn["phase"] == "thinking":
+                    highlights, highlight_col = ai_turn["frontier"], C_THINKING
+                    if now >= ai_turn["until"] and ai_turn["done"]:
+                        if ai_turn["move"]:
+                            # 2. VISUALIZE CHOICE (Choosing Phase - Yellow)
+                            ai_turn.update(phase="choosing", until=now + AI_HIGHLIGHT_MS)
+                            show_cell(ai_turn["move"][0], ai_turn["move"][1])
+                        else:
+                            ai_turn["phase"] = None
+                            turn = "Human"
+
+                if ai_turn["phase"] == "choosing":
+                    r, c, act = ai_turn["move"]
+                    highlights, highlight_col = [(r, c)], C_CHOOSING
+                    if now >= ai_turn["until"]:
+                        highlights = highlight_col = None
+                        ai_turn["phase"] = None
 
                         # 3. EXECUTE MOVE
                         last_ai_move = (r, c)
                         ai_moves.add((r, c))
                         total_moves += 1 
                         
-                        ai_reason = ai.logs[-1] if ai.logs else "Unknown"
+                        # The worker's own message for this move: the log
+                        # may have gained other lines since it was chosen
+                        ai_reason = ai_turn["reason"] or "Unknown"
                         if ai_reason.startswith("AI: "): ai_reason = ai_reason[4:]
 
                         res_str = ""
@@ -645,6 +980,7 @@ class App:
 
                         if act == 'reveal':
                             res = board.reveal(r, c)
+                            recorder.record("reveal", r, c, res)
                             if res == -999:
                                 ai.log("AI Hit Mine! Game Over.")
                                 board.winner = "Human"
@@ -656,23 +992,44 @@ class App:
                                 add_points("AI", points) 
                                 res_str = f"Safe ({res} cells)"
                         elif act == 'flag':
-                            board.toggle_flag(r, c)
+                            recorder.record("flag", r, c, board.toggle_flag(r, c))
                             if board.grid[r][c].is_mine: scores['AI']['CF'] += 1
                             else: scores['AI']['WF'] += 1
                             res_str = "Flag Placed"
                         
                         log_move("AI", act.capitalize(), r, c, res_str, ai_reason)
                         check_victory()
-
-                    turn = "Human"
+                        turn = "Human"
 
             if game_started and not board.game_over:
                 elapsed_time = (pygame.time.get_ticks() - start_ticks) // 1000
+            time_str = f"{elapsed_time // 60:02}:{elapsed_time % 60:02}"
+            timer_color = C_ACCENT if game_started else (100, 100, 100)
+            show_undo = not (board.game_over and board.winner == "AI")
 
-            # Standard draw call (no highlights)
-            draw_game(time_str, timer_color, show_undo)
-            pygame.display.flip()
-            self.clock.tick(60)
+            self.profiler.lap("game_logic")
+
+            # Only changed regions are redrawn
+            if self.profiler.enabled:
+                update_perf(now)
+            render_frame(time_str, timer_color, show_undo, highlights, highlight_col, flash_on())
+            self.profiler.lap("draw")
+
+            # --- SCHEDULING ---
+            # Sleep until input or whatever is due next: the clock's next
+            # second, the end of an AI turn phase, the flash or the perf
+            # overlay refresh. A pending AI move wakes the loop itself.
+            if game_started and not board.game_over:
+                self.scheduler.wake_at(start_ticks + (elapsed_time + 1) * 1000)
+            if ai_turn["phase"] and not (ai_turn["phase"] == "thinking" and now >= ai_turn["until"]):
+                self.scheduler.wake_at(ai_turn["until"])
+            if flash_until > now:
+                self.scheduler.animate()
+            if self.profiler.enabled:
+                self.scheduler.wake_at(perf["until"])
+            events = self.scheduler.wait()
+            self.profiler.lap("idle")
+            self.profiler.end_frame()
 
 
 
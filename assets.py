@@ -0,0 +1,55 @@
+import os
+import threading
+
+import pygame
+
+# --- BACKGROUND ASSETS ---
+# The menu background is decoded, scaled and blurred on a worker thread
+# while the window opens, so startup never waits on the image. Until it
+# is ready (or if it is missing) screens draw the plain background
+# colour. Both versions are made once: the sharp one for the menu and
+# the darkened blur that settings draws behind its panel. Surfaces are
+# converted to the display format on first use, on the main thread.
+
+IMAGE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Images")
+BACKGROUND_PATH = os.path.join(IMAGE_DIR, "Startup-Page-BG-Image.jpg")
+
+
+class BackgroundLoader:
+    def __init__(self, size, path=BACKGROUND_PATH, on_done=None):
+        self.size = size
+        self.path = path
+        self.on_done = on_done
+        self._loaded = None  # {"sharp": Surface, "blurred": Surface} once done
+        self._converted = {}
+        self._thread = threading.Thread(target=self._load, daemon=True)
+        self._thread.start()
+
+    def _load(self):
+        try:
+            image = pygame.image.load(self.path)
+            sharp = pygame.transform.smoothscale(image, self.size)
+            # Blur by scaling down to a tenth and back up, then darken
+            w, h = self.size
+            small = pygame.transform.smoothscale(sharp, (max(w // 10, 1), max(h // 10, 1)))
+            blurred = pygame.transform.smoothscale(small, self.size)
+            dark_overlay = pygame.Surface(self.size)
+            dark_overlay.set_alpha(100)
+            blurred.blit(dark_overlay, (0, 0))
+            self._loaded = {"sharp": sharp, "blurred": blurred}
+        except (pygame.error, OSError) as e:
+            print(f"Could not load background: {e}")
+        if self.on_done:
+            self.on_done()
+
+    def get(self, name):
+        """
+        Returns the 'sharp' or 'blurred' background, or None while it is
+        still loading or when the image could not be loaded.
+        """
+        if self._loaded is None:
+            return None
+        surf = self._converted.get(name)
+        if surf is None:
+            surf = self._converted[name] = self._loaded[name].convert()
+        return surf
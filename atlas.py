@@ -0,0 +1,75 @@
+import functools
+
+import pygame
+from constants import *
+
+# --- GLYPH ATLAS ---
+# Cell sprites (tiles, numbers, flag, mine) pre-rendered for one cell
+# size, so drawing the grid is plain blits instead of font lookups and
+# shape drawing for every cell on every frame.
+
+
+@functools.lru_cache(maxsize=None)
+def get_font(name, size, bold=False):
+    """Cached pygame.font.SysFont; system font lookups are slow."""
+    return pygame.font.SysFont(name, size, bold=bold)
+
+
+class GlyphAtlas:
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.tile_size = cell_size - 1
+
+        self.hidden = self._tile(C_CELL_HIDDEN)
+        self.hover = self._tile(C_CELL_HOVER)
+        self.revealed = self._tile(C_CELL_REVEALED)
+
+        self.mine = self._tile(C_CELL_REVEALED)
+        pygame.draw.circle(self.mine, C_MINE, self._center(), cell_size // 4)
+
+        self.flag = self._with_flag(self._tile(C_CELL_HIDDEN))
+        self.flag_hover = self._with_flag(self._tile(C_CELL_HOVER))
+
+        font = get_font("Segoe UI", int(cell_size * 0.7), True)
+        self.numbers = {}
+        for n, color in C_NUMS.items():
+            tile = self._tile(C_CELL_REVEALED)
+            txt = font.render(str(n), True, color)
+            tile.blit(txt, txt.get_rect(center=self._center()))
+            self.numbers[n] = tile
+
+    def _tile(self, color):
+        surf = pygame.Surface((self.tile_size, self.tile_size), pygame.SRCALPHA)
+        pygame.draw.rect(surf, color, surf.get_rect(), border_radius=4)
+        return surf
+
+    def _center(self):
+        return (self.tile_size // 2, self.tile_size // 2)
+
+    def _with_flag(self, tile):
+        cx, cy = self._center()
+        off = 5 * (self.cell_size / 35)
+        pts = [(cx - off, cy + off), (cx - off, cy - off), (cx + off, cy)]
+        pygame.draw.polygon(tile, C_FLAG, pts)
+        return tile
+
+    def sprite(self, cell, is_hover):
+        """Returns the sprite to blit for a cell in its current state."""
+        if cell.is_revealed:
+            if cell.is_mine:
+                return self.mine
+            if cell.number > 0:
+                return self.numbers[cell.number]
+            return self.revealed
+        if cell.is_flagged:
+            return self.flag_hover if is_hover else self.flag
+        return self.hover if is_hover else self.hidden
+
+
+@functools.lru_cache(maxsize=8)
+def get_atlas(cell_size):
+    """
+    Atlas for an integer cell size. Only a resize of the grid changes the
+    size, and the few most recent sizes stay cached while dragging.
+    """
+    return GlyphAtlas(cell_size)
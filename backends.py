@@ -0,0 +1,20 @@
+import importlib
+
+# --- BOARD BACKENDS ---
+# Every backend exposes the same interface as board.Board (reveal, chord,
+# toggle_flag, undo, grid[r][c], frontier, ...), so the AI solver, the
+# simulator and the app can switch between them by name. Modules are
+# imported on first use, so optional dependencies such as numpy are only
+# needed when that backend is picked.
+BACKENDS = {
+    "list": ("board", "Board"),
+    "numpy": ("numpy_board", "NumpyBoard"),
+    "bitboard": ("bitboard", "BitBoard"),
+}
+
+
+def make_board(backend, rows, cols, mines, **kwargs):
+    """Creates a board using the named backend ('list', 'numpy' or 'bitboard')."""
+    module_name, class_name = BACKENDS[backend]
+    board_class = getattr(importlib.import_module(module_name), class_name)
+    return board_class(rows, cols, mines, **kwargs)
@@ -0,0 +1,189 @@
+"""
+Lockstep batch simulator.
+
+Plays many games at once on a stack of boards held as (K, rows, cols)
+NumPy arrays. Every step applies the same vectorized operations to the
+whole batch: mine placement, number computation, the satisfaction and
+deduction rules of AI_Solver (rules 1 and 2) and flood fills all run as
+array operations, so the per-game cost is a few array elements rather
+than Python-level cell objects.
+
+The player here is the local-rules solver: each step it reveals every
+cell rule 1 proves safe and flags every cell rule 2 proves mined, in
+one batch. A game with nothing proven guesses a random hidden cell.
+There is no pairwise rule and no probability engine, so win rates are
+lower than simulate.py's full AI_Solver. Use it for large-sample
+statistics of the basic rules and of board generation:
+
+    python simulate.py --engine batch --games 50000 --size 16 --difficulty Medium
+
+Layouts come from NumPy's generator, so games are reproducible for a
+given seed but differ from the seeded boards of the other backends.
+"""
+
+import time
+
+import numpy as np
+
+from constants import DIFFICULTY_RATIOS
+
+
+def _shifts(mask):
+    # The 8 neighbour-shifted copies of a (K, rows, cols) array
+    rows, cols = mask.shape[1:]
+    padded = np.pad(mask, ((0, 0), (1, 1), (1, 1)))
+    for dr in (-1, 0, 1):
+        for dc in (-1, 0, 1):
+            if dr or dc:
+                yield padded[:, 1 + dr:1 + dr + rows, 1 + dc:1 + dc + cols]
+
+
+def neighbor_counts(mask):
+    """Per-square count of set neighbours, for every board in the batch."""
+    counts = np.zeros(mask.shape, dtype=np.int8)
+    for shifted in _shifts(mask.astype(np.int8)):
+        counts += shifted
+    return counts
+
+
+def dilate(mask):
+    """Squares with at least one set neighbour, for every board in the batch."""
+    out = np.zeros(mask.shape, dtype=bool)
+    for shifted in _shifts(mask):
+        out |= shifted
+    return out
+
+
+def place_mines(rng, count, rows, cols, mines):
+    """
+    Random layouts with the first click and its neighbours kept clear.
+
+    Returns:
+    - (mines, first_click): a (count, rows, cols) bool array and a
+      (count, 2) array of opening (row, col)
+    """
+    first = np.stack([rng.integers(rows, size=count), rng.integers(cols, size=count)], axis=1)
+    rr, cc = np.indices((rows, cols))
+    near = ((np.abs(rr[None] - first[:, 0, None, None]) <= 1)
+            & (np.abs(cc[None] - first[:, 1, None, None]) <= 1))
+    # Each board takes the `mines` squares with the smallest random keys,
+    # with the opening's squares pushed out of reach
+    keys = rng.random((count, rows * cols))
+    keys[near.reshape(count, -1)] = 2.0
+    picks = np.argpartition(keys, mines - 1, axis=1)[:, :mines]
+    layout = np.zeros((count, rows * cols), dtype=bool)
+    np.put_along_axis(layout, picks, True, axis=1)
+    return layout.reshape(count, rows, cols), first
+
+
+def flood(start, zero, blocked):
+    """
+    Squares opened by revealing `start`: the start squares plus every
+    square reached through zero squares, never entering `blocked`.
+    """
+    opened = start.copy()
+    wave = start & zero
+    while wave.any():
+        grown = dilate(wave) & ~opened & ~blocked
+        opened |= grown
+        wave = grown & zero
+    return opened
+
+
+def simulate_batch(count, rows, cols, mines, rng):
+    """
+    Plays `count` games in lockstep.
+
+    Returns:
+    - dict of per-game arrays: 'won' (bool), 'moves' (cells acted on),
+      'turns' (lockstep steps the game took part in) and 'guesses'
+    """
+    mine, first = place_mines(rng, count, rows, cols, mines)
+    number = np.where(mine, 0, neighbor_counts(mine)).astype(np.int8)
+    zero = (number == 0) & ~mine
+    safe_cells = rows * cols - mines
+
+    revealed = np.zeros(mine.shape, dtype=bool)
+    flagged = np.zeros(mine.shape, dtype=bool)
+    won = np.zeros(count, dtype=bool)
+    moves = np.ones(count, dtype=np.int32)
+    guesses = np.ones(count, dtype=np.int32)  # the opening click is a guess
+    turns = np.ones(count, dtype=np.int32)  # the opening is a turn too
+
+    # Opening click
+    start = np.zeros(mine.shape, dtype=bool)
+    start[np.arange(count), first[:, 0], first[:, 1]] = True
+    revealed |= flood(start, zero, flagged)
+
+    # Games still running, as indices into the full batch; finished
+    # games are dropped so later steps only touch live boards
+    live = np.arange(count)
+    while live.size:
+        turns[live] += 1
+        m, rev, flg, num = mine[live], revealed[live], flagged[live], number[live]
+        hidden = ~rev & ~flg
+        hidden_count = neighbor_counts(hidden)
+        flag_count = neighbor_counts(flg)
+        numbered = rev & ~m & (hidden_count > 0)
+
+        # RULE 1 (satisfaction) and RULE 2 (deduction), everywhere at once
+        safe = dilate(numbered & (num == flag_count)) & hidden
+        found = dilate(numbered & (num == flag_count + hidden_count)) & hidden
+
+        acted = (safe | found).reshape(live.size, -1)
+        stuck = ~acted.any(axis=1)
+        moves[live] += acted.sum(axis=1)
+
+        # Stuck games guess one random hidden square
+        if stuck.any():
+            keys = np.where(hidden[stuck], rng.random(hidden[stuck].shape), -1.0)
+            pick = keys.reshape(int(stuck.sum()), -1).argmax(axis=1)
+            guess = np.zeros((int(stuck.sum()), rows * cols), dtype=bool)
+            guess[np.arange(pick.size), pick] = True
+            safe[stuck] |= guess.reshape(-1, rows, cols)
+            guesses[live[stuck]] += 1
+            moves[live[stuck]] += 1
+
+        flg |= found
+        lost = (safe & m).reshape(live.size, -1).any(axis=1)
+        rev |= flood(safe & ~m, zero[live], flg | rev) | (safe & m)
+
+        revealed[live] = rev
+        flagged[live] = flg
+        done_safe = (rev & ~m).reshape(live.size, -1).sum(axis=1) == safe_cells
+        won[live[done_safe & ~lost]] = True
+        live = live[~lost & ~done_safe]
+
+    return {"won": won, "moves": moves, "turns": turns, "guesses": guesses}
+
+
+def run_batch(games, size, difficulty, seed=0, batch_size=4096):
+    """
+    Plays `games` games in lockstep batches of `batch_size` boards and
+    aggregates them like simulate.run_simulation.
+    """
+    mines = int(size * size * DIFFICULTY_RATIOS[difficulty])
+    rng = np.random.default_rng(seed)
+
+    start_time = time.perf_counter()
+    results = []
+    for start in range(0, games, batch_size):
+        results.append(simulate_batch(min(batch_size, games - start), size, size, mines, rng))
+    elapsed = time.perf_counter() - start_time
+
+    totals = {key: sum(int(res[key].sum()) for res in results) for key in ("won", "moves", "turns", "guesses")}
+    return {
+        "games": games,
+        "size": size,
+        "difficulty": difficulty,
+        "mines": mines,
+        "backend": "batch",
+        "workers": 1,
+        "wins": totals["won"],
+        "win_rate": totals["won"] / games if games else 0.0,
+        "moves_per_game": totals["moves"] / games if games else 0.0,
+        "turns_per_game": totals["turns"] / games if games else 0.0,
+        "guesses_per_game": totals["guesses"] / games if games else 0.0,
+        "elapsed_s": elapsed,
+        "games_per_second": games / elapsed if elapsed > 0 else 0.0,
+    }
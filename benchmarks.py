@@ -0,0 +1,190 @@
+"""
+Micro/macro benchmarks for the board and solver hot paths.
+
+Times board construction, topology building, mine placement, flood-fill
+reveals, chording, undo bookkeeping and AI_Solver.get_move across grid
+sizes and the Easy/Medium/Hard mine densities. Results are written as JSON
+and can be compared against a stored baseline to flag regressions:
+
+    python benchmarks.py --save-baseline          # record a baseline
+    python benchmarks.py                          # compare against it
+    python benchmarks.py --full --backend numpy   # include 500x500 and 1000x1000
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+from ai_solver import AI_Solver
+from backends import BACKENDS, make_board
+from bitboard import MAX_CELLS as BITBOARD_MAX_CELLS
+from constants import DIFFICULTY_RATIOS
+from topology import build_topology
+
+DEFAULT_SIZES = [8, 16, 32, 100, 250]
+FULL_SIZES = DEFAULT_SIZES + [500, 1000]
+DEFAULT_OUTPUT = "bench_results.json"
+DEFAULT_BASELINE = "bench_baseline.json"
+
+
+def measure(setup, op, min_time=0.2, max_repeats=50):
+    """
+    Times `op(state)` on fresh state from `setup()` until `min_time`
+    seconds of samples (or `max_repeats` samples) are collected.
+    Setup cost is excluded from the samples.
+    """
+    samples = []
+    while len(samples) < max_repeats and (not samples or sum(samples) < min_time):
+        state = setup()
+        start = time.perf_counter()
+        op(state)
+        samples.append(time.perf_counter() - start)
+    return {"median_s": statistics.median(samples), "min_s": min(samples), "repeats": len(samples)}
+
+
+# --- SETUP HELPERS ---
+def _fresh(backend, size, mines):
+    random.seed(size * 7919 + mines)
+    return make_board(backend, size, size, mines)
+
+
+def _mined(backend, size, mines):
+    board = _fresh(backend, size, mines)
+    board.place_mines(size // 2, size // 2)
+    board.first_click = False
+    return board
+
+
+def _opened(backend, size, mines):
+    board = _mined(backend, size, mines)
+    board.reveal(size // 2, size // 2)
+    return board
+
+
+def _chord_ready(backend, size, mines):
+    # Flags the mines around a frontier cell so that chording it reveals
+    # its remaining safe neighbours.
+    board = _opened(backend, size, mines)
+    for cell in board.get_frontier_nodes():
+        hidden = board.get_hidden_neighbors(cell)
+        if any(not n.is_mine for n in hidden):
+            for n in hidden:
+                if n.is_mine:
+                    board.toggle_flag(n.r, n.c)
+            return board, cell
+    return board, None
+
+
+def _chord(state):
+    board, cell = state
+    if cell is not None:
+        board.chord(cell.r, cell.c)
+
+
+def bench_case(backend, size, difficulty):
+    mines = int(size * size * DIFFICULTY_RATIOS[difficulty])
+    results = {}
+    results["board_init"] = measure(lambda: None, lambda _: make_board(backend, size, size, mines))
+    results["build_topology"] = measure(lambda: None, lambda _: build_topology("square", size, size))
+    results["place_mines"] = measure(lambda: _fresh(backend, size, mines),
+                                     lambda b: b.place_mines(size // 2, size // 2))
+    results["reveal_flood_fill"] = measure(lambda: _mined(backend, size, mines),
+                                           lambda b: b.reveal(size // 2, size // 2))
+    results["chord"] = measure(lambda: _chord_ready(backend, size, mines), _chord)
+    results["save_state"] = measure(lambda: _opened(backend, size, mines),
+                                    lambda b: b.save_state())
+    results["undo"] = measure(lambda: _opened(backend, size, mines), lambda b: b.undo())
+    results["ai_get_move"] = measure(lambda: (_opened(backend, size, mines), AI_Solver()),
+                                     lambda s: s[1].get_move(s[0]))
+    return results
+
+
+def run_benchmarks(sizes, backend="list", difficulties=None):
+    difficulties = difficulties or list(DIFFICULTY_RATIOS)
+    results = {}
+    for size in sizes:
+        if backend == "bitboard" and size * size > BITBOARD_MAX_CELLS:
+            print(f"skipping {size}x{size}: too large for the bitboard backend")
+            continue
+        for difficulty in difficulties:
+            for name, timing in bench_case(backend, size, difficulty).items():
+                results[f"{name}/{size}x{size}/{difficulty}"] = timing
+                print(f"{name:<18} {size:>5}x{size:<5} {difficulty:<7} "
+                      f"{timing['median_s'] * 1000:10.3f} ms  (x{timing['repeats']})")
+    return {
+        "meta": {
+            "backend": backend,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold, min_delta_s=0.0):
+    """
+    Returns (name, baseline_s, current_s, ratio) for every benchmark whose
+    median got slower than the baseline by more than `threshold`.
+    Slowdowns smaller than `min_delta_s` are treated as timer noise.
+    """
+    regressions = []
+    for name, timing in current["results"].items():
+        base = baseline["results"].get(name)
+        if not base or base["median_s"] <= 0:
+            continue
+        ratio = timing["median_s"] / base["median_s"]
+        if ratio > 1 + threshold and timing["median_s"] - base["median_s"] >= min_delta_s:
+            regressions.append((name, base["median_s"], timing["median_s"], ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the board and solver hot paths.")
+    parser.add_argument("--sizes", type=lambda s: [int(x) for x in s.split(",")], default=None,
+                        help="comma-separated grid sizes (default: %s)" % ",".join(map(str, DEFAULT_SIZES)))
+    parser.add_argument("--full", action="store_true", help="also run the 500 and 1000 grids")
+    parser.add_argument("--backend", choices=list(BACKENDS), default="list")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown before flagging a regression (default: 25%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=0.01,
+                        help="ignore slowdowns smaller than this many milliseconds")
+    args = parser.parse_args(argv)
+
+    sizes = args.sizes or (FULL_SIZES if args.full else DEFAULT_SIZES)
+    report = run_benchmarks(sizes, backend=args.backend)
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one.")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(report, baseline, args.threshold, args.min_delta_ms / 1000)
+    for name, base_s, cur_s, ratio in regressions:
+        print(f"REGRESSION {name}: {base_s * 1000:.3f} ms -> {cur_s * 1000:.3f} ms ({ratio:.2f}x)")
+    if not regressions:
+        print("No regressions against baseline.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,363 @@
+import functools
+import random
+from collections import deque
+
+from cell import CellView, GridView
+from topology import get_topology
+
+# --- BITBOARD ENGINE ---
+# Same public interface as board.Board, but mines, revealed cells and
+# flags are each one arbitrary-precision integer with bit (r * cols + c)
+# per square. Every cell gets a neighbour mask, built from the board's
+# topology, so neighbour counts, hidden-neighbour sets and flood-fill
+# expansion are a handful of bitwise operations. On the square topology
+# the flood fill grows the whole wavefront with shifts.
+#
+# Precomputed masks grow with the board (one N-bit integer per cell, so
+# memory rises with side**4), so this engine is meant for the
+# settings-screen sizes and refuses boards over MAX_CELLS; the NumPy
+# backend is the better fit for very large boards.
+MAX_CELLS = 128 * 128
+
+
+def _bits(mask):
+    """Yields the index of every set bit in `mask`, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def _dilate(mask, cols, all_mask, not_left, not_right):
+    """Grows `mask` by one cell in all 8 directions."""
+    row = mask | ((mask << 1) & not_left) | ((mask >> 1) & not_right)
+    return (row | (row << cols) | (row >> cols)) & all_mask
+
+
+@functools.lru_cache(maxsize=16)
+def _masks(topology):
+    """
+    Shift masks and per-cell neighbour masks for one topology. Topologies
+    are shared per board shape, so every board of that shape shares them.
+    """
+    rows, cols = topology.rows, topology.cols
+    all_mask = (1 << topology.size) - 1
+    # Column masks keep horizontal shifts from wrapping between rows
+    left_col = 0
+    right_col = 0
+    for r in range(rows):
+        left_col |= 1 << (r * cols)
+        right_col |= 1 << (r * cols + cols - 1)
+    not_left = all_mask & ~left_col
+    not_right = all_mask & ~right_col
+    off, idx = topology.offsets, topology.indices
+    masks = tuple(sum(1 << j for j in idx[off[i]:off[i + 1]]) for i in range(topology.size))
+    return not_left, not_right, masks
+
+
+class BitBoard:
+    def __init__(self, rows, cols, mines, history_depth=10, seed=None, topology="square"):
+        if rows * cols > MAX_CELLS:
+            raise ValueError(f"{rows}x{cols} is too large for a BitBoard (at most {MAX_CELLS} cells); "
+                             "use the numpy or list backend")
+        self.rows = rows
+        self.cols = cols
+        self.total_mines = mines
+        self.size = rows * cols
+        self.all_mask = (1 << self.size) - 1
+        self.topology = get_topology(topology, rows, cols)
+
+        self.mines = 0
+        self.revealed = 0
+        self.flagged = 0
+        self.number = [0] * self.size
+        self.zeros = 0  # safe cells with no neighbouring mines
+
+        self.grid = GridView(self)
+        self.game_over = False
+        self.winner = None
+        self.first_click = True
+        # Mine layouts are a pure function of (seed, first click), so any
+        # game can be rebuilt and replayed from its seed
+        self.seed = random.getrandbits(64) if seed is None else seed
+        # Undo log of per-action deltas (bit masks of changed cells)
+        self.history = deque(maxlen=history_depth)
+        # Live frontier index: (r, c) of revealed numbered cells that still
+        # touch at least one hidden, unflagged cell.
+        self.frontier = set()
+        # Append-only log of (r, c) whose state changed
+        self.change_log = []
+        # Bumped on every state change, so results can be cached per version
+        self.version = 0
+        self._build_masks()
+
+    def _build_masks(self):
+        self.not_left, self.not_right, self.masks = _masks(self.topology)
+        # Shifts only match the square neighbourhood; other topologies
+        # dilate by OR-ing the neighbour masks of the set cells
+        self._shift_dilate = self.topology.name == "square"
+
+    def _dilate(self, mask):
+        if self._shift_dilate:
+            return _dilate(mask, self.cols, self.all_mask, self.not_left, self.not_right)
+        grown = mask
+        for i in _bits(mask):
+            grown |= self.masks[i]
+        return grown
+
+    def _hidden(self):
+        return self.all_mask & ~self.revealed & ~self.flagged
+
+    def _coords(self, mask):
+        return [divmod(i, self.cols) for i in _bits(mask)]
+
+    # --- CELL VIEW ACCESS ---
+    def get_cell_attr(self, r, c, name):
+        i = r * self.cols + c
+        if name == "number":
+            return self.number[i]
+        field = {"is_mine": self.mines, "is_revealed": self.revealed, "is_flagged": self.flagged}[name]
+        return bool(field >> i & 1)
+
+    def set_cell_attr(self, r, c, name, value):
+        i = r * self.cols + c
+        if name == "number":
+            self.number[i] = value
+            return
+        attr = {"is_mine": "mines", "is_revealed": "revealed", "is_flagged": "flagged"}[name]
+        bit = 1 << i
+        setattr(self, attr, getattr(self, attr) | bit if value else getattr(self, attr) & ~bit)
+
+    def neighbors_of(self, r, c):
+        return [CellView(self, nr, nc) for nr, nc in self.topology.neighbor_coords(r, c)]
+
+    # --- HISTORY ---
+    def save_state(self):
+        """Opens a new undo entry; actions record the bits they change into it."""
+        entry = {"revealed": 0, "flagged": 0, "placed_mines": False}
+        self.history.append(entry)
+        return entry
+
+    def undo(self):
+        if not self.history: return False
+        entry = self.history.pop()
+        self.revealed &= ~entry["revealed"]
+        self.flagged ^= entry["flagged"]
+
+        if entry["placed_mines"]:
+            # Undoing the opening click also undoes the mine layout
+            self.mines = 0
+            self.zeros = 0
+            self.number = [0] * self.size
+            self.first_click = True
+        self._update_frontier(entry["revealed"] | entry["flagged"])
+
+        self.game_over = False
+        self.winner = None
+        return True
+
+    def _update_frontier(self, changed):
+        # Only the changed cells and their neighbours can enter or leave
+        # the frontier. `changed` is a bit mask.
+        self.change_log.extend(self._coords(changed))
+        self.version += 1
+        hidden = self._hidden()
+        touched = self._dilate(changed)
+        # Cells that cannot be on the frontier at all are dropped without
+        # looking at their neighbourhoods
+        numbered = touched & self.revealed & ~self.zeros & ~self.mines
+        for r, c in self._coords(touched & ~numbered):
+            self.frontier.discard((r, c))
+        masks = self.masks
+        for i in _bits(numbered):
+            key = divmod(i, self.cols)
+            if masks[i] & hidden:
+                self.frontier.add(key)
+            else:
+                self.frontier.discard(key)
+
+    # --- GAME ACTIONS ---
+    def place_mines(self, safe_r, safe_c):
+        safe = self.masks[safe_r * self.cols + safe_c] | 1 << (safe_r * self.cols + safe_c)
+        candidates = [i for i in range(self.size) if not safe >> i & 1]
+
+        for i in random.Random(self.seed).sample(candidates, self.total_mines):
+            self.mines |= 1 << i
+
+        self.zeros = 0
+        for i in range(self.size):
+            if self.mines >> i & 1:
+                self.number[i] = 0
+            else:
+                self.number[i] = (self.masks[i] & self.mines).bit_count()
+                if self.number[i] == 0:
+                    self.zeros |= 1 << i
+
+    def _flood_fill(self, start):
+        """
+        Expands from the zero cells in `start` until no zero cell is left
+        on the edge. Each step dilates the whole wavefront at once.
+        Returns the mask of newly revealed cells.
+        """
+        blocked = self.revealed | self.flagged
+        region = 0
+        wave = start
+        while wave:
+            grown = self._dilate(wave) & ~blocked & ~region
+            region |= grown
+            wave = grown & self.zeros
+        self.revealed |= region
+        return region
+
+    def reveal(self, r, c):
+        i = r * self.cols + c
+        bit = 1 << i
+        if (self.revealed | self.flagged) & bit: return 0
+
+        entry = self.save_state()
+
+        if self.first_click:
+            self.place_mines(r, c)
+            self.first_click = False
+            entry["placed_mines"] = True
+
+        self.revealed |= bit
+        changed = bit
+        if self.mines & bit:
+            self.game_over = True
+            entry["revealed"] = changed
+            self._update_frontier(changed)
+            return -999
+
+        if self.zeros & bit:
+            changed |= self._flood_fill(bit)
+        entry["revealed"] = changed
+        self._update_frontier(changed)
+        return changed.bit_count()
+
+    def chord(self, r, c):
+        i = r * self.cols + c
+        if not self.revealed >> i & 1 or self.number[i] == 0: return 0
+
+        mask = self.masks[i]
+        if (mask & self.flagged).bit_count() == self.number[i]:
+            entry = self.save_state()
+            opened = mask & self._hidden()
+            self.revealed |= opened
+            changed = opened | self._flood_fill(opened & self.zeros)
+            entry["revealed"] = changed
+            self._update_frontier(changed)
+            if opened & self.mines:
+                self.game_over = True
+                return -999
+            return changed.bit_count()
+        return 0
+
+    def toggle_flag(self, r, c):
+        bit = 1 << (r * self.cols + c)
+        if not self.revealed & bit:
+            entry = self.save_state()
+            self.flagged ^= bit
+            entry["flagged"] = bit
+            self._update_frontier(bit)
+            return True
+        return False
+
+    def apply_moves(self, moves):
+        """
+        Applies a batch of (r, c, action) moves as one undoable step;
+        see Board.apply_moves.
+        """
+        if not moves: return 0
+        entry = self.save_state()
+        revealed = 0
+        flagged = 0
+        mine_hit = False
+        for r, c, action in moves:
+            bit = 1 << (r * self.cols + c)
+            if action == 'flag':
+                if not self.revealed & bit:
+                    self.flagged ^= bit
+                    flagged ^= bit
+                continue
+            if (self.revealed | self.flagged) & bit:
+                continue
+            if self.first_click:
+                self.place_mines(r, c)
+                self.first_click = False
+                entry["placed_mines"] = True
+            self.revealed |= bit
+            revealed |= bit
+            if self.mines & bit:
+                mine_hit = True
+                break
+            if self.zeros & bit:
+                revealed |= self._flood_fill(bit)
+
+        entry["revealed"] = revealed
+        entry["flagged"] = flagged
+        self._update_frontier(revealed | flagged)
+        if mine_hit:
+            self.game_over = True
+            return -999
+        return revealed.bit_count()
+
+    def _record(self, key, changed):
+        # Folds end-of-game changes into the action that caused them
+        if self.history:
+            # "flagged" holds the cells to toggle back on undo, so a cell
+            # flipped twice within one entry must cancel out
+            if key == "flagged":
+                self.history[-1][key] ^= changed
+            else:
+                self.history[-1][key] |= changed
+        self._update_frontier(changed)
+
+    def reveal_mines(self):
+        """Reveals every mine once the game is lost."""
+        changed = self.mines & ~self.revealed
+        self.revealed |= changed
+        self._record("revealed", changed)
+
+    def flag_remaining(self):
+        """Flags every hidden cell once the board is cleared."""
+        changed = self._hidden()
+        self.flagged |= changed
+        self._record("flagged", changed)
+
+    # --- QUERIES ---
+    def neighbor_coords(self, r, c):
+        return self.topology.neighbor_coords(r, c)
+
+    def revealed_count(self):
+        return self.revealed.bit_count()
+
+    def flagged_count(self):
+        return self.flagged.bit_count()
+
+    def hidden_indices(self):
+        """Flat indices (r * cols + c) of the hidden, unflagged cells, in order."""
+        return list(_bits(self._hidden()))
+
+    def get_hidden_neighbors(self, cell):
+        mask = self.masks[cell.r * self.cols + cell.c] & self._hidden()
+        return [CellView(self, r, c) for r, c in self._coords(mask)]
+
+    def get_flagged_neighbors(self, cell):
+        mask = self.masks[cell.r * self.cols + cell.c] & self.flagged
+        return [CellView(self, r, c) for r, c in self._coords(mask)]
+
+    def get_revealed_numbered_nodes(self):
+        numbered = self.revealed & ~self.zeros & ~self.mines
+        return [CellView(self, r, c) for r, c in self._coords(numbered)]
+
+    def get_frontier_nodes(self):
+        """Revealed numbered cells with unresolved neighbours, in row-major order."""
+        return [CellView(self, r, c) for r, c in sorted(self.frontier)]
+
+    def get_frontier_cells(self):
+        """(r, c) of hidden, unflagged cells bordering the frontier."""
+        border = 0
+        for r, c in self.frontier:
+            border |= self.masks[r * self.cols + c]
+        return set(self._coords(border & self._hidden()))
@@ -1,136 +1,354 @@
 import random
-import copy
 from collections import deque
 from cell import Cell
+from topology import get_topology
 
 # --- 2. BOARD CLASS ---
 class Board:
-    def __init__(self, rows, cols, mines):
+    def __init__(self, rows, cols, mines, history_depth=10, seed=None, topology="square"):
         self.rows = rows
         self.cols = cols
         self.total_mines = mines
         self.grid = [[Cell(r, c) for c in range(cols)] for r in range(rows)]
+        # Row-major list of the same cells, indexed like the topology
+        self.cells = [cell for row in self.grid for cell in row]
+        # Shared CSR adjacency (see topology.py); built once per shape
+        self.topology = get_topology(topology, rows, cols)
         self.game_over = False
         self.winner = None
         self.first_click = True
-        self.history = [] 
-        self._build_adjacency()
+        # Mine layouts are a pure function of (seed, first click), so any
+        # game can be rebuilt and replayed from its seed
+        self.seed = random.getrandbits(64) if seed is None else seed
+        # Undo log of per-action deltas, oldest entries dropped first
+        self.history = deque(maxlen=history_depth)
+        # Live frontier index: (r, c) of revealed numbered cells that still
+        # touch at least one hidden, unflagged cell.
+        self.frontier = set()
+        # Append-only log of (r, c) whose state changed, so consumers such
+        # as the solver can catch up on just the cells touched since they
+        # last looked.
+        self.change_log = []
+        # Bumped on every state change, so results can be cached per version
+        self.version = 0
+        # Zero-region index, built by place_mines: every connected area of
+        # zero cells together with its numbered border, and the region id
+        # of each zero cell (indexed r * cols + c, -1 for non-zero cells).
+        self.regions = []
+        self.region_of = []
 
-    def _build_adjacency(self):
-        directions = [(-1, -1), (-1, 0), (-1, 1), (0, -1), 
-                      (0, 1), (1, -1), (1, 0), (1, 1)]
-        for r in range(self.rows):
-            for c in range(self.cols):
-                self.grid[r][c].neighbors = []
-                for dr, dc in directions:
-                    nr, nc = r + dr, c + dc
-                    if 0 <= nr < self.rows and 0 <= nc < self.cols:
-                        self.grid[r][c].neighbors.append(self.grid[nr][nc])
+    def _neighbors(self, cell):
+        # Nothing is stored per cell: each call reads the shared CSR arrays
+        i = cell.r * self.cols + cell.c
+        off, idx, flat = self.topology.offsets, self.topology.indices, self.cells
+        return [flat[j] for j in idx[off[i]:off[i + 1]]]
 
     def save_state(self):
-        if len(self.history) > 10: 
-            self.history.pop(0)
-        self.history.append(copy.deepcopy(self.grid))
+        """
+        Opens a new undo entry. Actions record only the cells they change
+        into it, so saving and undoing cost O(changed) instead of copying
+        the whole grid.
+        """
+        entry = {"revealed": [], "flagged": [], "placed_mines": False}
+        self.history.append(entry)
+        return entry
 
     def undo(self):
         if not self.history: return False
-        self.grid = self.history.pop()
+        entry = self.history.pop()
+        for cell in entry["revealed"]:
+            cell.is_revealed = False
+        for cell in entry["flagged"]:
+            cell.is_flagged = not cell.is_flagged
+
+        if entry["placed_mines"]:
+            # Undoing the opening click also undoes the mine layout, so the
+            # next click lays out a fresh board around itself.
+            for row in self.grid:
+                for cell in row:
+                    cell.is_mine = False
+                    cell.number = 0
+            self.regions = []
+            self.region_of = []
+            self.first_click = True
+        self._update_frontier(entry["revealed"] + entry["flagged"])
+
         self.game_over = False
         self.winner = None
-        self._build_adjacency()
         return True
 
+    def _update_frontier(self, changed):
+        # Only the changed cells and their neighbours can enter or leave
+        # the frontier, so the index is refreshed in O(changed) time.
+        # Works on flat indices straight from the CSR arrays.
+        self.change_log.extend((cell.r, cell.c) for cell in changed)
+        self.version += 1
+        off, idx, flat, cols = self.topology.offsets, self.topology.indices, self.cells, self.cols
+        touched = set()
+        for cell in changed:
+            i = cell.r * cols + cell.c
+            touched.add(i)
+            touched.update(idx[off[i]:off[i + 1]])
+        frontier = self.frontier
+        for i in touched:
+            cell = flat[i]
+            if cell.is_revealed and cell.number and any(
+                    not flat[j].is_revealed and not flat[j].is_flagged for j in idx[off[i]:off[i + 1]]):
+                frontier.add((cell.r, cell.c))
+            else:
+                frontier.discard((cell.r, cell.c))
+
     def place_mines(self, safe_r, safe_c):
-        safe_zone = [self.grid[safe_r][safe_c]] + self.grid[safe_r][safe_c].neighbors
-        candidates = []
-        for r in range(self.rows):
-            for c in range(self.cols):
-                if self.grid[r][c] not in safe_zone:
-                    candidates.append(self.grid[r][c])
-        
-        mines_placed = random.sample(candidates, self.total_mines)
+        safe_zone = self.topology.safe_zone(safe_r * self.cols + safe_c)
+        candidates = [cell for i, cell in enumerate(self.cells) if i not in safe_zone]
+
+        mines_placed = random.Random(self.seed).sample(candidates, self.total_mines)
         for cell in mines_placed:
             cell.is_mine = True
-        
-        for r in range(self.rows):
-            for c in range(self.cols):
-                if not self.grid[r][c].is_mine:
-                    self.grid[r][c].number = sum(1 for n in self.grid[r][c].neighbors if n.is_mine)
+
+        # Each mine adds one to its neighbours' counts
+        off, idx, cols = self.topology.offsets, self.topology.indices, self.cols
+        counts = [0] * len(self.cells)
+        for cell in mines_placed:
+            i = cell.r * cols + cell.c
+            for j in idx[off[i]:off[i + 1]]:
+                counts[j] += 1
+        for cell, count in zip(self.cells, counts):
+            if not cell.is_mine:
+                cell.number = count
+        self._build_regions()
+
+    def _build_regions(self):
+        # Union-find over zero cells: adjacent zeros join one region, and
+        # each region then collects the numbered cells bordering it. These
+        # are exactly the cells a flood fill from any of its zeros opens.
+        cols = self.cols
+        off, idx, cells = self.topology.offsets, self.topology.indices, self.cells
+        parent = list(range(self.rows * cols))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        zeros = [cell for cell in cells if cell.number == 0 and not cell.is_mine]
+        for cell in zeros:
+            i = cell.r * cols + cell.c
+            for j in idx[off[i]:off[i + 1]]:
+                n = cells[j]
+                if n.number == 0 and not n.is_mine:
+                    a, b = find(i), find(j)
+                    if a != b:
+                        parent[a] = b
+
+        self.regions = []
+        self.region_of = [-1] * (self.rows * cols)
+        ids = {}
+        for cell in zeros:
+            i = cell.r * cols + cell.c
+            root = find(i)
+            if root not in ids:
+                ids[root] = len(self.regions)
+                self.regions.append({})  # insertion-ordered set
+            self.region_of[i] = ids[root]
+            region = self.regions[ids[root]]
+            region[cell] = None
+            region.update(dict.fromkeys(cells[j] for j in idx[off[i]:off[i + 1]]))
+
+    def _region_is_clean(self, region):
+        # The one-step reveal matches a flood fill only while no flag cuts
+        # the region and no zero in it was left half-opened by one
+        for cell in region:
+            if cell.is_flagged or (cell.is_revealed and cell.number == 0):
+                return False
+        return True
+
+    def _open(self, cells, changed):
+        """
+        Reveals the given hidden cells and flood-fills from the zero ones,
+        appending every newly revealed cell to `changed`. Zero cells whose
+        precomputed region is intact open the whole region in one step;
+        otherwise the fill falls back to a walk that stops at flags.
+        """
+        cols = self.cols
+        queue = deque()
+        for cell in cells:
+            if cell.is_revealed or cell.is_flagged:
+                continue
+            if cell.number == 0 and not cell.is_mine:
+                i = cell.r * cols + cell.c
+                region = self.regions[self.region_of[i]]
+                if self._region_is_clean(region):
+                    for n in region:
+                        if not n.is_revealed:
+                            n.is_revealed = True
+                            changed.append(n)
+                    continue
+                queue.append(i)
+            cell.is_revealed = True
+            changed.append(cell)
+
+        # The walk queues flat indices and reads the CSR arrays directly
+        off, idx, flat = self.topology.offsets, self.topology.indices, self.cells
+        while queue:
+            i = queue.popleft()
+            for j in idx[off[i]:off[i + 1]]:
+                n = flat[j]
+                if not n.is_revealed and not n.is_flagged:
+                    n.is_revealed = True
+                    changed.append(n)
+                    if n.number == 0:
+                        queue.append(j)
 
     def reveal(self, r, c):
         cell = self.grid[r][c]
         if cell.is_revealed or cell.is_flagged: return 0
 
-        self.save_state()
+        entry = self.save_state()
 
         if self.first_click:
             self.place_mines(r, c)
             self.first_click = False
+            entry["placed_mines"] = True
 
-        cell.is_revealed = True
         if cell.is_mine:
+            cell.is_revealed = True
             self.game_over = True
+            entry["revealed"].append(cell)
+            self._update_frontier([cell])
             return -999
 
-        revealed_count = 1
-        if cell.number == 0:
-            queue = deque([cell])
-            while queue:
-                curr = queue.popleft()
-                for n in curr.neighbors:
-                    if not n.is_revealed and not n.is_flagged:
-                        n.is_revealed = True
-                        revealed_count += 1
-                        if n.number == 0:
-                            queue.append(n)
-        return revealed_count
+        changed = []
+        self._open([cell], changed)
+        entry["revealed"] = changed
+        self._update_frontier(changed)
+        return len(changed)
 
     def chord(self, r, c):
         cell = self.grid[r][c]
         if not cell.is_revealed or cell.number == 0: return 0
         
-        flag_count = sum(1 for n in cell.neighbors if n.is_flagged)
+        flag_count = sum(1 for n in self._neighbors(cell) if n.is_flagged)
         if flag_count == cell.number:
-            self.save_state()
-            points = 0
-            mine_hit = False
-            for n in cell.neighbors:
-                if not n.is_revealed and not n.is_flagged:
-                    n.is_revealed = True
-                    if n.is_mine:
-                        mine_hit = True
-                    else:
-                        points += 1
-                        if n.number == 0:
-                            q = deque([n])
-                            while q:
-                                curr = q.popleft()
-                                for neighbor in curr.neighbors:
-                                    if not neighbor.is_revealed and not neighbor.is_flagged:
-                                        neighbor.is_revealed = True
-                                        points += 1
-                                        if neighbor.number == 0:
-                                            q.append(neighbor)
-
-            if mine_hit: 
+            entry = self.save_state()
+            opened = self.get_hidden_neighbors(cell)
+            changed = []
+            self._open(opened, changed)
+
+            entry["revealed"] = changed
+            self._update_frontier(changed)
+            if any(n.is_mine for n in opened):
                 self.game_over = True
                 return -999
-            return points
+            return len(changed)
         return 0
 
     def toggle_flag(self, r, c):
         cell = self.grid[r][c]
         if not cell.is_revealed:
-            self.save_state()
+            entry = self.save_state()
             cell.is_flagged = not cell.is_flagged
+            entry["flagged"].append(cell)
+            self._update_frontier([cell])
             return True
         return False
 
+    def apply_moves(self, moves):
+        """
+        Applies a batch of (r, c, action) moves, action 'reveal' or 'flag',
+        as one undoable step. Reveals flood-fill as usual; the batch stops
+        at the first mine.
+
+        Returns:
+        - total cells revealed, or -999 if a mine was hit
+        """
+        if not moves: return 0
+        entry = self.save_state()
+        revealed = []
+        flagged = []
+        mine_hit = False
+        for r, c, action in moves:
+            cell = self.grid[r][c]
+            if action == 'flag':
+                if not cell.is_revealed:
+                    cell.is_flagged = not cell.is_flagged
+                    flagged.append(cell)
+                continue
+            if cell.is_revealed or cell.is_flagged:
+                continue
+            if self.first_click:
+                self.place_mines(r, c)
+                self.first_click = False
+                entry["placed_mines"] = True
+            if cell.is_mine:
+                cell.is_revealed = True
+                revealed.append(cell)
+                mine_hit = True
+                break
+            self._open([cell], revealed)
+
+        entry["revealed"] = revealed
+        entry["flagged"] = flagged
+        self._update_frontier(revealed + flagged)
+        if mine_hit:
+            self.game_over = True
+            return -999
+        return len(revealed)
+
+    def _record(self, key, cells):
+        # Folds end-of-game changes into the action that caused them, so a
+        # single undo rolls both back together.
+        if self.history:
+            self.history[-1][key].extend(cells)
+        self._update_frontier(cells)
+
+    def reveal_mines(self):
+        """Reveals every mine once the game is lost."""
+        changed = []
+        for row in self.grid:
+            for cell in row:
+                if cell.is_mine and not cell.is_revealed:
+                    cell.is_revealed = True
+                    changed.append(cell)
+        self._record("revealed", changed)
+
+    def flag_remaining(self):
+        """Flags every hidden cell once the board is cleared."""
+        changed = []
+        for row in self.grid:
+            for cell in row:
+                if not cell.is_revealed and not cell.is_flagged:
+                    cell.is_flagged = True
+                    changed.append(cell)
+        self._record("flagged", changed)
+
+    def neighbors_of(self, r, c):
+        return self._neighbors(self.grid[r][c])
+
+    def neighbor_coords(self, r, c):
+        return self.topology.neighbor_coords(r, c)
+
+    def revealed_count(self):
+        return sum(cell.is_revealed for row in self.grid for cell in row)
+
+    def flagged_count(self):
+        return sum(cell.is_flagged for cell in self.cells)
+
+    def hidden_indices(self):
+        """Flat indices (r * cols + c) of the hidden, unflagged cells, in order."""
+        return [i for i, cell in enumerate(self.cells) if not cell.is_revealed and not cell.is_flagged]
+
     def get_hidden_neighbors(self, cell):
-        return [n for n in cell.neighbors if not n.is_revealed and not n.is_flagged]
+        i = cell.r * self.cols + cell.c
+        off, idx, flat = self.topology.offsets, self.topology.indices, self.cells
+        return [n for n in map(flat.__getitem__, idx[off[i]:off[i + 1]])
+                if not n.is_revealed and not n.is_flagged]
 
     def get_flagged_neighbors(self, cell):
-        return [n for n in cell.neighbors if n.is_flagged]
+        i = cell.r * self.cols + cell.c
+        off, idx, flat = self.topology.offsets, self.topology.indices, self.cells
+        return [n for n in map(flat.__getitem__, idx[off[i]:off[i + 1]]) if n.is_flagged]
 
     def get_revealed_numbered_nodes(self):
         nodes = []
@@ -140,3 +358,19 @@ class Board:
                 if cell.is_revealed and cell.number > 0:
                     nodes.append(cell)
         return nodes
+
+    def get_frontier_nodes(self):
+        """Revealed numbered cells with unresolved neighbours, in row-major order."""
+        return [self.grid[r][c] for r, c in sorted(self.frontier)]
+
+    def get_frontier_cells(self):
+        """(r, c) of hidden, unflagged cells bordering the frontier."""
+        off, idx, flat, cols = self.topology.offsets, self.topology.indices, self.cells, self.cols
+        cells = set()
+        for r, c in self.frontier:
+            i = r * cols + c
+            for j in idx[off[i]:off[i + 1]]:
+                n = flat[j]
+                if not n.is_revealed and not n.is_flagged:
+                    cells.add((n.r, n.c))
+        return cells
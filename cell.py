@@ -6,16 +6,87 @@ class Cell:
         self.is_revealed = False
         self.is_flagged = False
         self.number = 0
-        self.neighbors = [] 
+        # Neighbours are not stored per cell: they come from the board's
+        # shared topology (board.neighbors_of, board.topology)
 
-    def __getstate__(self):
-        state = self.__dict__.copy()
-        del state['neighbors']
-        return state
+    def __repr__(self):
+        return f"Cell({self.r}, {self.c})"
+
+
+# --- LIGHTWEIGHT CELL VIEW ---
+# Array-backed boards keep their state in flat arrays instead of Cell
+# objects. A CellView exposes the same attributes as Cell by reading and
+# writing through to the owning board, so callers that still work with
+# `board.grid[r][c]` keep working unchanged.
+def _state_property(name):
+    def fget(self):
+        return self.board.get_cell_attr(self.r, self.c, name)
+
+    def fset(self, value):
+        self.board.set_cell_attr(self.r, self.c, name, value)
+
+    return property(fget, fset)
+
+
+class CellView:
+    __slots__ = ("board", "r", "c")
+
+    def __init__(self, board, r, c):
+        self.board = board
+        self.r = r
+        self.c = c
+
+    is_mine = _state_property("is_mine")
+    is_revealed = _state_property("is_revealed")
+    is_flagged = _state_property("is_flagged")
+    number = _state_property("number")
+
+    def __eq__(self, other):
+        if not isinstance(other, CellView):
+            return NotImplemented
+        return self.board is other.board and self.r == other.r and self.c == other.c
 
-    def __setstate__(self, state):
-        self.__dict__.update(state)
-        self.neighbors = []
+    def __hash__(self):
+        return hash((id(self.board), self.r, self.c))
 
     def __repr__(self):
         return f"Cell({self.r}, {self.c})"
+
+
+class GridView:
+    """Indexable like `grid[r][c]`, handing out CellViews on demand."""
+
+    def __init__(self, board):
+        self.board = board
+
+    def __len__(self):
+        return self.board.rows
+
+    def __getitem__(self, r):
+        if not 0 <= r < self.board.rows:
+            raise IndexError(r)
+        return _RowView(self.board, r)
+
+    def __iter__(self):
+        for r in range(self.board.rows):
+            yield _RowView(self.board, r)
+
+
+class _RowView:
+    __slots__ = ("board", "r")
+
+    def __init__(self, board, r):
+        self.board = board
+        self.r = r
+
+    def __len__(self):
+        return self.board.cols
+
+    def __getitem__(self, c):
+        if not 0 <= c < self.board.cols:
+            raise IndexError(c)
+        return CellView(self.board, self.r, c)
+
+    def __iter__(self):
+        for c in range(self.board.cols):
+            yield CellView(self.board, self.r, c)
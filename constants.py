@@ -2,6 +2,27 @@
 CELL_SIZE = 35
 MARGIN = 50
 SIDEBAR_WIDTH = 350
+UNDO_HISTORY_DEPTH = 10 # Number of actions that can be undone
+BOARD_BACKEND = "list" # "list", "numpy" or "bitboard" (see backends.py)
+
+# Grid sizes offered in the settings. Boards above LARGE_BOARD_SIZE use
+# LARGE_BOARD_BACKEND, and any grid wider than VIEWPORT_SIZE pixels is
+# shown through a pannable, zoomable viewport of that size.
+GRID_SIZES = [8, 12, 16, 20, 50, 100, 1000]
+LARGE_BOARD_SIZE = 64
+LARGE_BOARD_BACKEND = "numpy"
+VIEWPORT_SIZE = 700 # max pixels of grid on screen
+MIN_CELL_SIZE = 12 # zoom limits (cell size in pixels)
+MAX_CELL_SIZE = 50
+NO_GUESS_MAX_SIZE = 30 # generating no-guess boards gets too slow past this
+
+# AI turn pacing (milliseconds) and the time the AI gets to pick a move
+AI_TURN_DELAY_MS = 750 # pause before the AI starts its turn
+AI_HIGHLIGHT_MS = 300 # how long the thinking/choosing highlights stay up
+AI_MOVE_TIME_LIMIT = 1.0 # seconds; past this the AI plays its best move so far
+
+# Mine density per difficulty (fraction of the grid)
+DIFFICULTY_RATIOS = {"Easy": 0.12, "Medium": 0.17, "Hard": 0.22}
 
 # Modern Dark Theme
 C_BG = (18, 18, 24)
@@ -0,0 +1,239 @@
+"""
+SQLite store for game results and move history.
+
+Every saved session becomes one row in `games` (setting, outcome, final
+scores) and one row per move in `moves` (actor, action, coordinates,
+result, reason). A batch of sessions is inserted in a single
+transaction, and the columns that queries filter and group on (grid
+size, difficulty, outcome, actor) are indexed, so win-rate and score
+queries over hundreds of thousands of games stay interactive:
+
+    python game_db.py                       # win rates per setting
+    python game_db.py --mode vs_cpu --scores
+    python game_db.py --actors              # moves per actor and action
+
+The database is games.db in the log directory. The game fills it from
+the log writer's thread whenever a session is saved, and
+`python simulate.py --db games.db` adds simulated games.
+"""
+
+import argparse
+import base64
+import os
+import re
+import sqlite3
+import sys
+from collections import Counter
+
+DB_FILENAME = "games.db"
+
+# Outcomes are from the player's side: the human in the GUI (solo or
+# against the CPU), the AI in simulations
+OUTCOMES = {"Human": "won", "AI": "lost", "Draw": "draw", None: "unfinished"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id          INTEGER PRIMARY KEY,
+    timestamp   TEXT NOT NULL,
+    mode        TEXT NOT NULL,          -- 'solo', 'vs_cpu' or 'simulation'
+    grid_size   INTEGER NOT NULL,
+    difficulty  TEXT NOT NULL,
+    mines       INTEGER NOT NULL,
+    outcome     TEXT NOT NULL,          -- 'won', 'lost', 'draw' or 'unfinished'
+    human_score INTEGER,
+    ai_score    INTEGER,
+    move_count  INTEGER NOT NULL,
+    seed        TEXT,                   -- 64-bit seeds overflow SQLite integers
+    replay      BLOB
+);
+CREATE TABLE IF NOT EXISTS moves (
+    game_id INTEGER NOT NULL REFERENCES games(id) ON DELETE CASCADE,
+    seq     INTEGER NOT NULL,
+    time    TEXT,
+    actor   TEXT NOT NULL,
+    action  TEXT NOT NULL,
+    row     INTEGER,
+    col     INTEGER,
+    result  TEXT,
+    reason  TEXT,
+    PRIMARY KEY (game_id, seq)
+) WITHOUT ROWID;
+-- Running move counts, kept with the inserts: totals over millions of
+-- moves are read here rather than counted from the moves table
+CREATE TABLE IF NOT EXISTS move_totals (
+    actor  TEXT NOT NULL,
+    action TEXT NOT NULL,
+    moves  INTEGER NOT NULL,
+    PRIMARY KEY (actor, action)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS games_setting ON games(grid_size, difficulty, outcome);
+CREATE INDEX IF NOT EXISTS games_outcome ON games(outcome);
+CREATE INDEX IF NOT EXISTS games_mode ON games(mode, grid_size, difficulty, outcome, human_score, ai_score);
+CREATE INDEX IF NOT EXISTS moves_actor ON moves(actor, action);
+"""
+
+_INSERT_GAME = """INSERT INTO games (timestamp, mode, grid_size, difficulty, mines, outcome,
+                                     human_score, ai_score, move_count, seed, replay)
+                  VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+_INSERT_MOVE = """INSERT INTO moves (game_id, seq, time, actor, action, row, col, result, reason)
+                  VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+_ADD_TOTAL = """INSERT INTO move_totals (actor, action, moves) VALUES (?, ?, ?)
+                ON CONFLICT (actor, action) DO UPDATE SET moves = moves + excluded.moves"""
+
+_COORD = re.compile(r"\((-?\d+),\s*(-?\d+)\)")
+
+
+def _coords(coord):
+    # "(r,c)" from the session log; System entries use (-1,-1)
+    match = _COORD.match(coord or "")
+    if not match or match.group(1).startswith("-"):
+        return None, None
+    return int(match.group(1)), int(match.group(2))
+
+
+class GameDatabase:
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        # WAL lets queries read while the game is writing
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    # --- WRITES (one transaction per call) ---
+    def add_sessions(self, sessions):
+        """
+        Stores saved game sessions, in the record format the game log
+        uses (timestamp, grid_size, difficulty, mines, vs_cpu, winner,
+        scores, moves, seed, replay as base64).
+        """
+        totals = Counter()
+        with self.conn:
+            for s in sessions:
+                scores = s.get("scores") or {}
+                moves = s.get("moves") or []
+                game_id = self.conn.execute(_INSERT_GAME, (
+                    s.get("timestamp", ""),
+                    "vs_cpu" if s.get("vs_cpu") else "solo",
+                    s["grid_size"], s.get("difficulty", ""), s.get("mines", 0),
+                    OUTCOMES.get(s.get("winner"), "unfinished"),
+                    scores.get("Human"), scores.get("AI"), len(moves),
+                    None if s.get("seed") is None else str(s["seed"]),
+                    base64.b64decode(s["replay"]) if s.get("replay") else None,
+                )).lastrowid
+                self.conn.executemany(_INSERT_MOVE, (
+                    (game_id, seq, m.get("Time"), m["Actor"], m["Action"], *_coords(m.get("Coord")),
+                     str(m.get("Result")), m.get("Reason"))
+                    for seq, m in enumerate(moves)))
+                totals.update((m["Actor"], m["Action"]) for m in moves)
+            self.conn.executemany(_ADD_TOTAL, ((a, act, n) for (a, act), n in totals.items()))
+
+    def add_results(self, results, size, difficulty, mines, seeds, timestamp):
+        """
+        Stores simulated games: `results` are simulate.play_game dicts
+        (replay bytes included when recorded), `seeds` their seeds.
+        """
+        with self.conn:
+            self.conn.executemany(_INSERT_GAME, (
+                (timestamp, "simulation", size, difficulty, mines,
+                 "won" if res["won"] else "lost", None, None, res["moves"],
+                 str(seed), res.get("replay"))
+                for res, seed in zip(results, seeds)))
+
+    def clear(self):
+        with self.conn:
+            self.conn.execute("DELETE FROM moves")
+            self.conn.execute("DELETE FROM move_totals")
+            self.conn.execute("DELETE FROM games")
+
+    # --- QUERIES ---
+    def _where(self, **filters):
+        terms = [(f"{column} = ?", value) for column, value in filters.items() if value is not None]
+        if not terms:
+            return "", ()
+        return " WHERE " + " AND ".join(t for t, _ in terms), tuple(v for _, v in terms)
+
+    def win_rates(self, mode=None, grid_size=None, difficulty=None):
+        """
+        Per-setting results of finished games.
+
+        Returns:
+        - list of dicts with 'grid_size', 'difficulty', 'games', 'wins'
+          and 'win_rate', ordered by size then difficulty
+        """
+        where, params = self._where(mode=mode, grid_size=grid_size, difficulty=difficulty)
+        where += (" AND " if where else " WHERE ") + "outcome != 'unfinished'"
+        rows = self.conn.execute(
+            "SELECT grid_size, difficulty, COUNT(*), SUM(outcome = 'won') FROM games"
+            + where + " GROUP BY grid_size, difficulty ORDER BY grid_size, difficulty", params)
+        return [{"grid_size": size, "difficulty": diff, "games": games, "wins": wins,
+                 "win_rate": wins / games} for size, diff, games, wins in rows]
+
+    def score_summary(self, mode="vs_cpu", grid_size=None, difficulty=None):
+        """
+        Final scores of finished games per setting.
+
+        Returns:
+        - list of dicts with 'grid_size', 'difficulty', 'games',
+          'human_avg', 'ai_avg', 'human_best' and 'ai_best'
+        """
+        where, params = self._where(mode=mode, grid_size=grid_size, difficulty=difficulty)
+        where += (" AND " if where else " WHERE ") + "outcome != 'unfinished'"
+        rows = self.conn.execute(
+            "SELECT grid_size, difficulty, COUNT(*), AVG(human_score), AVG(ai_score),"
+            " MAX(human_score), MAX(ai_score) FROM games"
+            + where + " GROUP BY grid_size, difficulty ORDER BY grid_size, difficulty", params)
+        return [{"grid_size": r[0], "difficulty": r[1], "games": r[2], "human_avg": r[3],
+                 "ai_avg": r[4], "human_best": r[5], "ai_best": r[6]} for r in rows]
+
+    def move_counts(self, actor=None):
+        """Number of moves per (actor, action), most frequent first."""
+        where, params = self._where(actor=actor)
+        rows = self.conn.execute(
+            "SELECT actor, action, moves FROM move_totals" + where + " ORDER BY moves DESC", params)
+        return [{"actor": a, "action": act, "moves": n} for a, act, n in rows]
+
+
+def main(argv=None):
+    from game_log import default_log_dir
+
+    default_path = os.path.join(default_log_dir(), DB_FILENAME)
+    parser = argparse.ArgumentParser(description="Query the game results database.")
+    parser.add_argument("--db", default=default_path, help="database file (default: %s)" % default_path)
+    parser.add_argument("--mode", choices=["solo", "vs_cpu", "simulation"], default=None)
+    parser.add_argument("--size", type=int, default=None)
+    parser.add_argument("--difficulty", default=None)
+    parser.add_argument("--scores", action="store_true", help="show final scores instead of win rates")
+    parser.add_argument("--actors", action="store_true", help="show move counts per actor and action")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        print(f"No database at {args.db}")
+        return 1
+    db = GameDatabase(args.db)
+    if args.actors:
+        print(f"{'ACTOR':<10} {'ACTION':<12} {'MOVES':>10}")
+        for row in db.move_counts():
+            print(f"{row['actor']:<10} {row['action']:<12} {row['moves']:>10}")
+    elif args.scores:
+        print(f"{'SIZE':>5} {'DIFFICULTY':<10} {'GAMES':>8} {'HUMAN AVG':>10} {'AI AVG':>8} {'BEST':>6}")
+        for row in db.score_summary(mode=args.mode or "vs_cpu", grid_size=args.size,
+                                    difficulty=args.difficulty):
+            print(f"{row['grid_size']:>5} {row['difficulty']:<10} {row['games']:>8} "
+                  f"{row['human_avg'] or 0:>10.1f} {row['ai_avg'] or 0:>8.1f} {row['human_best'] or 0:>6}")
+    else:
+        print(f"{'SIZE':>5} {'DIFFICULTY':<10} {'GAMES':>8} {'WINS':>8} {'WIN RATE':>9}")
+        for row in db.win_rates(mode=args.mode, grid_size=args.size, difficulty=args.difficulty):
+            print(f"{row['grid_size']:>5} {row['difficulty']:<10} {row['games']:>8} "
+                  f"{row['wins']:>8} {row['win_rate']:>9.1%}")
+    db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+from game_db import DB_FILENAME, GameDatabase
+
+# --- GAME LOG WRITER ---
+# Appends one JSON line per saved game session to game_log.jsonl. Writes
+# happen on a background thread that batches records and flushes them
+# together, so saving never blocks the UI. When the file grows past
+# max_bytes it is rotated to game_log.jsonl.1, .2, ... (oldest dropped).
+# The same batch is also inserted into the games.db SQLite store
+# (game_db.py) in one transaction, for querying results across games.
+#
+# The directory defaults to ~/.minesweeper/logs and can be overridden
+# with the MINESWEEPER_LOG_DIR environment variable.
+
+LOG_FILENAME = "game_log.jsonl"
+
+
+def default_log_dir():
+    return os.environ.get("MINESWEEPER_LOG_DIR") or os.path.join(os.path.expanduser("~"), ".minesweeper", "logs")
+
+
+def log_files(log_dir, backups):
+    """Current log file followed by its rotations, newest first."""
+    path = os.path.join(log_dir, LOG_FILENAME)
+    return [path] + [f"{path}.{i}" for i in range(1, backups + 1)]
+
+
+class GameLogWriter:
+    def __init__(self, log_dir=None, max_bytes=5 * 1024 * 1024, backups=5,
+                 flush_interval=1.0, batch_size=256, use_db=True):
+        self.log_dir = log_dir or default_log_dir()
+        self.path = os.path.join(self.log_dir, LOG_FILENAME)
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.db_path = os.path.join(self.log_dir, DB_FILENAME) if use_db else None
+        self._db = None  # opened on the writer thread, which owns the connection
+
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="game-log-writer", daemon=True)
+        self._thread.start()
+
+    # --- PUBLIC API (called from the UI thread; never blocks on disk) ---
+    def write(self, record):
+        """Queues one record (a JSON-serialisable dict) for appending."""
+        self._queue.put(("record", record))
+
+    def clear(self):
+        """Queues removal of the log file, its rotations and the stored games."""
+        self._queue.put(("clear", None))
+
+    def flush(self):
+        """Blocks until everything queued so far is on disk."""
+        self._queue.join()
+
+    def close(self):
+        """Flushes pending records and stops the writer thread."""
+        if self._thread.is_alive():
+            self._queue.put(("stop", None))
+            self._thread.join()
+
+    # --- WRITER THREAD ---
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            # Gather whatever else arrives within the flush interval, so
+            # bursts of saves become one write
+            deadline = time.monotonic() + self.flush_interval
+            while batch[-1][0] == "record" and len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+
+            stop = False
+            pending = []
+            records = []
+            for kind, payload in batch:
+                if kind == "record":
+                    pending.append(json.dumps(payload, separators=(",", ":")) + "\n")
+                    records.append(payload)
+                else:
+                    self._append(pending)
+                    self._store(records)
+                    pending = []
+                    records = []
+                    if kind == "clear":
+                        self._clear()
+                    elif kind == "stop":
+                        stop = True
+            self._append(pending)
+            self._store(records)
+
+            for _ in batch:
+                self._queue.task_done()
+            if stop:
+                if self._db:
+                    self._db.close()
+                return
+
+    def _append(self, lines):
+        if not lines:
+            return
+        data = "".join(lines).encode("utf-8")
+        try:
+            os.makedirs(self.log_dir, exist_ok=True)
+            if os.path.exists(self.path) and os.path.getsize(self.path) + len(data) > self.max_bytes:
+                self._rotate()
+            with open(self.path, "ab") as f:
+                f.write(data)
+        except OSError as e:
+            print(f"Error saving log: {e}")
+
+    def _store(self, records):
+        if not records or not self.db_path:
+            return
+        try:
+            if self._db is None:
+                self._db = GameDatabase(self.db_path)
+            self._db.add_sessions(records)
+        except (sqlite3.Error, OSError) as e:
+            print(f"Error storing games: {e}")
+
+    def _rotate(self):
+        files = log_files(self.log_dir, self.backups)
+        if os.path.exists(files[-1]):
+            os.remove(files[-1])
+        for src, dst in zip(reversed(files[:-1]), reversed(files[1:])):
+            if os.path.exists(src):
+                os.replace(src, dst)
+
+    def _clear(self):
+        try:
+            for path in log_files(self.log_dir, self.backups):
+                if os.path.exists(path):
+                    os.remove(path)
+            if self._db is None and self.db_path and os.path.exists(self.db_path):
+                self._db = GameDatabase(self.db_path)
+            if self._db:
+                self._db.clear()
+        except (sqlite3.Error, OSError) as e:
+            print(f"Error clearing logs: {e}")
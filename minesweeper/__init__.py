@@ -0,0 +1,58 @@
+"""
+Headless Minesweeper core: boards, the AI solver, replays and the
+simulators, importable without pygame.
+
+    import minesweeper
+
+    board = minesweeper.make_board("bitboard", 16, 16, 40, seed=7)
+    board.reveal(8, 8)
+    r, c, action = minesweeper.AI_Solver().get_move(board)
+
+The modules themselves stay at the top level of the repository, where
+the game imports them; this package gathers their public API under one
+name and provides the command line (python -m minesweeper). Names that
+need numpy or pull in multiprocessing are imported on first use.
+"""
+
+import importlib
+
+from ai_solver import AI_Solver
+from backends import BACKENDS, make_board
+from bitboard import BitBoard
+from board import Board
+from cell import Cell
+from constants import DIFFICULTY_RATIOS
+from probability import mine_probabilities
+from replay import ReplayError, ReplayRecorder, iter_replays, replay_game, verify
+from sampling import sample_probabilities
+from topology import TOPOLOGIES, get_topology
+
+# name -> (module, attribute), imported by __getattr__ on first access
+_LAZY = {
+    "NumpyBoard": ("numpy_board", "NumpyBoard"),
+    "play_game": ("simulate", "play_game"),
+    "run_simulation": ("simulate", "run_simulation"),
+    "run_batch": ("batch_sim", "run_batch"),
+    "generate": ("no_guess", "generate"),
+    "is_solvable": ("no_guess", "is_solvable"),
+    "BoardPool": ("no_guess", "BoardPool"),
+    "GameLogWriter": ("game_log", "GameLogWriter"),
+    "GameDatabase": ("game_db", "GameDatabase"),
+    "iter_sessions": ("read_logs", "iter_sessions"),
+}
+
+__all__ = [
+    "AI_Solver", "BACKENDS", "make_board", "BitBoard", "Board", "Cell",
+    "DIFFICULTY_RATIOS", "mine_probabilities", "sample_probabilities",
+    "ReplayError", "ReplayRecorder", "iter_replays", "replay_game", "verify",
+    "TOPOLOGIES", "get_topology", *_LAZY,
+]
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attr = _LAZY[name]
+    value = getattr(importlib.import_module(module_name), attr)
+    globals()[name] = value
+    return value
@@ -0,0 +1,51 @@
+"""
+Command line entry point:
+
+    python -m minesweeper play                      # the game (needs pygame)
+    python -m minesweeper simulate --games 5000     # simulate.py
+    python -m minesweeper replay games.msr          # replay.py
+    python -m minesweeper logs --limit 5            # read_logs.py
+    python -m minesweeper stats --scores            # game_db.py
+    python -m minesweeper bench --save-baseline     # benchmarks.py
+
+Everything after the command goes to that tool, so
+`python -m minesweeper simulate --help` lists its options. Only the
+chosen tool is imported; the headless commands never load pygame.
+"""
+
+import importlib
+import sys
+
+# command -> (module with a main(argv) function, description)
+COMMANDS = {
+    "play": ("Main", "start the game"),
+    "simulate": ("simulate", "play headless AI games and report solver statistics"),
+    "replay": ("replay", "verify recorded replays"),
+    "logs": ("read_logs", "print saved game sessions, newest first"),
+    "stats": ("game_db", "win rates and scores from the game database"),
+    "bench": ("benchmarks", "benchmark the board and solver hot paths"),
+}
+
+
+def usage():
+    lines = ["usage: python -m minesweeper <command> [options]", "", "commands:"]
+    lines += [f"  {name:<10}{desc}" for name, (_, desc) in COMMANDS.items()]
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ("-h", "--help"):
+        print(usage())
+        return 0
+    command, rest = argv[0], argv[1:]
+    if command not in COMMANDS:
+        print(f"unknown command: {command}\n\n{usage()}", file=sys.stderr)
+        return 2
+    # Tools name themselves after sys.argv[0] in their --help output
+    sys.argv[0] = f"python -m minesweeper {command}"
+    return importlib.import_module(COMMANDS[command][0]).main(rest)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
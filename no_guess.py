@@ -0,0 +1,130 @@
+import multiprocessing
+import os
+import random
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from ai_solver import AI_Solver
+from backends import make_board
+
+# --- NO-GUESS BOARD GENERATION ---
+# A board is "no-guess" when the solver can clear it from the opening
+# click using deductions only (the local rules plus what the global mine
+# count proves). Boards are seeded, so a generated board is just
+# (seed, first click): the game rebuilds it with make_board(seed=...)
+# and starts with that opening already revealed.
+#
+# Generation is trial and error (random layouts until one passes), so
+# BoardPool runs it in background processes and keeps a few ready
+# boards per setting. Taking a board never waits for generation.
+
+
+def is_solvable(size, mines, seed, first_click, backend="bitboard"):
+    """Whether deductions alone clear the board from `first_click`."""
+    board = make_board(backend, size, size, mines, seed=seed)
+    ai = AI_Solver(sample_time=0)
+    safe_cells = size * size - mines
+    revealed = board.reveal(*first_click)
+    while revealed < safe_cells:
+        # Hints never guess: None means the solver is stuck
+        move = ai.get_move(board, is_hint=True)
+        if move is None:
+            return False
+        r, c, action = move
+        if action == 'reveal':
+            res = board.reveal(r, c)
+            if res == -999:
+                return False  # inconsistent deduction; never expected
+            revealed += res
+        else:
+            board.toggle_flag(r, c)
+    return True
+
+
+def generate(size, mines, rng=None, max_attempts=5000):
+    """
+    Draws random seeded layouts until one is solvable without guessing.
+
+    Returns:
+    - (seed, (row, col) of the opening click), or None after max_attempts
+    """
+    rng = rng or random.Random()
+    for _ in range(max_attempts):
+        seed = rng.getrandbits(64)
+        first_click = (rng.randrange(size), rng.randrange(size))
+        if is_solvable(size, mines, seed, first_click):
+            return seed, first_click
+    return None
+
+
+def _generate_job(size, mines):
+    # Worker entry point; each process draws from its own entropy
+    return generate(size, mines, random.Random(int.from_bytes(os.urandom(8), "little")))
+
+
+class BoardPool:
+    def __init__(self, capacity=3, workers=None):
+        self.capacity = capacity
+        self.workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        self._executor = None
+        self._ready = {}    # (size, mines) -> deque of (seed, first click)
+        self._pending = {}  # (size, mines) -> jobs in flight
+        self._lock = threading.Lock()
+
+    def _pool(self):
+        if self._executor is None:
+            # Fresh interpreters, so workers never inherit the game's
+            # window or threads
+            ctx = multiprocessing.get_context("spawn")
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=ctx)
+        return self._executor
+
+    def prefetch(self, size, mines):
+        """Tops the queue for (size, mines) up to capacity in the background."""
+        key = (size, mines)
+        with self._lock:
+            ready = self._ready.setdefault(key, deque())
+            missing = self.capacity - len(ready) - self._pending.get(key, 0)
+            self._pending[key] = self._pending.get(key, 0) + max(0, missing)
+        for i in range(missing):
+            try:
+                future = self._pool().submit(_generate_job, size, mines)
+            except (BrokenProcessPool, RuntimeError) as e:
+                # Games fall back to random boards; a fresh pool is
+                # started on the next request
+                print(f"Board pool error: {e}")
+                self.close()
+                with self._lock:
+                    self._pending[key] -= missing - i
+                return
+            future.add_done_callback(lambda f, key=key: self._done(key, f))
+
+    def _done(self, key, future):
+        with self._lock:
+            self._pending[key] -= 1
+            if future.cancelled() or future.exception() is not None:
+                return
+            if future.result() is not None:
+                self._ready[key].append(future.result())
+
+    def ready_count(self, size, mines):
+        with self._lock:
+            return len(self._ready.get((size, mines), ()))
+
+    def take(self, size, mines):
+        """
+        Returns a ready (seed, first click) for the setting, or None if
+        none is ready yet. Never blocks; the queue refills behind it.
+        """
+        with self._lock:
+            ready = self._ready.get((size, mines))
+            board = ready.popleft() if ready else None
+        self.prefetch(size, mines)
+        return board
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,301 @@
+import random
+from collections import deque
+
+import numpy as np
+
+from cell import CellView, GridView
+from topology import get_topology
+
+# --- NUMPY BOARD (STRUCT-OF-ARRAYS BACKEND) ---
+# Same public interface as board.Board, but the per-cell state lives in
+# four (rows, cols) NumPy arrays instead of one Cell object per square.
+# Setup and whole-board scans become vectorized array operations, and
+# `grid[r][c]` hands out lightweight CellViews for callers that still
+# want cell objects. Neighbours come from the board topology's shared
+# CSR arrays.
+
+
+def neighbor_counts(mask, topology):
+    """
+    Counts, for every square, how many of its neighbours are set in
+    `mask`. Adjacency is symmetric, so each set cell adds one to every
+    index in its CSR row; the rows of all set cells are gathered in one
+    go and tallied with bincount.
+    """
+    offsets = np.frombuffer(topology.offsets, dtype=np.int32)
+    indices = np.frombuffer(topology.indices, dtype=np.int32)
+    cells = np.flatnonzero(mask)
+    starts = offsets[cells]
+    lengths = offsets[cells + 1] - starts
+    # Position k of the gathered rows reads indices[starts[row] + step]
+    steps = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    counts = np.bincount(indices[np.repeat(starts, lengths) + steps], minlength=mask.size)
+    return counts.reshape(mask.shape).astype(np.int8)
+
+
+class NumpyBoard:
+    def __init__(self, rows, cols, mines, history_depth=10, seed=None, topology="square"):
+        self.rows = rows
+        self.cols = cols
+        self.total_mines = mines
+        self.is_mine = np.zeros((rows, cols), dtype=bool)
+        self.is_revealed = np.zeros((rows, cols), dtype=bool)
+        self.is_flagged = np.zeros((rows, cols), dtype=bool)
+        self.number = np.zeros((rows, cols), dtype=np.int8)
+        self.topology = get_topology(topology, rows, cols)
+        self.grid = GridView(self)
+        self.game_over = False
+        self.winner = None
+        self.first_click = True
+        # Mine layouts are a pure function of (seed, first click), so any
+        # game can be rebuilt and replayed from its seed
+        self.seed = random.getrandbits(64) if seed is None else seed
+        # Undo log of per-action deltas, oldest entries dropped first
+        self.history = deque(maxlen=history_depth)
+        # Live frontier index: (r, c) of revealed numbered cells that still
+        # touch at least one hidden, unflagged cell.
+        self.frontier = set()
+        # Append-only log of (r, c) whose state changed, so consumers such
+        # as the solver can catch up on just the cells touched since they
+        # last looked.
+        self.change_log = []
+        # Bumped on every state change, so results can be cached per version
+        self.version = 0
+
+    # --- CELL VIEW ACCESS ---
+    def get_cell_attr(self, r, c, name):
+        value = getattr(self, name)[r, c]
+        return int(value) if name == "number" else bool(value)
+
+    def set_cell_attr(self, r, c, name, value):
+        getattr(self, name)[r, c] = value
+
+    def neighbors_of(self, r, c):
+        return [CellView(self, nr, nc) for nr, nc in self._neighbor_coords(r, c)]
+
+    def _neighbor_coords(self, r, c):
+        return self.topology.neighbor_coords(r, c)
+
+    # --- HISTORY ---
+    def save_state(self):
+        """Opens a new undo entry; actions record the (r, c) they change into it."""
+        entry = {"revealed": [], "flagged": [], "placed_mines": False}
+        self.history.append(entry)
+        return entry
+
+    def undo(self):
+        if not self.history: return False
+        entry = self.history.pop()
+        if entry["revealed"]:
+            rows, cols = zip(*entry["revealed"])
+            self.is_revealed[rows, cols] = False
+        for r, c in entry["flagged"]:
+            self.is_flagged[r, c] = not self.is_flagged[r, c]
+
+        if entry["placed_mines"]:
+            # Undoing the opening click also undoes the mine layout
+            self.is_mine[:] = False
+            self.number[:] = 0
+            self.first_click = True
+        self._update_frontier(entry["revealed"] + entry["flagged"])
+
+        self.game_over = False
+        self.winner = None
+        return True
+
+    def _is_frontier(self, r, c):
+        if not self.is_revealed[r, c] or self.number[r, c] == 0: return False
+        return any(not self.is_revealed[nr, nc] and not self.is_flagged[nr, nc]
+                   for nr, nc in self._neighbor_coords(r, c))
+
+    def _update_frontier(self, changed):
+        # Only the changed cells and their neighbours can enter or leave
+        # the frontier, so the index is refreshed in O(changed) time.
+        self.change_log.extend(changed)
+        self.version += 1
+        touched = set(changed)
+        for r, c in changed:
+            touched.update(self._neighbor_coords(r, c))
+        for r, c in touched:
+            if self._is_frontier(r, c):
+                self.frontier.add((r, c))
+            else:
+                self.frontier.discard((r, c))
+
+    # --- GAME ACTIONS ---
+    def place_mines(self, safe_r, safe_c):
+        candidates = np.ones(self.rows * self.cols, dtype=bool)
+        candidates[list(self.topology.safe_zone(safe_r * self.cols + safe_c))] = False
+        flat_candidates = np.flatnonzero(candidates)
+
+        picks = random.Random(self.seed).sample(range(len(flat_candidates)), self.total_mines)
+        self.is_mine.flat[flat_candidates[picks]] = True
+
+        self.number = np.where(self.is_mine, 0, neighbor_counts(self.is_mine, self.topology)).astype(np.int8)
+
+    def _flood_fill(self, r, c, changed):
+        # BFS over the zero region starting at (r, c), walking the CSR
+        # arrays with flat indices; newly revealed cells are appended to
+        # `changed`
+        cols = self.cols
+        off, idx = self.topology.offsets, self.topology.indices
+        revealed, flagged, number = self.is_revealed.ravel(), self.is_flagged.ravel(), self.number.ravel()
+        queue = deque([r * cols + c])
+        while queue:
+            i = queue.popleft()
+            for j in idx[off[i]:off[i + 1]]:
+                if not revealed[j] and not flagged[j]:
+                    revealed[j] = True
+                    changed.append(divmod(j, cols))
+                    if number[j] == 0:
+                        queue.append(j)
+
+    def reveal(self, r, c):
+        if self.is_revealed[r, c] or self.is_flagged[r, c]: return 0
+
+        entry = self.save_state()
+
+        if self.first_click:
+            self.place_mines(r, c)
+            self.first_click = False
+            entry["placed_mines"] = True
+
+        self.is_revealed[r, c] = True
+        changed = [(r, c)]
+        entry["revealed"] = changed
+        if self.is_mine[r, c]:
+            self.game_over = True
+            self._update_frontier(changed)
+            return -999
+
+        if self.number[r, c] == 0:
+            self._flood_fill(r, c, changed)
+        self._update_frontier(changed)
+        return len(changed)
+
+    def chord(self, r, c):
+        if not self.is_revealed[r, c] or self.number[r, c] == 0: return 0
+
+        flag_count = sum(1 for nr, nc in self._neighbor_coords(r, c) if self.is_flagged[nr, nc])
+        if flag_count == self.number[r, c]:
+            entry = self.save_state()
+            mine_hit = False
+            changed = []
+            entry["revealed"] = changed
+            for nr, nc in self._neighbor_coords(r, c):
+                if not self.is_revealed[nr, nc] and not self.is_flagged[nr, nc]:
+                    self.is_revealed[nr, nc] = True
+                    changed.append((nr, nc))
+                    if self.is_mine[nr, nc]:
+                        mine_hit = True
+                    elif self.number[nr, nc] == 0:
+                        self._flood_fill(nr, nc, changed)
+
+            self._update_frontier(changed)
+            if mine_hit:
+                self.game_over = True
+                return -999
+            return len(changed)
+        return 0
+
+    def toggle_flag(self, r, c):
+        if not self.is_revealed[r, c]:
+            entry = self.save_state()
+            self.is_flagged[r, c] = not self.is_flagged[r, c]
+            entry["flagged"].append((r, c))
+            self._update_frontier([(r, c)])
+            return True
+        return False
+
+    def apply_moves(self, moves):
+        """
+        Applies a batch of (r, c, action) moves as one undoable step;
+        see Board.apply_moves.
+        """
+        if not moves: return 0
+        entry = self.save_state()
+        revealed = entry["revealed"]
+        flagged = entry["flagged"]
+        mine_hit = False
+        for r, c, action in moves:
+            if action == 'flag':
+                if not self.is_revealed[r, c]:
+                    self.is_flagged[r, c] = not self.is_flagged[r, c]
+                    flagged.append((r, c))
+                continue
+            if self.is_revealed[r, c] or self.is_flagged[r, c]:
+                continue
+            if self.first_click:
+                self.place_mines(r, c)
+                self.first_click = False
+                entry["placed_mines"] = True
+            self.is_revealed[r, c] = True
+            revealed.append((r, c))
+            if self.is_mine[r, c]:
+                mine_hit = True
+                break
+            if self.number[r, c] == 0:
+                self._flood_fill(r, c, revealed)
+
+        self._update_frontier(revealed + flagged)
+        if mine_hit:
+            self.game_over = True
+            return -999
+        return len(revealed)
+
+    def _record(self, key, cells):
+        # Folds end-of-game changes into the action that caused them
+        if self.history:
+            self.history[-1][key].extend(cells)
+        self._update_frontier(cells)
+
+    def reveal_mines(self):
+        """Reveals every mine once the game is lost."""
+        rows, cols = np.nonzero(self.is_mine & ~self.is_revealed)
+        self.is_revealed[rows, cols] = True
+        self._record("revealed", list(zip(rows.tolist(), cols.tolist())))
+
+    def flag_remaining(self):
+        """Flags every hidden cell once the board is cleared."""
+        rows, cols = np.nonzero(~self.is_revealed & ~self.is_flagged)
+        self.is_flagged[rows, cols] = True
+        self._record("flagged", list(zip(rows.tolist(), cols.tolist())))
+
+    # --- QUERIES ---
+    def neighbor_coords(self, r, c):
+        return self._neighbor_coords(r, c)
+
+    def revealed_count(self):
+        return int(self.is_revealed.sum())
+
+    def flagged_count(self):
+        return int(np.count_nonzero(self.is_flagged))
+
+    def hidden_indices(self):
+        """Flat indices (r * cols + c) of the hidden, unflagged cells, in order."""
+        return np.flatnonzero(~self.is_revealed & ~self.is_flagged).tolist()
+
+    def get_hidden_neighbors(self, cell):
+        return [CellView(self, nr, nc) for nr, nc in self._neighbor_coords(cell.r, cell.c)
+                if not self.is_revealed[nr, nc] and not self.is_flagged[nr, nc]]
+
+    def get_flagged_neighbors(self, cell):
+        return [CellView(self, nr, nc) for nr, nc in self._neighbor_coords(cell.r, cell.c)
+                if self.is_flagged[nr, nc]]
+
+    def get_revealed_numbered_nodes(self):
+        rows, cols = np.nonzero(self.is_revealed & (self.number > 0))
+        return [CellView(self, r, c) for r, c in zip(rows.tolist(), cols.tolist())]
+
+    def get_frontier_nodes(self):
+        """Revealed numbered cells with unresolved neighbours, in row-major order."""
+        return [CellView(self, r, c) for r, c in sorted(self.frontier)]
+
+    def get_frontier_cells(self):
+        """(r, c) of hidden, unflagged cells bordering the frontier."""
+        cells = set()
+        for r, c in self.frontier:
+            for nr, nc in self._neighbor_coords(r, c):
+                if not self.is_revealed[nr, nc] and not self.is_flagged[nr, nc]:
+                    cells.add((nr, nc))
+        return cells
@@ -0,0 +1,272 @@
+import time
+from math import prod
+
+# ------------------------------------------------------------
+# EXACT MINE PROBABILITIES
+# ------------------------------------------------------------
+# Computes the exact probability that each unknown cell hides a
+# mine, given the visible constraints and the global mine count.
+#
+# The frontier is split into independent components of the
+# constraint graph (cells linked by a shared numbered cell).
+# Each component is enumerated separately by backtracking,
+# recording how many solutions use k mines. The components are
+# then combined with the global mine count, weighting every
+# total by the number of ways to place the remaining mines in
+# the unconstrained (background) cells.
+# ------------------------------------------------------------
+
+
+class TooComplex(Exception):
+    """Raised when enumeration exceeds its node budget."""
+
+
+class Probabilities:
+    def __init__(self, cells, background, safe, mines, bounds=None, background_bounds=None, samples=None):
+        # (r, c) -> probability for every constrained cell
+        self.cells = cells
+        # Probability for each unconstrained hidden cell (None if there are none)
+        self.background = background
+        # Cells proven safe / mined once the global count is taken into account
+        self.safe = safe
+        self.mines = mines
+        # Estimates only (see sampling.py): (low, high) confidence bounds
+        # per cell and for the background, and the number of samples.
+        # None for exact results.
+        self.bounds = bounds
+        self.background_bounds = background_bounds
+        self.samples = samples
+
+
+def split_components(constraints):
+    """
+    Groups constraints into independent components.
+
+    Parameters:
+    - constraints: list of (cells, mines) with cells a set of (r, c)
+
+    Returns:
+    - list of (cells, constraints) per component
+    """
+    parent = {}
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for cells, _ in constraints:
+        for cell in cells:
+            parent.setdefault(cell, cell)
+        first = next(iter(cells))
+        for cell in cells:
+            ra, rb = find(first), find(cell)
+            if ra != rb:
+                parent[rb] = ra
+
+    groups = {}
+    for con in constraints:
+        root = find(next(iter(con[0])))
+        groups.setdefault(root, []).append(con)
+
+    components = []
+    for cons in groups.values():
+        cells = set()
+        for con_cells, _ in cons:
+            cells |= con_cells
+        components.append((cells, cons))
+    return components
+
+
+def _order_cells(cells, constraints):
+    # Visit cells constraint by constraint, so each constraint is
+    # closed (and pruned) as early as possible during backtracking.
+    order = []
+    seen = set()
+    by_cell = {}
+    for con in constraints:
+        for cell in con[0]:
+            by_cell.setdefault(cell, []).append(con)
+    stack = [min(cells)]
+    while stack:
+        cell = stack.pop()
+        if cell in seen:
+            continue
+        seen.add(cell)
+        order.append(cell)
+        for con_cells, _ in by_cell[cell]:
+            for other in sorted(con_cells, reverse=True):
+                if other not in seen:
+                    stack.append(other)
+    return order
+
+
+def enumerate_component(cells, constraints, budget, deadline=None):
+    """
+    Enumerates every mine layout of one component that satisfies its
+    constraints. Raises TooComplex past the node budget or the
+    time.monotonic() deadline.
+
+    Returns:
+    - order: the component's cells in enumeration order
+    - counts: {k: number of solutions with k mines}
+    - hits: {k: per-cell list of how many of those solutions mine the cell}
+    """
+    order = _order_cells(cells, constraints)
+    index = {cell: i for i, cell in enumerate(order)}
+    n = len(order)
+
+    rem = [mines for _, mines in constraints]
+    placed = [0] * len(constraints)
+    open_count = [len(con_cells) for con_cells, _ in constraints]
+    var_cons = [[] for _ in range(n)]
+    for ci, (con_cells, _) in enumerate(constraints):
+        for cell in con_cells:
+            var_cons[index[cell]].append(ci)
+
+    # Depth-first search with an explicit stack, so components of any
+    # size stay within the interpreter's recursion limit. tried[i] is
+    # the next value (0, 1) to try for cell i; 2 means both were tried.
+    assignment = [0] * n
+    tried = [0] * (n + 1)
+    counts = {}
+    hits = {}
+    nodes = 1
+    i = k = 0
+    while True:
+        if i == n:
+            counts[k] = counts.get(k, 0) + 1
+            row = hits.setdefault(k, [0] * n)
+            for j in range(n):
+                if assignment[j]:
+                    row[j] += 1
+        elif tried[i] < 2:
+            value = tried[i]
+            tried[i] += 1
+            ok = True
+            for ci in var_cons[i]:
+                m = placed[ci] + value
+                if m > rem[ci] or m + open_count[ci] - 1 < rem[ci]:
+                    ok = False
+                    break
+            if not ok:
+                continue
+            for ci in var_cons[i]:
+                placed[ci] += value
+                open_count[ci] -= 1
+            assignment[i] = value
+            k += value
+            i += 1
+            tried[i] = 0
+            nodes += 1
+            if nodes > budget[0]:
+                raise TooComplex()
+            if deadline is not None and nodes % 4096 == 0 and time.monotonic() > deadline:
+                raise TooComplex()
+            continue
+        # Cell i is done (or every cell is assigned): step back and undo
+        # the choice made for the previous cell
+        i -= 1
+        if i < 0:
+            break
+        value = assignment[i]
+        for ci in var_cons[i]:
+            placed[ci] -= value
+            open_count[ci] += 1
+        assignment[i] = 0
+        k -= value
+
+    budget[0] -= nodes
+    return order, counts, hits
+
+
+def _convolve(a, b):
+    out = {}
+    for ka, va in a.items():
+        for kb, vb in b.items():
+            out[ka + kb] = out.get(ka + kb, 0) + va * vb
+    return out
+
+
+def mine_probabilities(constraints, unknown_count, mines_left, max_nodes=200000, deadline=None):
+    """
+    Exact per-cell mine probabilities.
+
+    Parameters:
+    - constraints: list of (cells, mines) — each numbered cell's unknown
+      neighbours and how many mines remain among them
+    - unknown_count: total number of unknown (hidden, unflagged) cells
+    - mines_left: mines not yet flagged or deduced
+    - max_nodes: backtracking budget across all components
+    - deadline: optional time.monotonic() value to give up at
+
+    Returns:
+    - Probabilities, or None if the constraints are inconsistent or the
+      enumeration would exceed max_nodes or the deadline
+    """
+    components = split_components(constraints)
+    budget = [max_nodes]
+    solved = []
+    try:
+        for cells, cons in components:
+            solved.append(enumerate_component(cells, cons, budget, deadline))
+    except TooComplex:
+        return None
+
+    frontier_size = sum(len(order) for order, _, _ in solved)
+    background = unknown_count - frontier_size
+
+    # Totals are weighted by comb(background, mines_left - k). Only the
+    # ratios matter, and with a huge background the binomials themselves
+    # run to millions of digits, so weigh with the exact integers
+    #   W(left) = hi! * (background - lo)! / (left! * (background - left)!)
+    #           = comb(background, left) * hi! * (background - lo)! / background!
+    # over the reachable range lo <= left <= hi instead
+    lo = max(0, mines_left - frontier_size)
+    hi = min(background, mines_left)
+    weights = {}
+    if lo <= hi:
+        w = prod(range(background - hi + 1, background - lo + 1))
+        for left in range(hi, lo - 1, -1):
+            weights[left] = w
+            w = w * left // (background - left + 1)
+
+    def weight(k):
+        return weights.get(mines_left - k, 0)
+
+    # Prefix/suffix products let us exclude each component in turn
+    dists = [counts for _, counts, _ in solved]
+    prefix = [{0: 1}]
+    for dist in dists:
+        prefix.append(_convolve(prefix[-1], dist))
+    suffix = [{0: 1}]
+    for dist in reversed(dists):
+        suffix.append(_convolve(suffix[-1], dist))
+    suffix.reverse()
+
+    total = prefix[-1]
+    z = sum(ways * weight(k) for k, ways in total.items())
+    if z == 0:
+        return None
+
+    cells = {}
+    safe = set()
+    mines = set()
+    for i, (order, counts, hits) in enumerate(solved):
+        rest = _convolve(prefix[i], suffix[i + 1])
+        # Weight of the other components and background for each k here
+        rest_weight = {k: sum(ways * weight(k + k2) for k2, ways in rest.items()) for k in counts}
+        for j, cell in enumerate(order):
+            num = sum(hits[k][j] * rest_weight[k] for k in hits)
+            if num == 0:
+                safe.add(cell)
+            elif num == z:
+                mines.add(cell)
+            cells[cell] = num / z
+
+    background_p = None
+    if background > 0:
+        expected = sum(ways * weight(k) * (mines_left - k) for k, ways in total.items())
+        background_p = expected / (z * background)
+    return Probabilities(cells, background_p, safe, mines)
@@ -0,0 +1,193 @@
+import csv
+import functools
+import json
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+
+# --- FRAME PROFILER ---
+# Per-phase timers and counters for the game loop. Phases are timed
+# inline (`with profiler.phase("draw"):`), as laps of the loop
+# (`profiler.lap("events")` charges the time since the previous lap), or
+# by instrumenting a method on one object (`profiler.instrument(board,
+# "_flood_fill", "flood_fill")`), which swaps in a timing wrapper on that
+# instance. Phases are inclusive: a flood fill run while handling a
+# click counts towards both "flood_fill" and "events".
+#
+# When the profiler is disabled, `phase` hands back a shared no-op
+# context and instrumented methods are restored to the originals, so the
+# hooks cost next to nothing. Time recorded from other threads (the AI
+# worker, the log writer) is added to the frame in which it finishes.
+#
+# Every finished frame becomes one sample {frame, time, frame_ms, <phase>
+# ms..., <counter>...}; the last `max_frames` samples are kept for the
+# overlay and can be exported to CSV or JSON.
+
+_NULL = nullcontext()
+
+
+class Profiler:
+    def __init__(self, max_frames=3600):
+        self.enabled = False
+        self.samples = deque(maxlen=max_frames)
+        self._current = {}
+        self._frame = 0
+        self._frame_start = None
+        self._lap = None
+        self._counters = set()
+        self._lock = threading.Lock()
+        # (phase, method name) -> instrumented object
+        self._targets = {}
+
+    # --- SWITCHING ---
+    def enable(self):
+        if self.enabled:
+            return
+        self.enabled = True
+        self._frame_start = self._lap = time.perf_counter()
+        for (phase, name), obj in self._targets.items():
+            self._wrap(obj, name, phase)
+
+    def disable(self):
+        if not self.enabled:
+            return
+        self.enabled = False
+        for (_, name), obj in self._targets.items():
+            obj.__dict__.pop(name, None)
+        with self._lock:
+            self._current = {}
+
+    def toggle(self):
+        if self.enabled:
+            self.disable()
+        else:
+            self.enable()
+        return self.enabled
+
+    # --- HOOKS ---
+    def phase(self, name):
+        """Context manager timing one phase of the current frame."""
+        if not self.enabled:
+            return _NULL
+        return _Timer(self, name)
+
+    def lap(self, name):
+        """Charges the time since the previous lap (or frame start) to a phase."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.add(name, (now - self._lap) * 1000)
+        self._lap = now
+
+    def add(self, name, ms):
+        """Adds `ms` milliseconds to a phase of the current frame."""
+        with self._lock:
+            self._current[name] = self._current.get(name, 0.0) + ms
+
+    def count(self, name, n=1):
+        """Adds to a per-frame counter."""
+        if self.enabled:
+            with self._lock:
+                self._counters.add(name)
+                self._current[name] = self._current.get(name, 0) + n
+
+    def instrument(self, obj, name, phase):
+        """
+        Times every call to `obj.name` under `phase` while enabled.
+        Registering the same (phase, name) again replaces the previous
+        object, so a new board simply takes over from the old one.
+        """
+        key = (phase, name)
+        old = self._targets.get(key)
+        if old is not None:
+            old.__dict__.pop(name, None)
+        self._targets[key] = obj
+        if self.enabled:
+            self._wrap(obj, name, phase)
+
+    def _wrap(self, obj, name, phase):
+        original = getattr(type(obj), name).__get__(obj)
+
+        @functools.wraps(original)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                self.add(phase, (time.perf_counter() - start) * 1000)
+
+        obj.__dict__[name] = timed
+
+    # --- FRAMES ---
+    def end_frame(self):
+        """Closes the current frame and stores its sample."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        with self._lock:
+            sample, self._current = self._current, {}
+        sample.update(frame=self._frame, time=time.time(),
+                      frame_ms=(now - self._frame_start) * 1000)
+        self.samples.append(sample)
+        self._frame += 1
+        self._frame_start = self._lap = now
+
+    def summary(self, frames=60):
+        """
+        Averages over the last `frames` samples.
+
+        Returns:
+        - dict with 'fps', 'frame_ms', 'phases' ({phase: mean ms per
+          frame}, slowest first) and 'counters' ({counter: mean per
+          frame}); None before the first sample
+        """
+        recent = list(self.samples)[-frames:]
+        if not recent:
+            return None
+        totals = {}
+        for sample in recent:
+            for key, value in sample.items():
+                if key not in ("frame", "time", "frame_ms"):
+                    totals[key] = totals.get(key, 0) + value
+        frame_ms = sum(s["frame_ms"] for s in recent) / len(recent)
+        means = sorted(((key, total / len(recent)) for key, total in totals.items()),
+                       key=lambda item: -item[1])
+        return {"fps": 1000 / frame_ms if frame_ms > 0 else 0.0,
+                "frame_ms": frame_ms,
+                "phases": {k: v for k, v in means if k not in self._counters},
+                "counters": {k: v for k, v in means if k in self._counters}}
+
+    # --- EXPORT ---
+    def export(self, path):
+        """
+        Writes every kept sample to `path`: JSON for a .json path, CSV
+        otherwise (one row per frame, a column per phase and counter,
+        0 where a frame did not record one).
+        """
+        samples = list(self.samples)
+        if path.endswith(".json"):
+            with open(path, "w") as f:
+                json.dump(samples, f, indent=1)
+            return
+        fields = ["frame", "time", "frame_ms"]
+        for sample in samples:
+            fields.extend(key for key in sample if key not in fields)
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=fields, restval=0)
+            writer.writeheader()
+            writer.writerows(samples)
+
+
+class _Timer:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.profiler.add(self.name, (time.perf_counter() - self.start) * 1000)
@@ -0,0 +1,100 @@
+"""
+Reader for the JSONL game log.
+
+Streams saved sessions newest-first, reading each log file backwards in
+blocks so only the sessions actually printed are loaded:
+
+    python read_logs.py --limit 5
+
+Sessions carry their game as a replay; --replays collects them into one
+binary file for replay.py.
+"""
+
+import argparse
+import base64
+import json
+import os
+import re
+
+from game_log import LOG_FILENAME, default_log_dir
+
+
+def read_lines_reversed(path, block_size=64 * 1024):
+    """Yields the lines of a file from last to first."""
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        tail = b""
+        while pos > 0:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            chunk = f.read(step) + tail
+            lines = chunk.split(b"\n")
+            # The first piece may be cut mid-line; keep it for the next block
+            tail = lines.pop(0)
+            for line in reversed(lines):
+                if line:
+                    yield line.decode("utf-8")
+        if tail:
+            yield tail.decode("utf-8")
+
+
+def iter_sessions(log_dir=None):
+    """Yields logged sessions newest-first across the log and its rotations."""
+    log_dir = log_dir or default_log_dir()
+    if not os.path.isdir(log_dir):
+        return
+    pattern = re.compile(re.escape(LOG_FILENAME) + r"(?:\.(\d+))?$")
+    files = []
+    for name in os.listdir(log_dir):
+        match = pattern.match(name)
+        if match:
+            files.append((int(match.group(1) or 0), os.path.join(log_dir, name)))
+    for _, path in sorted(files):
+        for line in read_lines_reversed(path):
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue  # partial line from an interrupted write
+
+
+def format_session(session):
+    out = [f"{'=' * 60}", f" SESSION TIMESTAMP: {session.get('timestamp', '?')}", f"{'=' * 60}",
+           f"Grid: {session.get('grid_size')}x{session.get('grid_size')}, Mines: {session.get('mines')}",
+           "-" * 105,
+           f"{'TIME':<10} | {'ACTOR':<8} | {'ACTION':<10} | {'COORD':<8} | {'RESULT':<20} | {'REASON'}",
+           "-" * 105]
+    for e in session.get("moves", []):
+        out.append(f"{e['Time']:<10} | {e['Actor']:<8} | {e['Action']:<10} | {e['Coord']:<8} | "
+                   f"{e['Result']:<20} | {e['Reason']}")
+    return "\n".join(out) + "\n"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Print saved game sessions, newest first.")
+    parser.add_argument("--dir", default=None, help="log directory (default: %s)" % default_log_dir())
+    parser.add_argument("--limit", type=int, default=None, help="number of sessions to print")
+    parser.add_argument("--json", action="store_true", help="print raw JSON lines")
+    parser.add_argument("--replays", metavar="FILE", default=None,
+                        help="write the sessions' replays to FILE instead of printing")
+    args = parser.parse_args(argv)
+
+    replays = []
+    for i, session in enumerate(iter_sessions(args.dir)):
+        if args.limit is not None and i >= args.limit:
+            break
+        if args.replays:
+            if session.get("replay"):
+                replays.append(base64.b64decode(session["replay"]))
+            continue
+        print(json.dumps(session) if args.json else format_session(session))
+
+    if args.replays:
+        with open(args.replays, "wb") as f:
+            f.write(b"".join(reversed(replays)))  # oldest first
+        print(f"Wrote {len(replays)} replays to {args.replays}")
+
+
+if __name__ == "__main__":
+    main()
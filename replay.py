@@ -0,0 +1,254 @@
+"""
+Compact binary replays of seeded games.
+
+A replay is a fixed-size header followed by fixed-width move records:
+
+    header: magic 'MSRP', version, rows, cols, mines, seed,
+            first click row/col, move count, topology
+    move:   action, row, col, result
+
+A batch (Board.apply_moves) is one BATCH record carrying the move count
+and the batch's result, followed by that many reveal or flag records
+whose own results are unused. The count's low 16 bits go in the row
+field and its high 16 bits in the col field (zero for batches under
+65536 moves), so a batch holds at most MAX_BATCH moves.
+
+Version 1 replays have no topology byte and are read as square boards.
+
+Because a board's mine layout depends only on its seed and first click,
+replaying the moves on a fresh board with the same seed reproduces the
+game exactly, and each recorded result can be checked along the way.
+Replays can be concatenated into one file, so a headless run can store
+thousands of games and verify them later:
+
+    python simulate.py --games 2000 --record games.msr
+    python replay.py games.msr
+"""
+
+import argparse
+import os
+import struct
+import sys
+import time
+
+from backends import BACKENDS, make_board
+from topology import TOPOLOGIES
+
+MAGIC = b"MSRP"
+VERSION = 2
+HEADER = struct.Struct("<4sBHHIQHHIB")
+HEADER_V1 = struct.Struct("<4sBHHIQHHI")
+TOPOLOGY_CODES = list(TOPOLOGIES)
+MOVE = struct.Struct("<BHHi")
+NO_CLICK = 0xFFFF
+MAX_BATCH = 0xFFFFFFFF
+
+REVEAL, FLAG, CHORD, UNDO, BATCH = range(5)
+ACTIONS = {"reveal": REVEAL, "flag": FLAG, "chord": CHORD, "undo": UNDO}
+NAMES = {code: name for name, code in ACTIONS.items()}
+
+
+class ReplayError(Exception):
+    """Raised for malformed replay data."""
+
+
+class ReplayRecorder:
+    def __init__(self, board):
+        self.rows = board.rows
+        self.cols = board.cols
+        self.mines = board.total_mines
+        self.seed = board.seed
+        self.topology = board.topology.name
+        self.first_click = None
+        self.moves = []
+
+    def record(self, action, r, c, result):
+        """
+        Records one applied move and what the board returned for it
+        (revealed count / -999 for reveal and chord, True/False otherwise).
+        """
+        code = ACTIONS[action]
+        if code == REVEAL and self.first_click is None:
+            self.first_click = (r, c)
+        self.moves.append((code, r, c, int(result)))
+
+    def record_batch(self, moves, result):
+        """Records a batch of (r, c, action) moves applied with Board.apply_moves."""
+        if len(moves) > MAX_BATCH:
+            raise ReplayError(f"batch of {len(moves)} moves exceeds the replay limit of {MAX_BATCH}")
+        self.moves.append((BATCH, len(moves) & 0xFFFF, len(moves) >> 16, int(result)))
+        for r, c, action in moves:
+            code = ACTIONS[action]
+            if code == REVEAL and self.first_click is None:
+                self.first_click = (r, c)
+            self.moves.append((code, r, c, 0))
+
+    def to_bytes(self):
+        if len(self.moves) > 0xFFFFFFFF:
+            raise ReplayError(f"{len(self.moves)} move records exceed the replay header's count field")
+        first_r, first_c = self.first_click or (NO_CLICK, NO_CLICK)
+        out = [HEADER.pack(MAGIC, VERSION, self.rows, self.cols, self.mines, self.seed,
+                           first_r, first_c, len(self.moves), TOPOLOGY_CODES.index(self.topology))]
+        out.extend(MOVE.pack(*move) for move in self.moves)
+        return b"".join(out)
+
+
+def iter_replays(data):
+    """Yields (header dict, moves) for every replay in a byte string."""
+    offset = 0
+    while offset < len(data):
+        if len(data) - offset < HEADER_V1.size:
+            raise ReplayError(f"truncated header at byte {offset}")
+        magic, version = data[offset:offset + 4], data[offset + 4]
+        if magic != MAGIC or version not in (1, VERSION):
+            raise ReplayError(f"bad replay header at byte {offset}")
+        if version == 1:
+            _, _, rows, cols, mines, seed, first_r, first_c, count = HEADER_V1.unpack_from(data, offset)
+            offset += HEADER_V1.size
+            topology = "square"
+        else:
+            if len(data) - offset < HEADER.size:
+                raise ReplayError(f"truncated header at byte {offset}")
+            _, _, rows, cols, mines, seed, first_r, first_c, count, code = HEADER.unpack_from(data, offset)
+            if code >= len(TOPOLOGY_CODES):
+                raise ReplayError(f"unknown topology {code} at byte {offset}")
+            offset += HEADER.size
+            topology = TOPOLOGY_CODES[code]
+        end = offset + count * MOVE.size
+        if end > len(data):
+            raise ReplayError(f"truncated moves at byte {offset}")
+        moves = [MOVE.unpack_from(data, pos) for pos in range(offset, end, MOVE.size)]
+        offset = end
+        header = {"rows": rows, "cols": cols, "mines": mines, "seed": seed,
+                  "first_click": None if first_r == NO_CLICK else (first_r, first_c),
+                  "topology": topology}
+        yield header, moves
+
+
+def apply_move(board, action, r, c):
+    if action == REVEAL:
+        return board.reveal(r, c)
+    if action == FLAG:
+        return int(board.toggle_flag(r, c))
+    if action == CHORD:
+        return board.chord(r, c)
+    if action == UNDO:
+        return int(board.undo())
+    raise ReplayError(f"unknown action {action}")
+
+
+def pick_backend(header):
+    """
+    The fastest backend that fits a recorded board: the bitboard for
+    settings-screen sizes, numpy (when installed) or list beyond that.
+    """
+    from bitboard import MAX_CELLS
+
+    if header["rows"] * header["cols"] <= MAX_CELLS:
+        return "bitboard"
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return "list"
+    return "numpy"
+
+
+def replay_game(header, moves, backend="list"):
+    """
+    Replays one game on a fresh seeded board ('auto' picks the backend
+    from the board size, see pick_backend).
+
+    Returns:
+    - (board, index of the first move whose result differs, or None)
+    """
+    if backend == "auto":
+        backend = pick_backend(header)
+    board = make_board(backend, header["rows"], header["cols"], header["mines"],
+                       seed=header["seed"], topology=header.get("topology", "square"))
+    i = 0
+    while i < len(moves):
+        action, r, c, result = moves[i]
+        if action == BATCH:
+            count = r | c << 16
+            batch = [(mr, mc, NAMES.get(code)) for code, mr, mc, _ in moves[i + 1:i + 1 + count]]
+            if len(batch) < count or any(name not in ("reveal", "flag") for _, _, name in batch):
+                raise ReplayError(f"malformed batch at move {i}")
+            if board.apply_moves(batch) != result:
+                return board, i
+            i += 1 + count
+            continue
+        if apply_move(board, action, r, c) != result:
+            return board, i
+        i += 1
+    return board, None
+
+
+def _verify_batch(job):
+    # Worker entry point: replays a contiguous run of games
+    first, games, backend = job
+    failures = []
+    for i, (header, moves) in enumerate(games, first):
+        _, mismatch = replay_game(header, moves, backend)
+        if mismatch is not None:
+            failures.append((i, mismatch))
+    return failures
+
+
+def verify(data, backend="list", workers=1):
+    """
+    Replays every game in `data` and checks each recorded result,
+    spreading the games over `workers` processes.
+
+    Returns:
+    - dict with 'games', 'failures' (list of (game index, move index))
+      and 'games_per_second'
+    """
+    start = time.perf_counter()
+    games = list(iter_replays(data))
+    batch = max(1, len(games) // (workers * 4))
+    jobs = [(i, games[i:i + batch], backend) for i in range(0, len(games), batch)]
+    failures = []
+    if workers == 1:
+        for job in jobs:
+            failures.extend(_verify_batch(job))
+    else:
+        # Imported here: the pool machinery is most of the module's import time
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for batch_failures in pool.map(_verify_batch, jobs):
+                failures.extend(batch_failures)
+    games = len(games)
+    elapsed = time.perf_counter() - start
+    return {"games": games, "failures": failures,
+            "games_per_second": games / elapsed if elapsed > 0 else 0.0}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verify recorded replays by replaying them headlessly.")
+    parser.add_argument("files", nargs="+")
+    parser.add_argument("--backend", choices=["auto", *BACKENDS], default="auto",
+                        help="board backend (default: picked per game from its size)")
+    parser.add_argument("--workers", type=int, default=None, help="process count (default: all cores)")
+    args = parser.parse_args(argv)
+    workers = args.workers or os.cpu_count() or 1
+
+    failed = False
+    for path in args.files:
+        with open(path, "rb") as f:
+            data = f.read()
+        try:
+            result = verify(data, args.backend, workers)
+        except ReplayError as e:
+            print(f"{path}: {e}")
+            failed = True
+            continue
+        status = "OK" if not result["failures"] else f"{len(result['failures'])} MISMATCHED"
+        print(f"{path}: {result['games']} games {status} ({result['games_per_second']:.0f} games/s)")
+        for game, move in result["failures"][:10]:
+            print(f"  game {game}: first mismatch at move {move}")
+        failed = failed or bool(result["failures"])
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
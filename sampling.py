@@ -0,0 +1,278 @@
+import math
+import random
+import time
+
+from probability import Probabilities, split_components, _order_cells
+
+# ------------------------------------------------------------
+# MONTE CARLO MINE PROBABILITIES
+# ------------------------------------------------------------
+# Anytime estimate of the per-cell mine probabilities for frontiers
+# too large to enumerate exactly.
+#
+# A Markov chain walks over frontier layouts that satisfy every
+# visible constraint. Each step takes a window of neighbouring
+# frontier cells, enumerates every way to re-place their mines that
+# keeps all constraints satisfied, and picks one at random weighted
+# by the number of ways to place the remaining mines in the
+# background (block Gibbs sampling). Windows grow while their
+# enumeration stays cheap, so small frontiers are resampled whole and
+# long ones in large overlapping pieces. The chain starts from one
+# solution found by backtracking and runs until the time budget is
+# spent; sweeps are grouped into batches whose spread gives the
+# confidence bounds.
+# ------------------------------------------------------------
+
+WINDOW = 12  # starting number of frontier cells re-placed per Gibbs step
+BLOCK_NODES = 4000  # enumeration budget per step; the window adapts to it
+Z_95 = 1.96
+
+
+def _log_weights(frontier_size, background, mines_left):
+    # log of comb(background, mines_left - k) for k frontier mines
+    # (None where the count is impossible)
+    out = []
+    for k in range(frontier_size + 1):
+        left = mines_left - k
+        if 0 <= left <= background:
+            out.append(math.lgamma(background + 1) - math.lgamma(left + 1)
+                       - math.lgamma(background - left + 1))
+        else:
+            out.append(None)
+    return out
+
+
+def _initial_layout(order, var_cons, rem, log_w, rng, deadline):
+    """
+    Finds one layout satisfying every constraint and the global count by
+    iterative backtracking, trying values in random order.
+
+    Returns:
+    - list of 0/1 per cell, or None if there is none (or time ran out)
+    """
+    n = len(order)
+    placed = [0] * len(rem)
+    open_count = [0] * len(rem)
+    for cons in var_cons:
+        for ci in cons:
+            open_count[ci] += 1
+
+    x = [-1] * n
+    choices = [None] * n
+    pos = 0
+    steps = 0
+    while 0 <= pos <= n:
+        if pos == n:
+            if log_w[sum(x)] is not None:
+                return x
+            pos -= 1
+            continue
+        steps += 1
+        if steps % 1024 == 0 and time.monotonic() > deadline:
+            return None
+
+        v = order[pos]
+        if choices[pos] is None:
+            choices[pos] = [0, 1] if rng.random() < 0.5 else [1, 0]
+        elif x[v] != -1:
+            for ci in var_cons[v]:
+                placed[ci] -= x[v]
+                open_count[ci] += 1
+            x[v] = -1
+
+        while choices[pos]:
+            value = choices[pos].pop(0)
+            if all(placed[ci] + value <= rem[ci] and placed[ci] + value + open_count[ci] - 1 >= rem[ci]
+                   for ci in var_cons[v]):
+                for ci in var_cons[v]:
+                    placed[ci] += value
+                    open_count[ci] -= 1
+                x[v] = value
+                break
+        if x[v] == -1:
+            choices[pos] = None
+            pos -= 1
+        else:
+            pos += 1
+    return None
+
+
+def _block_layouts(block, var_cons, x, max_nodes):
+    """
+    Every 0/1 assignment of the cells in `block` that keeps the number of
+    mines each constraint sees inside the block unchanged, so the rest of
+    the layout stays valid.
+
+    Returns:
+    - (layouts, nodes visited), with layouts None past max_nodes
+    """
+    need = {}
+    left = {}
+    for v in block:
+        for ci in var_cons[v]:
+            need[ci] = need.get(ci, 0) + x[v]
+            left[ci] = left.get(ci, 0) + 1
+
+    # Iterative search (windows can grow to the whole component);
+    # tried[i] is the next value to try for block[i], 2 once both were
+    layouts = []
+    n = len(block)
+    values = [0] * n
+    tried = [0] * (n + 1)
+    nodes = 1
+    i = 0
+    while True:
+        if i == n:
+            layouts.append(list(values))
+        elif tried[i] < 2:
+            value = tried[i]
+            tried[i] += 1
+            cons = var_cons[block[i]]
+            if all(need[ci] - value >= 0 and need[ci] - value <= left[ci] - 1 for ci in cons):
+                for ci in cons:
+                    need[ci] -= value
+                    left[ci] -= 1
+                values[i] = value
+                i += 1
+                tried[i] = 0
+                nodes += 1
+                if nodes > max_nodes:
+                    return None, nodes
+            continue
+        i -= 1
+        if i < 0:
+            break
+        for ci in var_cons[block[i]]:
+            need[ci] += values[i]
+            left[ci] += 1
+    return layouts, nodes
+
+
+def _bounds(mean, batch_means):
+    if len(batch_means) < 2:
+        return (0.0, 1.0)
+    nb = len(batch_means)
+    var = sum((b - mean) ** 2 for b in batch_means) / (nb - 1)
+    half = Z_95 * math.sqrt(var / nb)
+    return (max(0.0, mean - half), min(1.0, mean + half))
+
+
+def sample_probabilities(constraints, unknown_count, mines_left, time_budget, rng=None, batches=20):
+    """
+    Monte Carlo estimate of per-cell mine probabilities.
+
+    Parameters:
+    - constraints: list of (cells, mines), as for mine_probabilities
+    - unknown_count: total number of unknown (hidden, unflagged) cells
+    - mines_left: mines not yet flagged or deduced
+    - time_budget: seconds to spend sampling
+    - rng: random.Random to draw from (defaults to the random module)
+    - batches: number of batches used for the confidence bounds
+
+    Returns:
+    - Probabilities with estimates in `cells`/`background`, 95% bounds in
+      `bounds`/`background_bounds` and the sweep count in `samples`;
+      None if no layout satisfying the constraints was found in time
+    """
+    rng = rng or random
+    deadline = time.monotonic() + time_budget
+
+    components = split_components(constraints)
+    names = []
+    spans = []  # (first index, size) of each component in `names`
+    for cells, cons in components:
+        spans.append((len(names), len(cells)))
+        names.extend(_order_cells(cells, cons))
+    index = {cell: i for i, cell in enumerate(names)}
+    n = len(names)
+    if n == 0:
+        return None
+    background = unknown_count - n
+
+    rem = [mines for _, mines in constraints]
+    var_cons = [[] for _ in range(n)]
+    for ci, (cells, _) in enumerate(constraints):
+        for cell in cells:
+            var_cons[index[cell]].append(ci)
+    log_w = _log_weights(n, background, mines_left)
+
+    x = _initial_layout(list(range(n)), var_cons, rem, log_w, rng, deadline)
+    if x is None:
+        return None
+    k = sum(x)
+
+    # Each sweep covers every component in windows of consecutive cells
+    # in constraint order, wrapping around within the component (which
+    # suits ring-shaped frontiers) from a random offset. Windows never
+    # mix components, whose layouts would otherwise multiply.
+    window = WINDOW
+    samples = []
+    while True:
+        rng.shuffle(spans)
+        for first, size in spans:
+            pos = rng.randrange(size)
+            covered = 0
+            while covered < size and time.monotonic() <= deadline:
+                width = min(window, size)
+                block = [first + (pos + i) % size for i in range(width)]
+                step = max(1, width // 2) if width < size else size
+                pos = (pos + step) % size
+                covered += step
+                layouts, nodes = _block_layouts(block, var_cons, x, BLOCK_NODES)
+                if layouts is None:
+                    window = max(2, width * 3 // 4)
+                    continue
+                if nodes < BLOCK_NODES // 4 and width == window:
+                    window += max(1, window // 4)
+                if len(layouts) < 2:
+                    continue
+                old = sum(x[v] for v in block)
+                logs = [log_w[k - old + sum(layout)] for layout in layouts]
+                top = max(w for w in logs if w is not None)
+                weights = [0.0 if w is None else math.exp(w - top) for w in logs]
+                layout = rng.choices(layouts, weights)[0]
+                for v, value in zip(block, layout):
+                    x[v] = value
+                k += sum(layout) - old
+        # A sweep cut short by the deadline still ends on a valid layout
+        samples.append((bytes(x), k))
+        if time.monotonic() > deadline:
+            break
+
+    # The first tenth of the chain is burn-in
+    kept = samples[len(samples) // 10:]
+    count = len(kept)
+    hits = [0] * n
+    bg_total = 0.0
+    nb = min(batches, count)
+    size = count // nb
+    batch_hits = [[0] * n for _ in range(nb)]
+    batch_bg = [0.0] * nb
+    for s, (layout, mines) in enumerate(kept):
+        b = min(s // size, nb - 1)
+        row = batch_hits[b]
+        for v, value in enumerate(layout):
+            if value:
+                hits[v] += 1
+                row[v] += 1
+        if background > 0:
+            share = (mines_left - mines) / background
+            bg_total += share
+            batch_bg[b] += share
+    lengths = [size] * (nb - 1) + [count - size * (nb - 1)]
+
+    cells = {}
+    bounds = {}
+    for v, name in enumerate(names):
+        p = hits[v] / count
+        cells[name] = p
+        bounds[name] = _bounds(p, [batch_hits[b][v] / lengths[b] for b in range(nb)])
+
+    background_p = None
+    background_bounds = None
+    if background > 0:
+        background_p = bg_total / count
+        background_bounds = _bounds(background_p, [batch_bg[b] / lengths[b] for b in range(nb)])
+
+    return Probabilities(cells, background_p, set(), set(), bounds=bounds,
+                         background_bounds=background_bounds, samples=count)
@@ -0,0 +1,55 @@
+import pygame
+
+# --- FRAME SCHEDULER ---
+# Decides when the next frame runs. Loops draw a frame, tell the
+# scheduler what they are waiting for, and call wait():
+#
+# - animate():   something is moving (a flash); next frame at full rate
+# - wake_at(t):  something is due at pygame tick t (the clock's next
+#                second, the end of an AI turn phase)
+# - neither:     nothing to do until the player acts
+#
+# wait() then sleeps in pygame.event.wait until an event arrives or the
+# earliest wake-up is due, so an idle window costs no CPU. Background
+# work (the AI worker) wakes the loop by posting an event. Busy
+# stretches are still capped at `fps`.
+
+
+class FrameScheduler:
+    def __init__(self, clock, fps=60):
+        self.clock = clock
+        self.fps = fps
+        self._animating = False
+        self._wake = None
+
+    def animate(self):
+        """Asks for the next frame at the full frame rate."""
+        self._animating = True
+
+    def wake_at(self, ticks):
+        """Asks for a frame no later than `ticks` (pygame.time.get_ticks() time)."""
+        if self._wake is None or ticks < self._wake:
+            self._wake = ticks
+
+    def wait(self):
+        """
+        Ends the current frame: sleeps until the next one is due and
+        returns the events that arrived meanwhile (possibly none, for a
+        timed wake-up). Requests are cleared; each frame makes its own.
+        """
+        self.clock.tick(self.fps)
+        animating, wake = self._animating, self._wake
+        self._animating = False
+        self._wake = None
+        if animating:
+            return pygame.event.get()
+        if wake is None:
+            event = pygame.event.wait()
+        else:
+            timeout = wake - pygame.time.get_ticks()
+            if timeout <= 0:
+                return pygame.event.get()
+            event = pygame.event.wait(timeout)
+        if event.type == pygame.NOEVENT:
+            return []
+        return [event] + pygame.event.get()
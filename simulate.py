@@ -0,0 +1,190 @@
+"""
+Headless game simulator for the AI solver.
+
+Plays complete games of AI_Solver against a Board with no pygame import
+and no rendering delays, spreading the games over a process pool. Used to
+evaluate solver changes on real game counts:
+
+    python simulate.py --games 5000 --size 16 --difficulty Medium
+
+Every game is seeded, and --record writes all of them to one binary
+replay file that replay.py can verify later. --db stores the results in
+a games.db SQLite store (see game_db.py) for querying.
+
+--engine batch plays the games in lockstep on stacked NumPy boards
+instead (see batch_sim.py): far faster, but with the local rules only.
+
+--topology plays on another board topology (torus, hex, knight; see
+topology.py) with the pool engine.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import random
+import time
+
+from ai_solver import AI_Solver
+from backends import BACKENDS, make_board
+from constants import DIFFICULTY_RATIOS
+from replay import ReplayRecorder
+from topology import TOPOLOGIES
+
+
+def play_game(size, mines, seed, backend="list", record=False, topology="square"):
+    """
+    Plays one full game with the AI making every move. Each turn applies
+    everything the solver has proven as one batch (or a single guess).
+
+    Returns:
+    - dict with 'won', 'moves' (individual moves), 'turns' (batches) and
+      'guesses' for the game, plus 'replay'
+      (the game as replay bytes) when `record` is set
+    """
+    random.seed(seed)
+    board = make_board(backend, size, size, mines, seed=seed, topology=topology)
+    recorder = ReplayRecorder(board) if record else None
+    ai = AI_Solver()
+    safe_cells = size * size - mines
+    revealed = 0
+    moves = 0
+    turns = 0
+    guesses = 0
+
+    while not board.game_over and revealed < safe_cells:
+        batch = ai.get_moves(board)
+        if not batch:
+            break
+        moves += len(batch)
+        turns += 1
+        if ai.guessed:
+            guesses += 1
+
+        res = board.apply_moves(batch)
+        if recorder:
+            recorder.record_batch(batch, res)
+        if res == -999:
+            break
+        revealed += res
+
+    result = {"won": not board.game_over and revealed >= safe_cells,
+              "moves": moves, "turns": turns, "guesses": guesses}
+    if recorder:
+        result["replay"] = recorder.to_bytes()
+    return result
+
+
+def _play_batch(job):
+    # Worker entry point: plays a contiguous range of seeded games
+    size, mines, seeds, backend, record, topology = job
+    return [play_game(size, mines, seed, backend, record, topology) for seed in seeds]
+
+
+def run_simulation(games, size, difficulty, workers=None, seed=0, backend="list", record=None, db=None,
+                   topology="square"):
+    """
+    Plays `games` games across a process pool and aggregates the results.
+
+    Game i uses seed `seed + i`, so runs are reproducible for any worker count.
+    If `record` is a path, every game is written there as a replay, in order.
+    If `db` is a path, every game is stored in that game database.
+    """
+    mines = int(size * size * DIFFICULTY_RATIOS[difficulty])
+    workers = workers or os.cpu_count() or 1
+    batch = max(1, games // (workers * 4))
+    jobs = [(size, mines, range(seed + start, seed + min(start + batch, games)), backend, bool(record),
+             topology)
+            for start in range(0, games, batch)]
+
+    start_time = time.perf_counter()
+    results = []
+    if workers == 1:
+        for job in jobs:
+            results.extend(_play_batch(job))
+    else:
+        # Imported here: the pool machinery is most of the module's import time
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for batch_results in pool.map(_play_batch, jobs):
+                results.extend(batch_results)
+    elapsed = time.perf_counter() - start_time
+
+    if db:
+        from game_db import GameDatabase
+        store = GameDatabase(db)
+        store.add_results(results, size, difficulty, mines, range(seed, seed + games),
+                          datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        store.close()
+
+    if record:
+        with open(record, "wb") as f:
+            f.write(b"".join(res.pop("replay") for res in results))
+
+    wins = sum(1 for res in results if res["won"])
+    return {
+        "games": games,
+        "size": size,
+        "difficulty": difficulty,
+        "mines": mines,
+        "backend": backend,
+        "topology": topology,
+        "workers": workers,
+        "wins": wins,
+        "win_rate": wins / games if games else 0.0,
+        "moves_per_game": sum(res["moves"] for res in results) / games if games else 0.0,
+        "turns_per_game": sum(res["turns"] for res in results) / games if games else 0.0,
+        "guesses_per_game": sum(res["guesses"] for res in results) / games if games else 0.0,
+        "elapsed_s": elapsed,
+        "games_per_second": games / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play headless AI games and report solver statistics.")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--size", type=int, default=16)
+    parser.add_argument("--difficulty", choices=list(DIFFICULTY_RATIOS), default="Medium")
+    parser.add_argument("--workers", type=int, default=None, help="process count (default: all cores)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game")
+    parser.add_argument("--backend", choices=list(BACKENDS), default=None, help="board backend (default: list)")
+    parser.add_argument("--topology", choices=list(TOPOLOGIES), default="square")
+    parser.add_argument("--engine", choices=["pool", "batch"], default="pool",
+                        help="pool: full AI_Solver per game; batch: lockstep NumPy boards, local rules only")
+    parser.add_argument("--batch-size", type=int, default=4096, help="boards per lockstep batch")
+    parser.add_argument("--record", metavar="FILE", default=None, help="write every game to a replay file")
+    parser.add_argument("--db", metavar="FILE", default=None, help="store every game in a game database")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args(argv)
+    if args.engine == "batch":
+        # The batch engine has its own boards, runs in this process and
+        # keeps no per-game moves
+        for option, used in (("--db", args.db), ("--record", args.record), ("--backend", args.backend),
+                             ("--workers", args.workers), ("--topology", args.topology != "square")):
+            if used:
+                parser.error(f"{option} needs the pool engine")
+
+    if args.engine == "batch":
+        # numpy is only needed for this engine
+        from batch_sim import run_batch
+        summary = run_batch(args.games, args.size, args.difficulty, seed=args.seed,
+                            batch_size=args.batch_size)
+    else:
+        summary = run_simulation(args.games, args.size, args.difficulty, workers=args.workers,
+                                 seed=args.seed, backend=args.backend or "list", record=args.record, db=args.db,
+                                 topology=args.topology)
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print(f"Games:        {summary['games']} ({summary['size']}x{summary['size']}, "
+              f"{summary['difficulty']}, {summary['mines']} mines)")
+        print(f"Win rate:     {summary['win_rate']:.1%} ({summary['wins']} wins)")
+        print(f"Moves/game:   {summary['moves_per_game']:.1f} "
+              f"in {summary['turns_per_game']:.1f} turns "
+              f"({summary['guesses_per_game']:.2f} guesses)")
+        print(f"Games/second: {summary['games_per_second']:.1f} "
+              f"({summary['elapsed_s']:.2f}s on {summary['workers']} workers)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+The three board backends must behave identically: same layouts for a
+seed, same results for every action, same frontier and the same state
+after undo.
+"""
+
+import random
+
+import pytest
+
+from backends import make_board
+from topology import TOPOLOGIES
+
+BACKEND_NAMES = ["list", "numpy", "bitboard"]
+
+
+def boards(rows, cols, mines, seed, **kwargs):
+    out = []
+    for name in BACKEND_NAMES:
+        if name == "numpy":
+            pytest.importorskip("numpy")
+        out.append(make_board(name, rows, cols, mines, seed=seed, **kwargs))
+    return out
+
+
+def state(board):
+    cells = [(cell.is_revealed, cell.is_flagged) for row in board.grid for cell in row]
+    return cells, sorted(board.frontier), board.game_over
+
+
+def assert_same(bs):
+    first = state(bs[0])
+    for b in bs[1:]:
+        assert state(b) == first
+
+
+def hidden(board):
+    return [(r, c) for r in range(board.rows) for c in range(board.cols)
+            if not board.grid[r][c].is_revealed and not board.grid[r][c].is_flagged]
+
+
+@pytest.mark.parametrize("topology", list(TOPOLOGIES))
+def test_layouts_match(topology):
+    bs = boards(9, 11, 20, seed=3, topology=topology)
+    results = [b.reveal(4, 5) for b in bs]
+    assert len(set(results)) == 1
+    for b in bs[1:]:
+        for r in range(9):
+            for c in range(11):
+                assert b.grid[r][c].is_mine == bs[0].grid[r][c].is_mine
+                assert b.grid[r][c].number == bs[0].grid[r][c].number
+    assert_same(bs)
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_random_actions_match(seed):
+    rng = random.Random(seed)
+    bs = boards(10, 10, 15, seed=seed)
+    for b in bs:
+        b.reveal(5, 5)
+    for _ in range(40):
+        if bs[0].game_over:
+            break
+        kind = rng.choice(["reveal", "flag", "chord", "undo", "batch"])
+        r, c = rng.randrange(10), rng.randrange(10)
+        if kind == "reveal":
+            results = [b.reveal(r, c) for b in bs]
+        elif kind == "flag":
+            results = [b.toggle_flag(r, c) for b in bs]
+        elif kind == "chord":
+            results = [b.chord(r, c) for b in bs]
+        elif kind == "undo":
+            results = [b.undo() for b in bs]
+        else:
+            cells = rng.sample(hidden(bs[0]), min(3, len(hidden(bs[0]))))
+            moves = [(mr, mc, rng.choice(["reveal", "flag"])) for mr, mc in cells]
+            results = [b.apply_moves(moves) for b in bs]
+        assert len(set(results)) == 1, kind
+        assert_same(bs)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_undo_after_flag_remaining(seed):
+    # flag_remaining folds its flags into the last undo entry, which may
+    # already have toggled some of the same cells
+    rng = random.Random(seed)
+    bs = boards(8, 8, 10, seed=seed)
+    for b in bs:
+        b.reveal(4, 4)
+    flagged = rng.sample(hidden(bs[0]), 3)
+    for b in bs:
+        for r, c in flagged:
+            b.toggle_flag(r, c)
+    before = [state(b) for b in bs]
+    moves = [(r, c, "flag") for r, c in flagged[:2]]
+    for b in bs:
+        b.apply_moves(moves)
+        b.flag_remaining()
+    assert_same(bs)
+    for b, old in zip(bs, before):
+        assert b.undo()
+        assert state(b) == old
@@ -0,0 +1,98 @@
+"""
+mine_probabilities against brute-force enumeration of every layout.
+"""
+
+import itertools
+import random
+from math import comb
+
+import pytest
+
+from probability import enumerate_component, mine_probabilities, split_components
+from sampling import sample_probabilities
+
+
+def brute_force(constraints, unknown_count, mines_left):
+    # Weight every frontier layout that satisfies the constraints by the
+    # ways to place the remaining mines in the background
+    cells = sorted(set().union(*(c for c, _ in constraints)))
+    background = unknown_count - len(cells)
+    z = 0
+    hits = dict.fromkeys(cells, 0)
+    expected_background = 0
+    for layout in itertools.product((0, 1), repeat=len(cells)):
+        mined = {cell for cell, bit in zip(cells, layout) if bit}
+        if any(len(mined & con) != mines for con, mines in constraints):
+            continue
+        left = mines_left - len(mined)
+        if not 0 <= left <= background:
+            continue
+        w = comb(background, left)
+        z += w
+        expected_background += w * left
+        for cell in mined:
+            hits[cell] += w
+    if z == 0:
+        return None
+    background_p = expected_background / (z * background) if background else None
+    return {cell: h / z for cell, h in hits.items()}, background_p
+
+
+def random_constraints(rng, size):
+    cells = [(r, c) for r in range(3) for c in range(4)][:size]
+    constraints = []
+    for _ in range(rng.randint(1, 5)):
+        con = set(rng.sample(cells, rng.randint(1, min(4, len(cells)))))
+        constraints.append((con, rng.randint(0, len(con))))
+    return constraints
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_matches_brute_force(seed):
+    rng = random.Random(seed)
+    constraints = random_constraints(rng, rng.randint(1, 12))
+    frontier = len(set().union(*(c for c, _ in constraints)))
+    unknown = frontier + rng.randint(0, 30)
+    mines_left = rng.randint(0, unknown)
+
+    probs = mine_probabilities(constraints, unknown, mines_left)
+    expected = brute_force(constraints, unknown, mines_left)
+    if expected is None:
+        assert probs is None
+        return
+    cells, background = expected
+    assert probs.cells.keys() == cells.keys()
+    for cell, p in cells.items():
+        assert probs.cells[cell] == pytest.approx(p, abs=1e-12)
+        assert (cell in probs.safe) == (p == 0)
+        assert (cell in probs.mines) == (p == 1)
+    if background is None:
+        assert probs.background is None
+    else:
+        assert probs.background == pytest.approx(background, abs=1e-12)
+
+
+def test_huge_background():
+    # A 1000x1000 board's background must not be weighed with
+    # full-size binomials
+    probs = mine_probabilities([({(0, 0), (0, 1), (1, 0), (1, 1)}, 1)], 10 ** 6, 150000)
+    assert probs.cells[(0, 0)] == pytest.approx(0.25)
+    assert probs.background == pytest.approx(149999 / (10 ** 6 - 4))
+
+
+def test_long_chain_component():
+    # Far deeper than the recursion limit
+    chain = [({(0, i), (0, i + 1)}, 1) for i in range(2999)]
+    (cells, cons), = split_components(chain)
+    order, counts, _ = enumerate_component(cells, cons, [10 ** 6])
+    assert len(order) == 3000
+    assert counts == {1500: 2}
+    assert sample_probabilities(chain, 3000, 1500, 0.1) is not None
+
+
+def test_sampler_close_to_exact():
+    constraints = [({(0, 0), (0, 1), (0, 2)}, 1), ({(0, 1), (0, 2), (0, 3)}, 2)]
+    exact = mine_probabilities(constraints, 20, 6)
+    estimate = sample_probabilities(constraints, 20, 6, 0.2, rng=random.Random(1))
+    for cell, p in exact.cells.items():
+        assert estimate.cells[cell] == pytest.approx(p, abs=0.05)
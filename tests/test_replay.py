@@ -0,0 +1,84 @@
+"""
+Replays must reproduce their games exactly on every backend.
+"""
+
+import pytest
+
+from backends import make_board
+from replay import (HEADER, HEADER_V1, MAGIC, MOVE, ReplayError, ReplayRecorder, iter_replays,
+                    replay_game, verify)
+from simulate import play_game
+
+
+def recorded_games(count, backend="list", topology="square"):
+    return b"".join(play_game(9, 12, seed, backend, record=True, topology=topology)["replay"]
+                    for seed in range(count))
+
+
+@pytest.mark.parametrize("topology", ["square", "torus", "hex", "knight"])
+def test_round_trip(topology):
+    data = recorded_games(10, topology=topology)
+    games = list(iter_replays(data))
+    assert len(games) == 10
+    for header, moves in games:
+        assert header["topology"] == topology
+        for backend in ("list", "bitboard"):
+            board, mismatch = replay_game(header, moves, backend=backend)
+            assert mismatch is None
+
+
+def test_verify_counts_games():
+    report = verify(recorded_games(6))
+    assert report["games"] == 6
+    assert report["failures"] == []
+
+
+def test_single_moves_and_undo():
+    board = make_board("list", 8, 8, 10, seed=4)
+    recorder = ReplayRecorder(board)
+    recorder.record("reveal", 4, 4, board.reveal(4, 4))
+    r, c = next((r, c) for r in range(8) for c in range(8) if not board.grid[r][c].is_revealed)
+    recorder.record("flag", r, c, board.toggle_flag(r, c))
+    recorder.record("undo", 0, 0, board.undo())
+    (header, moves), = iter_replays(recorder.to_bytes())
+    assert header["first_click"] == (4, 4)
+    assert replay_game(header, moves)[1] is None
+
+
+def test_large_batch():
+    # Batch sizes above 65535 spill into the record's col field
+    board = make_board("list", 260, 260, 20000, seed=5)
+    recorder = ReplayRecorder(board)
+    recorder.record("reveal", 130, 130, board.reveal(130, 130))
+    moves = [(r, c, "flag") for r in range(260) for c in range(260)
+             if not board.grid[r][c].is_revealed][:66000]
+    recorder.record_batch(moves, board.apply_moves(moves))
+    (header, moves), = iter_replays(recorder.to_bytes())
+    assert len(moves) == 66002
+    assert replay_game(header, moves)[1] is None
+
+
+def test_version_1_reads_as_square():
+    data = recorded_games(1)
+    (header, moves), = iter_replays(data)
+    v1 = HEADER_V1.pack(MAGIC, 1, header["rows"], header["cols"], header["mines"], header["seed"],
+                        *header["first_click"], len(moves))
+    (old, old_moves), = iter_replays(v1 + data[HEADER_V1.size + 1:])
+    assert old["topology"] == "square"
+    assert old_moves == moves
+
+
+def test_tampered_result_is_reported():
+    # The first record is the opening batch; its result is checked
+    data = bytearray(recorded_games(1))
+    end = HEADER.size + MOVE.size
+    data[end - 4:end] = (12345).to_bytes(4, "little", signed=True)
+    (header, moves), = iter_replays(bytes(data))
+    assert replay_game(header, moves)[1] == 0
+    assert verify(bytes(data))["failures"] == [(0, 0)]
+
+
+@pytest.mark.parametrize("data", [b"MSRP", b"XXXX" + bytes(40), recorded_games(1)[:-3]])
+def test_malformed_data(data):
+    with pytest.raises(ReplayError):
+        list(iter_replays(data))
@@ -0,0 +1,151 @@
+import functools
+from array import array
+
+# --- BOARD TOPOLOGIES ---
+# Which cells count as neighbours is a property of the board's topology,
+# not of the cells. A topology's adjacency is held once as two compact
+# CSR (compressed sparse row) arrays over flat cell indices
+# (i = r * cols + c):
+#
+#   indices[offsets[i]:offsets[i + 1]]   the neighbours of cell i
+#
+# get_topology caches them per (name, rows, cols), so every board of a
+# shape shares one copy and nothing is rebuilt on undo. Boards, the
+# solver and flood fills iterate these arrays instead of per-cell lists.
+#
+# - square: the classic 8 surrounding cells
+# - torus:  the same 8, wrapping around the edges
+# - hex:    6 neighbours; odd rows sit half a cell to the right
+# - knight: the 8 cells a chess knight's move away
+
+SQUARE = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+KNIGHT = ((-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1))
+HEX_EVEN = ((-1, -1), (-1, 0), (0, -1), (0, 1), (1, -1), (1, 0))
+HEX_ODD = ((-1, 0), (-1, 1), (0, -1), (0, 1), (1, 0), (1, 1))
+
+# name -> (deltas for even rows, deltas for odd rows, wraps around)
+TOPOLOGIES = {
+    "square": (SQUARE, SQUARE, False),
+    "torus": (SQUARE, SQUARE, True),
+    "hex": (HEX_EVEN, HEX_ODD, False),
+    "knight": (KNIGHT, KNIGHT, False),
+}
+
+# Boards this large build their arrays with numpy when it is installed;
+# smaller ones build quickly enough without importing it
+NUMPY_MIN_CELLS = 4096
+
+
+class Topology:
+    def __init__(self, name, rows, cols, offsets, indices):
+        self.name = name
+        self.rows = rows
+        self.cols = cols
+        self.size = rows * cols
+        self.offsets = offsets  # array('i'), size + 1 entries
+        self.indices = indices  # array('i'), neighbour cell indices
+
+    def neighbors(self, i):
+        """Flat indices of the neighbours of cell i."""
+        return self.indices[self.offsets[i]:self.offsets[i + 1]]
+
+    def neighbor_coords(self, r, c):
+        """(row, col) of the neighbours of (r, c)."""
+        i = r * self.cols + c
+        cols = self.cols
+        return [divmod(j, cols) for j in self.indices[self.offsets[i]:self.offsets[i + 1]]]
+
+    def safe_zone(self, i):
+        """The cells kept free of mines by a first click on cell i."""
+        return {i, *self.neighbors(i)}
+
+    def __repr__(self):
+        return f"Topology({self.name!r}, {self.rows}x{self.cols})"
+
+
+def build_topology(name, rows, cols):
+    """
+    Builds the CSR adjacency of a topology (uncached; see get_topology).
+    Each cell's neighbours are listed in row-major order, whatever the
+    topology, so every backend visits them in the same order. On wrapping
+    boards under 3 cells across, a cell reached twice is listed once and
+    a cell never neighbours itself.
+    """
+    if name not in TOPOLOGIES:
+        raise ValueError(f"unknown topology {name!r} (choose from {', '.join(TOPOLOGIES)})")
+    if rows * cols >= NUMPY_MIN_CELLS:
+        try:
+            import numpy
+        except ImportError:
+            pass
+        else:
+            return _build_numpy(numpy, name, rows, cols)
+    return _build_python(name, rows, cols)
+
+
+@functools.lru_cache(maxsize=16)
+def get_topology(name, rows, cols):
+    """The shared Topology of one board shape."""
+    return build_topology(name, rows, cols)
+
+
+def _build_python(name, rows, cols):
+    even, odd, wrap = TOPOLOGIES[name]
+    offsets = array("i", [0])
+    indices = array("i")
+    for r in range(rows):
+        deltas = odd if r % 2 else even
+        for c in range(cols):
+            i = r * cols + c
+            seen = []
+            for dr, dc in deltas:
+                nr, nc = r + dr, c + dc
+                if wrap:
+                    nr %= rows
+                    nc %= cols
+                elif not (0 <= nr < rows and 0 <= nc < cols):
+                    continue
+                j = nr * cols + nc
+                if j != i and j not in seen:
+                    seen.append(j)
+            indices.extend(sorted(seen))
+            offsets.append(len(indices))
+    return Topology(name, rows, cols, offsets, indices)
+
+
+def _build_numpy(np, name, rows, cols):
+    # Same result as _build_python, computed a whole delta at a time: a
+    # (deltas, rows, cols) table of neighbour indices plus a validity
+    # mask, read back cell by cell into the CSR arrays
+    even, odd, wrap = TOPOLOGIES[name]
+    r = np.arange(rows, dtype=np.int32)[:, None]
+    c = np.arange(cols, dtype=np.int32)[None, :]
+    odd_row = (r % 2).astype(bool)
+    nbr = np.empty((len(even), rows, cols), dtype=np.int32)
+    valid = np.empty(nbr.shape, dtype=bool)
+    for k, ((er, ec), (orr, oc)) in enumerate(zip(even, odd)):
+        nr = r + np.where(odd_row, orr, er)
+        nc = c + np.where(odd_row, oc, ec)
+        if wrap:
+            valid[k] = True
+            nr %= rows
+            nc %= cols
+        else:
+            np.logical_and((nr >= 0) & (nr < rows), (nc >= 0) & (nc < cols), out=valid[k])
+        np.add(nr * cols, nc, out=nbr[k])
+        # Wrapped deltas only collide on boards under 3 cells across
+        if wrap and (rows < 3 or cols < 3):
+            valid[k] &= nbr[k] != r * cols + c
+            for j in range(k):
+                valid[k] &= ~(valid[j] & (nbr[j] == nbr[k]))
+    nbr = nbr.reshape(len(even), -1).T
+    valid = valid.reshape(len(even), -1).T
+    if wrap:
+        # Wrapped deltas are out of row-major order at the edges
+        nbr = np.sort(np.where(valid, nbr, rows * cols), axis=1)
+        valid = nbr < rows * cols
+    offsets = array("i", [0])
+    offsets.frombytes(np.cumsum(np.count_nonzero(valid, axis=1), dtype=np.int32).tobytes())
+    indices = array("i")
+    indices.frombytes(nbr[valid].tobytes())
+    return Topology(name, rows, cols, offsets, indices)